@@ -0,0 +1,111 @@
+"""
+Benchmark of decoding the edges of a datasource query page into datapoints.
+
+Compares decoding every edge on its own, the way Datapoint.from_gql_edge() used to do it
+(building the sets of the field types for every edge and a new timezone for every datetime value),
+with decoding the whole page with Datapoint.from_gql_edges(), and with building columnar metadata,
+which defers creating the datetime objects until the values are accessed.
+
+Doesn't need a connection to DagsHub.
+
+Usage:
+    python benchmarks/bench_edge_decoding.py [--rows 5000] [--iterations 10]
+"""
+
+import argparse
+import datetime
+import timeit
+from typing import Any, Dict, List
+
+from dagshub.data_engine.client.models import MetadataSelectFieldSchema
+from dagshub.data_engine.dtypes import MetadataFieldType
+from dagshub.data_engine.model.datapoint import BlobHashMetadata, Datapoint
+
+FIELD_TYPES = {
+    "float_col": MetadataFieldType.FLOAT,
+    "date_col": MetadataFieldType.DATETIME,
+    "blob_col": MetadataFieldType.BLOB,
+    "str_col": MetadataFieldType.STRING,
+    "int_col": MetadataFieldType.INTEGER,
+}
+
+
+def make_edges(rows: int) -> List[Dict[str, Any]]:
+    edges = []
+    for i in range(rows):
+        metadata = [
+            {"key": "float_col", "value": i / 3},
+            {"key": "date_col", "value": 1700000000000 + i * 1000, "timeZone": "+02:00"},
+            {"key": "blob_col", "value": f"{i:040x}"},
+            {"key": "str_col", "value": f"value_{i}"},
+            {"key": "int_col", "value": i},
+        ]
+        edges.append({"node": {"id": i, "path": f"images/{i:08d}.jpg", "metadata": metadata}})
+    return edges
+
+
+def make_fields() -> List[MetadataSelectFieldSchema]:
+    return [
+        MetadataSelectFieldSchema(
+            name=name,
+            valueType=value_type,
+            multiple=False,
+            tags=None,
+            originalName=name,
+            autoGenerated=False,
+            asOf=None,
+        )
+        for name, value_type in FIELD_TYPES.items()
+    ]
+
+
+def legacy_from_gql_edge(edge: Dict, fields: List[MetadataSelectFieldSchema]) -> Datapoint:
+    res = Datapoint(datapoint_id=int(edge["node"]["id"]), path=edge["node"]["path"], metadata={}, datasource=None)
+
+    float_fields = {f.name for f in fields if f.valueType == MetadataFieldType.FLOAT}
+    date_fields = {f.name for f in fields if f.valueType == MetadataFieldType.DATETIME}
+    blob_fields = {f.name for f in fields if f.valueType == MetadataFieldType.BLOB}
+
+    for meta_dict in edge["node"]["metadata"]:
+        key = meta_dict["key"]
+        value = meta_dict["value"]
+        if key in float_fields:
+            value = float(value)
+        else:
+            if key in date_fields:
+                offset_hours, offset_minutes = map(int, (meta_dict.get("timeZone") or "+00:00").split(":"))
+                tz = datetime.timezone(datetime.timedelta(hours=offset_hours, minutes=offset_minutes))
+                value = datetime.datetime.fromtimestamp(value / 1000).astimezone(tz)
+            elif key in blob_fields and isinstance(value, str):
+                value = BlobHashMetadata(value)
+        res.metadata[key] = value
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    edges = make_edges(args.rows)
+    fields = make_fields()
+    cases = {
+        "per-edge (legacy)": lambda: [legacy_from_gql_edge(edge, fields) for edge in edges],
+        "from_gql_edges": lambda: Datapoint.from_gql_edges(edges, None, fields),
+    }
+    try:
+        from dagshub.data_engine.model.columnar import ColumnarMetadata
+
+        cases["columnar"] = lambda: ColumnarMetadata.from_gql_edges(edges, fields)
+    except ImportError:
+        pass
+
+    print(f"{'decoder':>20} {'ms/page':>10} {'us/row':>8}")
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=args.iterations, repeat=3)) / args.iterations
+        print(f"{name:>20} {seconds * 1e3:>10.2f} {seconds / args.rows * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
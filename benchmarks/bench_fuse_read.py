@@ -0,0 +1,142 @@
+"""
+Benchmark of concurrent reads through DagsHubFUSE.read.
+
+Measures the read throughput of the FUSE read handler with a growing number of concurrent readers,
+against the previous implementation that serialized all reads behind a global lock.
+The reads go straight to the handler, so the result shows the scaling of the handler itself, without the kernel.
+
+Two kinds of files are read:
+
+- ``local``: a file that is already downloaded, read with pread.
+  Reads of the page cache barely release the GIL, so this only scales with the number of CPUs.
+- ``remote``: files that aren't downloaded yet, read block by block through a SparseFile,
+  with every block fetch taking ``--latency`` seconds in place of the range request to the server.
+  Every reader reads its own file.
+
+Requires the fuse extra (``pip install dagshub[fuse]``) and Linux.
+
+Usage:
+    python benchmarks/bench_fuse_read.py [--file-size-mb 256] [--read-size-kb 128] [--duration 2] [--latency 0.02]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import PurePosixPath
+from typing import Callable, List
+
+from dagshub.streaming.mount import DagsHubFUSE
+from dagshub.streaming.sparse_file import SparseFile
+
+ReadFn = Callable[[str, int, int, int], bytes]
+OpenFn = Callable[[int], int]
+
+
+def make_fuse() -> DagsHubFUSE:
+    # Skip the constructor, it connects to a repository. Only the state that the read handler uses is set up
+    fuse = DagsHubFUSE.__new__(DagsHubFUSE)
+    fuse._sparse_lock = threading.Lock()
+    fuse._sparse_handles = {}
+    return fuse
+
+
+def locked_read_fn(read_fn: ReadFn) -> ReadFn:
+    lock = threading.Lock()
+
+    def read(path, size, offset, fh):
+        with lock:
+            return read_fn(path, size, offset, fh)
+
+    return read
+
+
+def measure(read_fn: ReadFn, open_fn: OpenFn, file_size: int, read_size: int, readers: int, duration: float) -> float:
+    """
+    Returns the total throughput of all readers in MiB/s
+    """
+    stop = threading.Event()
+    totals: List[int] = [0] * readers
+
+    def reader(i: int):
+        fh = open_fn(i)
+        rng = random.Random(i)
+        try:
+            while not stop.is_set():
+                offset = rng.randrange(0, file_size - read_size)
+                totals[i] += len(read_fn("", read_size, offset, fh))
+        finally:
+            os.close(fh)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return sum(totals) / elapsed / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file-size-mb", type=int, default=256)
+    parser.add_argument("--read-size-kb", type=int, default=128)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per block fetch of the remote files")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    file_size = args.file_size_mb * 1024 * 1024
+    read_size = args.read_size_kb * 1024
+    fuse = make_fuse()
+    implementations = {"pread": fuse.read, "global lock": locked_read_fn(fuse.read)}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = os.path.join(tmp_dir, "local.bin")
+        chunk = os.urandom(1024 * 1024)
+        with open(local_path, "wb") as f:
+            for _ in range(args.file_size_mb):
+                f.write(chunk)
+
+        def open_local(i: int) -> int:
+            return os.open(local_path, os.O_RDONLY)
+
+        opened: List[SparseFile] = []
+
+        def fetch(start: int, end: int) -> bytes:
+            time.sleep(args.latency)
+            return bytes(end - start + 1)
+
+        def open_remote(i: int) -> int:
+            sparse = SparseFile(fetch, file_size, PurePosixPath(tmp_dir) / f"remote_{i}.bin")
+            opened.append(sparse)
+            fh = os.dup(sparse.fd)
+            fuse._sparse_handles[fh] = sparse
+            return fh
+
+        def cleanup():
+            for sparse in opened:
+                sparse.close()
+                for path in (sparse.partial_path, sparse.bitmap_path, sparse.path):
+                    if os.path.exists(path):
+                        os.remove(path)
+            opened.clear()
+            fuse._sparse_handles.clear()
+
+        print(f"{'file':>8} {'readers':>8} " + " ".join(f"{name + ' MiB/s':>18}" for name in implementations))
+        for kind, open_fn in (("local", open_local), ("remote", open_remote)):
+            for readers in args.readers:
+                results = []
+                for read_fn in implementations.values():
+                    results.append(measure(read_fn, open_fn, file_size, read_size, readers, args.duration))
+                    cleanup()
+                print(f"{kind:>8} {readers:>8} " + " ".join(f"{r:>18.1f}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of the overhead of the hooks installed by install_hooks() on files outside of the repository.
+
+After install_hooks(), every open()/os.stat()/os.listdir() in the process goes through DagsHubFilesystem,
+including the ones that have nothing to do with the repository (imports, logging, other libraries' files).
+This measures the time per call of the patched functions against the builtins,
+for files outside of the repository, with absolute and relative paths.
+
+Doesn't need a connection to DagsHub.
+
+Usage:
+    python benchmarks/bench_hooks_overhead.py [--iterations 100000]
+"""
+
+import argparse
+import builtins
+import os
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, Dict
+
+from dagshub.streaming import DagsHubFilesystem
+
+
+def make_fs(project_root: str) -> DagsHubFilesystem:
+    # Skip the constructor, it connects to a repository. Paths outside of the repo don't need any of that state
+    fs = DagsHubFilesystem.__new__(DagsHubFilesystem)
+    fs.project_root = Path(project_root)
+    fs.exclude_globs = []
+    fs.prefetcher = None
+    return fs
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """
+    Returns the time per call in microseconds (best of 3 runs)
+    """
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo_dir, tempfile.TemporaryDirectory() as other_dir:
+        fs = make_fs(repo_dir)
+        file_path = os.path.join(other_dir, "file.txt")
+        with open(file_path, "w") as f:
+            f.write("content")
+        os.chdir(other_dir)
+
+        cases: Dict[str, Dict[str, Callable[[], object]]] = {
+            "stat (absolute)": {
+                "builtin": lambda: os.stat(file_path),
+                "patched": lambda: fs.stat(file_path),
+            },
+            "stat (relative)": {
+                "builtin": lambda: os.stat("file.txt"),
+                "patched": lambda: fs.stat("file.txt"),
+            },
+            "open+close (absolute)": {
+                "builtin": lambda: builtins.open(file_path).close(),
+                "patched": lambda: fs.open(file_path).close(),
+            },
+            "listdir (absolute)": {
+                "builtin": lambda: os.listdir(other_dir),
+                "patched": lambda: fs.listdir(other_dir),
+            },
+        }
+
+        print(f"{'call':>22} {'builtin us':>12} {'patched us':>12} {'overhead us':>12}")
+        for name, impls in cases.items():
+            builtin_time = measure(impls["builtin"], args.iterations)
+            patched_time = measure(impls["patched"], args.iterations)
+            print(f"{name:>22} {builtin_time:>12.2f} {patched_time:>12.2f} {patched_time - builtin_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark of the client-side cost of paginated datasource queries (``ds.all()``), as a function of the row count.
+
+DataClient._get_all() requests the datapoints in pages of FULL_LIST_PAGE_SIZE rows, parses every page
+into a QueryResult and appends it to the result. This measures the whole loop with the pages served from memory,
+against accumulating the pages with the ``entries`` setter, which rebuilds the path lookup of all rows on every page.
+The time per row of the current implementation should stay flat as the row count grows.
+
+Doesn't need a connection to DagsHub.
+
+Usage:
+    python benchmarks/bench_query_accumulation.py [--rows 10000 50000 100000 200000] [--metadata-fields 5]
+"""
+
+import argparse
+import gc
+import time
+from typing import Any, Dict, List, Optional
+
+from dagshub.common import config
+from dagshub.data_engine.client.data_client import DataClient
+from dagshub.data_engine.model.query_result import QueryResult
+
+
+def make_page(start: int, count: int, total: int, metadata_fields: int) -> Dict[str, Any]:
+    end = min(start + count, total)
+    edges = []
+    for i in range(start, end):
+        metadata = [{"key": f"field_{j}", "value": f"value_{i}_{j}"} for j in range(metadata_fields)]
+        edges.append({"node": {"id": i, "path": f"images/{i:08d}.jpg", "metadata": metadata}})
+    return {
+        "edges": edges,
+        "pageInfo": {"hasNextPage": end < total, "endCursor": str(end)},
+        "selectFields": [
+            {
+                "name": f"field_{j}",
+                "valueType": "STRING",
+                "multiple": False,
+                "tags": [],
+                "originalName": f"field_{j}",
+                "autoGenerated": False,
+                "asOf": None,
+            }
+            for j in range(metadata_fields)
+        ],
+        "queryDataTime": 1700000000,
+    }
+
+
+def make_client(pages: List[Dict[str, Any]]) -> DataClient:
+    # Skip the constructor, it connects to DagsHub
+    client = DataClient.__new__(DataClient)
+
+    def datasource_query(datasource, include_metadata, limit=None, after: Optional[str] = None):
+        return pages[int(after or 0) // client.FULL_LIST_PAGE_SIZE]
+
+    client._datasource_query = datasource_query
+    return client
+
+
+def get_all_with_entries_setter(client: DataClient) -> QueryResult:
+    """
+    Accumulation of the pages with ``res.entries += page.entries``, as it was done before QueryResult._extend()
+    """
+    has_next_page = True
+    after = None
+    res = QueryResult([], None, [])
+    while has_next_page:
+        resp = client._datasource_query(None, True, client.FULL_LIST_PAGE_SIZE, after)
+        has_next_page = resp["pageInfo"]["hasNextPage"]
+        after = resp["pageInfo"]["endCursor"]
+        new_entries = QueryResult.from_gql_query(resp, None)
+        res.entries += new_entries.entries
+        res.fields = new_entries.fields
+        res.query_data_time = new_entries.query_data_time
+    return res
+
+
+def measure(fn) -> float:
+    """
+    Returns the time of the call in seconds, best of 3 runs
+    """
+    times = []
+    for _ in range(3):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 100_000, 200_000])
+    parser.add_argument("--metadata-fields", type=int, default=5)
+    args = parser.parse_args()
+    # No progress bars
+    config.quiet = True
+
+    print(f"{'rows':>10} {'_get_all s':>12} {'us/row':>8} {'setter s':>12} {'us/row':>8}")
+    for rows in args.rows:
+        page_size = DataClient.FULL_LIST_PAGE_SIZE
+        pages = [make_page(start, page_size, rows, args.metadata_fields) for start in range(0, rows, page_size)]
+        client = make_client(pages)
+
+        current = measure(lambda: client._get_all(None, True))
+        setter = measure(lambda: get_all_with_entries_setter(client))
+        print(f"{rows:>10} {current:>12.3f} {current / rows * 1e6:>8.2f} {setter:>12.3f} {setter / rows * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of paginated datasource queries (``ds.all()``) with the pages requested ahead, against one after another.
+
+The pages are served from memory, with a sleep of ``--latency`` seconds per request in place of the round trip
+to the server. With prefetching, the requests of the next pages overlap with the parsing of the received ones,
+so the total time gets closer to max(fetch, parse) instead of fetch + parse.
+
+Doesn't need a connection to DagsHub.
+
+Usage:
+    python benchmarks/bench_query_pipelining.py [--rows 100000] [--latency 0.2] [--prefetch 0 1 2 4]
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from bench_query_accumulation import make_page
+
+from dagshub.common import config
+from dagshub.data_engine.client.data_client import DataClient
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--metadata-fields", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per page request")
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = parser.parse_args()
+    # No progress bars
+    config.quiet = True
+
+    page_size = DataClient.FULL_LIST_PAGE_SIZE
+    pages = [make_page(start, page_size, args.rows, args.metadata_fields) for start in range(0, args.rows, page_size)]
+    # Skip the constructor, it connects to DagsHub
+    client = DataClient.__new__(DataClient)
+
+    def datasource_query(datasource, include_metadata, limit=None, after: Optional[str] = None):
+        time.sleep(args.latency)
+        return pages[int(after or 0) // page_size]
+
+    client._datasource_query = datasource_query
+
+    print(f"{'prefetch':>8} {'total s':>10} {'fetch s':>10} {'parse s':>10}")
+    for prefetch in args.prefetch:
+        pager = client.get_pages(None, True, prefetch=prefetch)
+        start = time.perf_counter()
+        for _ in pager:
+            pass
+        total = time.perf_counter() - start
+        fetch = sum(t.fetch_seconds for t in pager.timings)
+        parse = sum(t.parse_seconds for t in pager.timings)
+        print(f"{prefetch:>8} {total:>10.3f} {fetch:>10.3f} {parse:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
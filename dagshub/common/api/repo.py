@@ -1,4 +1,6 @@
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from os import PathLike
 from pathlib import Path, PurePosixPath
 import rich.progress
@@ -13,7 +15,8 @@ from dagshub.common.api.responses import (
     StorageContentAPIResult,
 )
 from dagshub.data_engine.model.errors import LSInitializingError
-from dagshub.common.download import download_files
+from dagshub.common.download import deduplicated_download_fn, download_files_pipelined
+from dagshub.common.object_store import content_key, get_file_store
 from dagshub.common.rich_util import get_rich_progress
 from dagshub.common.util import multi_urljoin
 from functools import partial
@@ -24,14 +27,14 @@ from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_t
 
 from functools import cached_property
 
-from typing import Optional, Tuple, Any, List, Union, Dict
+from typing import Optional, Tuple, Any, List, Union, Dict, Iterator
 
 import dacite
 
 import dagshub.auth
 from dagshub.common import config
 
-from dagshub.common.helpers import http_request, log_message
+from dagshub.common.helpers import http_request, http_stream, log_message
 
 logger = logging.getLogger("dagshub")
 
@@ -93,6 +96,11 @@ class RepoAPI:
             kwargs["auth"] = self.auth
         return http_request(method, url, **kwargs)
 
+    def _http_stream(self, method, url, **kwargs):
+        if "auth" not in kwargs:
+            kwargs["auth"] = self.auth
+        return http_stream(method, url, **kwargs)
+
     def get_repo_info(self) -> RepoAPIResponse:
         """
         Get information about the repository
@@ -343,52 +351,67 @@ class RepoAPI:
         """
         Walks through the path of the repo, returning non-dir entries
         """
+        return list(self._iter_files_in_path(path, revision, recursive, traverse_storages))
 
-        dir_queue = []
-        files = []
+    def _iter_files_in_path(
+        self,
+        path,
+        revision=None,
+        recursive=False,
+        traverse_storages=False,
+        max_workers: Optional[int] = None,
+        progress: Optional[rich.progress.Progress] = None,
+    ) -> Iterator[ContentAPIEntry]:
+        """
+        Walks through the path of the repo, yielding non-dir entries as soon as their directory is listed.
 
-        list_fn_folder = partial(self.list_path, revision=revision)
-        list_fn_storage = self.list_storage_path
+        Directories are listed concurrently, with at most ``max_workers`` listing requests in flight
+        (defaults to the config value of download_threads).
+        If the iteration is stopped early, directories that weren't listed yet are skipped.
 
-        def push_folder(folder_path):
-            dir_queue.append((folder_path, list_fn_folder))
+        Args:
+            progress: Progress to report the traversal to. If None, a new progress is shown for the traversal.
+        """
+        if max_workers is None:
+            max_workers = config.download_threads
 
-        def push_storage(storage_path):
-            dir_queue.append((storage_path, list_fn_storage))
+        list_fn_folder = partial(self.list_path, revision=revision)
+        list_fn_storage = self.list_storage_path
 
         # Initialize the queue
         path, is_storage_path = self._sanitize_storage_path(path)
-        if is_storage_path:
-            push_storage(path)
-        else:
-            push_folder(path)
+        initial_fn = list_fn_storage if is_storage_path else list_fn_folder
 
-        progress = get_rich_progress(rich.progress.MofNCompleteColumn())
+        own_progress = progress is None
+        if own_progress:
+            progress = get_rich_progress(rich.progress.MofNCompleteColumn())
         task = progress.add_task("Traversing directories...", total=None)
 
-        def step(step_path, list_fn):
-            """
-            step_path: path in the repo to list
-            list_fn: which function to use to list it (can be list_path or list_storage_path)
-            """
-            res = list_fn(step_path)
-            for entry in res:
-                if entry.type == "file":
-                    files.append(entry)
-                elif recursive:
-                    if entry.versioning == "bucket":
-                        if traverse_storages:
-                            push_storage(entry.path)
-                    else:
-                        push_folder(entry.path)
-            progress.update(task, advance=1)
-
-        with progress:
-            while len(dir_queue):
-                query_path, list_fn = dir_queue.pop(0)
-                step(query_path, list_fn)
-
-        return files
+        with ThreadPoolExecutor(max_workers=max_workers) as tp:
+            pending = {tp.submit(initial_fn, path)}
+            try:
+                if own_progress:
+                    progress.start()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for entry in future.result():
+                            if entry.type == "file":
+                                yield entry
+                            elif recursive:
+                                if entry.versioning == "bucket":
+                                    if traverse_storages:
+                                        pending.add(tp.submit(list_fn_storage, entry.path))
+                                else:
+                                    pending.add(tp.submit(list_fn_folder, entry.path))
+                        progress.update(task, advance=1)
+            finally:
+                for future in pending:
+                    future.cancel()
+                if own_progress:
+                    progress.stop()
+                else:
+                    progress.remove_task(task)
 
     def download(
         self,
@@ -403,6 +426,10 @@ class RepoAPI:
         """
         Downloads the contents of the repository at "remote_path" to the "local_path"
 
+        If ``DAGSHUB_ENABLE_FILE_STORE`` is set, files with content that was already downloaded before,
+        in any revision or clone of the repository, are hardlinked from the local file store
+        instead of being downloaded again. The hardlinked files are read-only.
+
         Args:
             remote_path: Path in the repository of the folder or file to download.
             local_path: Where to download the files. Defaults to current working directory.
@@ -428,8 +455,11 @@ class RepoAPI:
             )
             traverse_storages = False
 
-        files = self._get_files_in_path(remote_path, revision, recursive, traverse_storages=traverse_storages)
-        file_tuples = []
+        # Files are downloaded while the traversal is still running, with a single progress showing both
+        progress = get_rich_progress(rich.progress.MofNCompleteColumn(), transient=False)
+        files = self._iter_files_in_path(
+            remote_path, revision, recursive, traverse_storages=traverse_storages, progress=progress
+        )
         if local_path is None:
             local_path = "."
         local_path = Path(local_path)
@@ -439,33 +469,61 @@ class RepoAPI:
             remote_path = "/"
         # For storage paths get rid of the colon in the beginning of the schema, the download urls won't have it either
         remote_path, _ = self._sanitize_storage_path(remote_path)
-        # Edge case - if the user requested a single file - different output path semantics
-        if len(files) == 1 and files[0].path == remote_path:
-            f = files[0]
-            remote_path = PurePosixPath(f.path)
-            # If local_path was specified, assume that the local_path is the exact name of the file
-            if local_path != Path("."):
-                # Saving to existing dir - append the name of remote file to the end a-la cp
-                if local_path.is_dir():
-                    remote_path = remote_path if keep_source_prefix else remote_path.name
-                    file_path = local_path / remote_path
-                else:
-                    file_path = local_path
-            else:
-                file_path = remote_path if keep_source_prefix else remote_path.name
-            file_tuples.append((f.download_url, file_path))
-        else:
-            for f in files:
+
+        # Files that were already downloaded before (e.g. from another revision) get hardlinked from the store
+        object_store = get_file_store()
+        content_keys: Dict[str, str] = {}
+
+        def file_tuples() -> Iterator[Tuple[str, Path]]:
+            for f, path in entry_tuples():
+                if object_store is not None:
+                    key = content_key(f)
+                    if key is not None:
+                        content_keys[f.download_url] = key
+                yield f.download_url, path
+
+        def entry_tuples() -> Iterator[Tuple[ContentAPIEntry, Path]]:
+            first = next(files, None)
+            if first is None:
+                return
+            # Edge case - if the user requested a single file - different output path semantics.
+            # Listing a file returns only the file itself, a directory listing can't contain the directory
+            if first.path == remote_path:
+                yield first, self._single_file_download_path(first, local_path, keep_source_prefix)
+                return
+            remote_path_obj = PurePosixPath(remote_path)
+            for f in itertools.chain([first], files):
                 file_path_in_remote = PurePosixPath(f.path)
-                remote_path_obj = PurePosixPath(remote_path)
                 if not keep_source_prefix and remote_path != "/":
                     file_path = file_path_in_remote.relative_to(remote_path_obj)
                 else:
                     file_path = file_path_in_remote
-                file_path = local_path / file_path
-                file_tuples.append((f.download_url, file_path))
-        download_files(file_tuples, skip_if_exists=not redownload)
-        log_message(f"Downloaded {len(files)} file(s) to {local_path.resolve()}")
+                yield f, local_path / file_path
+
+        download_fn = None
+        if object_store is not None:
+            download_fn = deduplicated_download_fn(object_store, content_keys, skip_if_exists=not redownload)
+
+        try:
+            with progress:
+                num_files = download_files_pipelined(
+                    file_tuples(), download_fn=download_fn, skip_if_exists=not redownload, progress=progress
+                )
+        finally:
+            files.close()
+        log_message(f"Downloaded {num_files} file(s) to {local_path.resolve()}")
+
+    @staticmethod
+    def _single_file_download_path(f: ContentAPIEntry, local_path: Path, keep_source_prefix: bool) -> Path:
+        remote_path = PurePosixPath(f.path)
+        # If local_path was specified, assume that the local_path is the exact name of the file
+        if local_path != Path("."):
+            # Saving to existing dir - append the name of remote file to the end a-la cp
+            if local_path.is_dir():
+                remote_path = remote_path if keep_source_prefix else remote_path.name
+                return local_path / remote_path
+            return local_path
+        return Path(remote_path if keep_source_prefix else remote_path.name)
 
     @staticmethod
     def _sanitize_storage_path(path: Union[str, PathLike]) -> Tuple[str, bool]:
@@ -38,6 +38,9 @@ host = ""
 parsed_host = ""
 set_host(os.environ.get(HOST_KEY, DEFAULT_HOST))
 
+CACHE_DIR_KEY = "DAGSHUB_CACHE_DIR"
+cache_dir = os.environ.get(CACHE_DIR_KEY, appdirs.user_cache_dir("dagshub"))
+
 client_id = os.environ.get(CLIENT_ID_KEY, DEFAULT_CLIENT_ID)
 cache_location = os.environ.get(TOKENS_CACHE_LOCATION_KEY, DEFAULT_TOKENS_CACHE_LOCATION)
 token = os.environ.get(DAGSHUB_USER_TOKEN_KEY)
@@ -52,6 +55,81 @@ quiet = bool(os.environ.get(DAGSHUB_QUIET_KEY, False))
 
 disable_traceparent = bool(os.environ.get(DISABLE_TRACEPARENT_KEY, False))
 
+# Directory listings of the streaming filesystem at fixed commits are persisted on disk and shared between processes
+DISABLE_STREAMING_LISTING_CACHE_KEY = "DAGSHUB_DISABLE_STREAMING_LISTING_CACHE"
+disable_streaming_listing_cache = bool(os.environ.get(DISABLE_STREAMING_LISTING_CACHE_KEY, False))
+STREAMING_LISTING_CACHE_LOCATION_KEY = "DAGSHUB_STREAMING_LISTING_CACHE_LOCATION"
+streaming_listing_cache_location = os.environ.get(
+    STREAMING_LISTING_CACHE_LOCATION_KEY, os.path.join(cache_dir, "streaming", "listings.sqlite")
+)
+
+# In-memory cache of paths that don't exist on DagsHub. Entries of full commit SHAs never expire,
+# entries of everything else (short SHAs, connected storage buckets) expire after the TTL (in seconds)
+DISABLE_NEGATIVE_LOOKUP_CACHE_KEY = "DAGSHUB_DISABLE_NEGATIVE_LOOKUP_CACHE"
+disable_negative_lookup_cache = bool(os.environ.get(DISABLE_NEGATIVE_LOOKUP_CACHE_KEY, False))
+NEGATIVE_LOOKUP_CACHE_TTL_KEY = "DAGSHUB_NEGATIVE_LOOKUP_CACHE_TTL"
+negative_lookup_cache_ttl = float(os.environ.get(NEGATIVE_LOOKUP_CACHE_TTL_KEY, 60.0))
+NEGATIVE_LOOKUP_CACHE_MAX_ENTRIES_KEY = "DAGSHUB_NEGATIVE_LOOKUP_CACHE_MAX_ENTRIES"
+negative_lookup_cache_max_entries = int(os.environ.get(NEGATIVE_LOOKUP_CACHE_MAX_ENTRIES_KEY, 100_000))
+
+# FUSE mount reads files block by block with range requests, instead of downloading the whole file on open
+DISABLE_FUSE_BLOCK_READS_KEY = "DAGSHUB_DISABLE_FUSE_BLOCK_READS"
+fuse_block_reads = not bool(os.environ.get(DISABLE_FUSE_BLOCK_READS_KEY, False))
+FUSE_BLOCK_SIZE_KEY = "DAGSHUB_FUSE_BLOCK_SIZE"
+fuse_block_size = int(os.environ.get(FUSE_BLOCK_SIZE_KEY, 1024 * 1024))
+# Maximum amount of data fetched ahead of a sequential reader
+FUSE_READAHEAD_MAX_KEY = "DAGSHUB_FUSE_READAHEAD_MAX"
+fuse_readahead_max = int(os.environ.get(FUSE_READAHEAD_MAX_KEY, 16 * 1024 * 1024))
+
+# Prefetching of files ahead of their access (DagsHubFilesystem.enable_prefetch, DagsHubDataset's prefetch)
+STREAMING_PREFETCH_KEY = "DAGSHUB_STREAMING_PREFETCH"
+streaming_prefetch = bool(os.environ.get(STREAMING_PREFETCH_KEY, False))
+PREFETCH_THREADS_KEY = "DAGSHUB_PREFETCH_THREADS"
+prefetch_threads = int(os.environ.get(PREFETCH_THREADS_KEY, 4))
+PREFETCH_LOOKAHEAD_KEY = "DAGSHUB_PREFETCH_LOOKAHEAD"
+prefetch_lookahead = int(os.environ.get(PREFETCH_LOOKAHEAD_KEY, 8))
+# Maximum size of prefetched files that weren't opened yet
+PREFETCH_DISK_BUDGET_KEY = "DAGSHUB_PREFETCH_DISK_BUDGET"
+prefetch_disk_budget = int(os.environ.get(PREFETCH_DISK_BUDGET_KEY, 1024 * 1024 * 1024))
+
+# Global content-addressed store of the data engine's metadata blobs, shared between all datasources and repos.
+# Least recently used blobs get evicted once the store grows over the max size
+DISABLE_BLOB_STORE_KEY = "DAGSHUB_DISABLE_BLOB_STORE"
+disable_blob_store = bool(os.environ.get(DISABLE_BLOB_STORE_KEY, False))
+BLOB_STORE_LOCATION_KEY = "DAGSHUB_BLOB_STORE_LOCATION"
+blob_store_location = os.environ.get(BLOB_STORE_LOCATION_KEY, os.path.join(cache_dir, "blobs"))
+BLOB_STORE_MAX_SIZE_KEY = "DAGSHUB_BLOB_STORE_MAX_SIZE"
+blob_store_max_size = int(os.environ.get(BLOB_STORE_MAX_SIZE_KEY, 10 * 1024 * 1024 * 1024))
+
+# Content-addressed store of the repository files downloaded by streaming, RepoAPI.download()
+# and QueryResult.download_files(), keyed by the hash of their content.
+# Files that are the same in multiple revisions get downloaded once, and hardlinked into every place they're needed.
+# Opt-in: the hardlinked files are read-only, since writing to one of them would change all of them
+ENABLE_FILE_STORE_KEY = "DAGSHUB_ENABLE_FILE_STORE"
+enable_file_store = bool(os.environ.get(ENABLE_FILE_STORE_KEY, False))
+FILE_STORE_LOCATION_KEY = "DAGSHUB_FILE_STORE_LOCATION"
+file_store_location = os.environ.get(FILE_STORE_LOCATION_KEY, os.path.join(cache_dir, "files"))
+FILE_STORE_MAX_SIZE_KEY = "DAGSHUB_FILE_STORE_MAX_SIZE"
+file_store_max_size = int(os.environ.get(FILE_STORE_MAX_SIZE_KEY, 10 * 1024 * 1024 * 1024))
+
+# Lock files that coordinate downloads of the same file between processes (e.g. dataloader workers),
+# so only one of them downloads it, and the others wait for it to finish
+DOWNLOAD_LOCKS_LOCATION_KEY = "DAGSHUB_DOWNLOAD_LOCKS_LOCATION"
+download_locks_location = os.environ.get(DOWNLOAD_LOCKS_LOCATION_KEY, os.path.join(cache_dir, "locks"))
+
+# Size budget of the datapoint files downloaded by the data engine (QueryResult.download_files, DagsHubDataset).
+# Downloaded files get recorded in an index, and once the budget is exceeded,
+# the least recently (lru) or least frequently (lfu) used files are deleted.
+# 0 means no budget - files aren't tracked or deleted.
+DATASET_CACHE_MAX_SIZE_KEY = "DAGSHUB_DATASET_CACHE_MAX_SIZE"
+dataset_cache_max_size = int(os.environ.get(DATASET_CACHE_MAX_SIZE_KEY, 0))
+DATASET_CACHE_EVICTION_POLICY_KEY = "DAGSHUB_DATASET_CACHE_EVICTION_POLICY"
+dataset_cache_eviction_policy = os.environ.get(DATASET_CACHE_EVICTION_POLICY_KEY, "lru")
+DATASET_CACHE_INDEX_LOCATION_KEY = "DAGSHUB_DATASET_CACHE_INDEX_LOCATION"
+dataset_cache_index_location = os.environ.get(
+    DATASET_CACHE_INDEX_LOCATION_KEY, os.path.join(cache_dir, "datasets", "index.sqlite")
+)
+
 # DVC config templates
 CONFIG_GITIGNORE = "/config.local\n/tmp\n/cache"
 
@@ -93,6 +171,16 @@ adaptive_batch_retry_backoff_base_seconds = float(
 DATAENGINE_METADATA_UPLOAD_RETRY_BACKOFF_MAX_KEY = "DAGSHUB_DE_METADATA_UPLOAD_RETRY_BACKOFF_MAX"
 adaptive_batch_retry_backoff_max_seconds = float(os.environ.get(DATAENGINE_METADATA_UPLOAD_RETRY_BACKOFF_MAX_KEY, 60.0))
 
+# How many pages of a datasource query get requested ahead, while the received pages are being parsed.
+# 0 requests every page only after the previous one is parsed
+DATAENGINE_QUERY_PREFETCH_PAGES_KEY = "DAGSHUB_DE_QUERY_PREFETCH_PAGES"
+dataengine_query_prefetch_pages = int(os.environ.get(DATAENGINE_QUERY_PREFETCH_PAGES_KEY, 2))
+
+# Keep the metadata of query results in pyarrow columns, with the datapoints being views of the rows,
+# instead of a dictionary per datapoint. Requires pyarrow
+DATAENGINE_COLUMNAR_RESULTS_KEY = "DAGSHUB_DE_COLUMNAR_RESULTS"
+dataengine_columnar_results = bool(os.environ.get(DATAENGINE_COLUMNAR_RESULTS_KEY, False))
+
 DISABLE_ANALYTICS_KEY = "DAGSHUB_DISABLE_ANALYTICS"
 disable_analytics = "DAGSHUB_DISABLE_ANALYTICS" in os.environ
 
@@ -100,10 +188,55 @@ DOWNLOAD_THREADS_KEY = "DAGSHUB_DOWNLOAD_THREADS"
 DEFAULT_DOWNLOAD_THREADS = 32
 download_threads = int(os.environ.get(DOWNLOAD_THREADS_KEY, DEFAULT_DOWNLOAD_THREADS))
 
+# Engine that download_files uses to download multiple files:
+# "threads" - every file is downloaded on a thread of a thread pool of download_threads threads
+# "asyncio" - all files are downloaded on one event loop, with up to async_download_concurrency files at a time
+DOWNLOAD_ENGINE_KEY = "DAGSHUB_DOWNLOAD_ENGINE"
+download_engine = os.environ.get(DOWNLOAD_ENGINE_KEY, "threads")
+
+ASYNC_DOWNLOAD_CONCURRENCY_KEY = "DAGSHUB_ASYNC_DOWNLOAD_CONCURRENCY"
+async_download_concurrency = int(os.environ.get(ASYNC_DOWNLOAD_CONCURRENCY_KEY, 256))
+
+# Maximum number of discovered files waiting to be downloaded when downloading while traversing a repository.
+# Once the queue is full, the traversal waits for the downloads to catch up
+DOWNLOAD_QUEUE_SIZE_KEY = "DAGSHUB_DOWNLOAD_QUEUE_SIZE"
+download_queue_size = int(os.environ.get(DOWNLOAD_QUEUE_SIZE_KEY, 4 * download_threads))
+
+DOWNLOAD_CHUNK_SIZE_KEY = "DAGSHUB_DOWNLOAD_CHUNK_SIZE"
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+download_chunk_size = int(os.environ.get(DOWNLOAD_CHUNK_SIZE_KEY, DEFAULT_DOWNLOAD_CHUNK_SIZE))
+
+# Files bigger than the threshold are downloaded in parts of download_part_size with concurrent range requests.
+# The first request of a download asks for the threshold's worth of bytes, rounded up to whole parts.
+# Set the threshold to 0 to turn ranged downloads off
+DOWNLOAD_RANGE_THRESHOLD_KEY = "DAGSHUB_DOWNLOAD_RANGE_THRESHOLD"
+download_range_threshold = int(os.environ.get(DOWNLOAD_RANGE_THRESHOLD_KEY, 64 * 1024 * 1024))
+
+DOWNLOAD_PART_SIZE_KEY = "DAGSHUB_DOWNLOAD_PART_SIZE"
+download_part_size = int(os.environ.get(DOWNLOAD_PART_SIZE_KEY, 16 * 1024 * 1024))
+
+DOWNLOAD_PART_THREADS_KEY = "DAGSHUB_DOWNLOAD_PART_THREADS"
+download_part_threads = int(os.environ.get(DOWNLOAD_PART_THREADS_KEY, 8))
+
 UPLOAD_THREADS_KEY = "DAGSHUB_UPLOAD_THREADS"
 DEFAULT_UPLOAD_THREADS = 8
 upload_threads = int(os.environ.get(UPLOAD_THREADS_KEY, DEFAULT_UPLOAD_THREADS))
 
+HTTP2_KEY = "DAGSHUB_HTTP2"
+http2 = bool(os.environ.get(HTTP2_KEY, False))
+
+HTTP_MAX_CONNECTIONS_PER_HOST_KEY = "DAGSHUB_HTTP_MAX_CONNECTIONS_PER_HOST"
+# Keep enough room in the pool for all download threads, otherwise they end up waiting on each other
+http_max_connections_per_host = int(
+    os.environ.get(HTTP_MAX_CONNECTIONS_PER_HOST_KEY, max(2 * DEFAULT_DOWNLOAD_THREADS, download_threads))
+)
+
+HTTP_MAX_KEEPALIVE_CONNECTIONS_KEY = "DAGSHUB_HTTP_MAX_KEEPALIVE_CONNECTIONS"
+http_max_keepalive_connections = int(os.environ.get(HTTP_MAX_KEEPALIVE_CONNECTIONS_KEY, http_max_connections_per_host))
+
+HTTP_KEEPALIVE_EXPIRY_KEY = "DAGSHUB_HTTP_KEEPALIVE_EXPIRY"
+http_keepalive_expiry = float(os.environ.get(HTTP_KEEPALIVE_EXPIRY_KEY, 30.0))
+
 if download_threads > DEFAULT_DOWNLOAD_THREADS:
     logger.warning(
         f"Number of download threads was set to {download_threads}. "
@@ -1,24 +1,39 @@
+import asyncio
+import json
 import logging
+import math
 import os.path
+import queue
+import shutil
 import signal
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from functools import partial
 from pathlib import Path
-from typing import Tuple, Callable, Optional, List, Union, Dict
+from typing import Tuple, Callable, Optional, List, Union, Dict, BinaryIO, Iterator, Set, Iterable, Mapping
 
-from httpx import Auth, Response
+from httpx import AsyncClient, Auth, Response
 from tenacity import stop_after_attempt, wait_exponential, before_sleep_log, retry, retry_if_exception
 
 from dagshub.common import config
 
-from typing import Literal
+from typing import Literal, TYPE_CHECKING
 
 import re
 import rich.progress
 
 from dagshub.auth import get_authenticator
-from dagshub.common.helpers import http_request
+from dagshub.common.helpers import http_stream, _add_default_request_args
+from dagshub.common.http_pool import create_async_client
 from dagshub.common.rich_util import get_rich_progress
+from dagshub.common.util import run_coroutine_sync
+
+if TYPE_CHECKING:
+    from dagshub.common.file_cache import ManagedFileCache
+    from dagshub.common.object_store import ObjectStore
 
 logger = logging.getLogger(__name__)
 
@@ -139,23 +154,415 @@ def is_download_server_error(error: BaseException) -> bool:
     return error.response.status_code >= 500
 
 
-@retry(
+# Works for both regular and async functions
+_retry_on_server_error = retry(
     retry=retry_if_exception(is_download_server_error),
     stop=stop_after_attempt(5),
     wait=wait_exponential(multiplier=1, min=4, max=10),
     before_sleep=before_sleep_log(logger, logging.WARNING),
 )
-def _dagshub_download(url: str, auth: Auth) -> bytes:
-    resp = http_request("GET", url, auth=auth, timeout=600)
-    if resp.status_code == 200:
-        return resp.content
-    raise DownloadError(resp)
+
+
+@_retry_on_server_error
+def _dagshub_download(url: str, location: Path, auth: Auth):
+    # Continue an interrupted ranged download, if there is one
+    progress = _RangeDownloadProgress.load(location)
+    if progress is not None:
+        if progress.url == url:
+            try:
+                _download_in_ranges(url, location, auth, progress)
+                return
+            except RangesNotSupportedError:
+                logger.debug(f"Couldn't resume the download of {location}, downloading from scratch")
+        _discard_ranged_download(location)
+
+    # Only the beginning of a big file is requested, the rest of it is downloaded in parts alongside
+    with http_stream("GET", url, auth=auth, timeout=600, headers=_first_request_headers()) as resp:
+        if resp.status_code == 200 or _is_whole_file(resp):
+            write_response_to_file(resp, location)
+            return
+        if resp.status_code != 206 and resp.status_code != 416:
+            raise DownloadError(resp)
+        progress = _get_ranged_download_progress(url, resp)
+        if progress is not None:
+            try:
+                _download_in_ranges(url, location, auth, progress, head=resp)
+                return
+            except RangesNotSupportedError:
+                _discard_ranged_download(location)
+    # The server couldn't give the file in ranges (e.g. empty files can't have a range) - download all of it
+    with http_stream("GET", url, auth=auth, timeout=600) as resp:
+        if resp.status_code != 200:
+            raise DownloadError(resp)
+        write_response_to_file(resp, location)
+
+
+class RangesNotSupportedError(Exception):
+    """
+    Raised when the server doesn't return the requested byte range of the file,
+    either because it doesn't support range requests, or because the file has changed since the download started.
+    """
+
+    pass
+
+
+@dataclass
+class _RangeDownloadProgress:
+    """
+    State of a ranged download, stored in a sidecar file next to the partially downloaded file,
+    so an interrupted download can continue where it stopped.
+    """
+
+    url: str
+    size: int
+    part_size: int
+    etag: Optional[str] = None
+    completed_parts: Set[int] = field(default_factory=set)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def num_parts(self) -> int:
+        return max(1, math.ceil(self.size / self.part_size))
+
+    def part_range(self, part: int) -> Tuple[int, int]:
+        """
+        Returns the inclusive [start, end] byte range of the part
+        """
+        start = part * self.part_size
+        return start, min(start + self.part_size, self.size) - 1
+
+    def complete_part(self, part: int, location: Path):
+        with self._lock:
+            self.completed_parts.add(part)
+            self.save(location)
+
+    def save(self, location: Path):
+        progress_path = _progress_file_path(location)
+        tmp_path = progress_path.with_name(progress_path.name + ".tmp")
+        data = {
+            "url": self.url,
+            "size": self.size,
+            "part_size": self.part_size,
+            "etag": self.etag,
+            "completed_parts": sorted(self.completed_parts),
+        }
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, progress_path)
+
+    @staticmethod
+    def load(location: Path) -> Optional["_RangeDownloadProgress"]:
+        progress_path = _progress_file_path(location)
+        if not progress_path.exists() or not _partial_file_path(location).exists():
+            return None
+        try:
+            with open(progress_path) as f:
+                data = json.load(f)
+            return _RangeDownloadProgress(
+                url=data["url"],
+                size=data["size"],
+                part_size=data["part_size"],
+                etag=data.get("etag"),
+                completed_parts=set(data["completed_parts"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            logger.debug(f"Couldn't read download progress file {progress_path}, ignoring it")
+            return None
+
+
+def _partial_file_path(location: Path) -> Path:
+    return location.with_name(f".{location.name}.dagshub-partial")
+
+
+def _progress_file_path(location: Path) -> Path:
+    return location.with_name(f".{location.name}.dagshub-partial.json")
+
+
+def _discard_ranged_download(location: Path):
+    for path in (_partial_file_path(location), _progress_file_path(location)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_content_range_regex = re.compile(r"bytes (?P<start>\d+)-(?P<end>\d+)/(?P<size>\d+)")
+
+
+def _first_request_headers() -> Dict[str, str]:
+    """
+    Headers of the first request of a download.
+    The request asks only for the bytes up to the range threshold, rounded up to whole parts.
+    Smaller files come whole in the response, bigger files continue with a ranged download.
+    """
+    if config.download_range_threshold <= 0:
+        return {}
+    size = math.ceil(config.download_range_threshold / config.download_part_size) * config.download_part_size
+    return {"Range": f"bytes=0-{size - 1}"}
+
+
+def _parse_content_range(resp: Response) -> Optional[Tuple[int, int]]:
+    """
+    Returns the (last byte, total size) of a partial response, or None if they aren't known
+    """
+    # Compressed responses have ranges of the compressed content, they can't be written to the file as is
+    if resp.headers.get("content-encoding", "identity").lower() != "identity":
+        return None
+    match = _content_range_regex.fullmatch(resp.headers.get("content-range", ""))
+    if match is None or match.group("start") != "0":
+        return None
+    return int(match.group("end")), int(match.group("size"))
+
+
+def _is_whole_file(resp: Response) -> bool:
+    """
+    Returns True if the partial response has all of the file
+    """
+    if resp.status_code != 206:
+        return False
+    content_range = _parse_content_range(resp)
+    return content_range is not None and content_range[0] == content_range[1] - 1
+
+
+def _get_ranged_download_progress(url: str, resp: Response) -> Optional[_RangeDownloadProgress]:
+    """
+    Returns the progress of a new ranged download if the response to the first request
+    has only the beginning of the file, otherwise returns None
+    """
+    if resp.status_code != 206:
+        return None
+    content_range = _parse_content_range(resp)
+    if content_range is None:
+        return None
+    end, size = content_range
+    if end >= size - 1:
+        return None
+    return _RangeDownloadProgress(
+        url=url, size=size, part_size=config.download_part_size, etag=resp.headers.get("etag")
+    )
+
+
+def _start_ranged_download(location: Path, progress: _RangeDownloadProgress):
+    location.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = _partial_file_path(location)
+    if not partial_path.exists():
+        with open(partial_path, "wb") as f:
+            f.truncate(progress.size)
+        progress.completed_parts = set()
+    progress.save(location)
+
+
+def _finish_ranged_download(location: Path):
+    os.replace(_partial_file_path(location), location)
+    os.remove(_progress_file_path(location))
+
+
+class _HeadPartsWriter:
+    """
+    Writes the parts at the beginning of the file out of the response to the first request of the download,
+    which has the bytes up to ``head_end``. These parts don't need to be requested again.
+
+    Use as a context manager and pass the chunks of the response to :meth:`write`.
+    """
+
+    def __init__(self, location: Path, progress: _RangeDownloadProgress, head_end: int):
+        self.location = location
+        self.progress = progress
+        self.parts = range((head_end + 1) // progress.part_size)
+        self._end = len(self.parts) * progress.part_size
+        self._offset = 0
+        self._file: Optional[BinaryIO] = None
+
+    @property
+    def done(self) -> bool:
+        return self._offset >= self._end
+
+    def __enter__(self) -> "_HeadPartsWriter":
+        self._file = open(_partial_file_path(self.location), "r+b")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+        if exc_type is None and not self.done:
+            raise RangesNotSupportedError()
+
+    def write(self, chunk: bytes) -> bool:
+        """
+        Writes the next chunk of the response. Returns True once all the parts are written
+        """
+        chunk = chunk[: self._end - self._offset]
+        self._file.write(chunk)
+        start = self._offset
+        self._offset += len(chunk)
+        completed = range(start // self.progress.part_size, self._offset // self.progress.part_size)
+        if len(completed) > 0:
+            self._file.flush()
+            for part in completed:
+                self.progress.complete_part(part, self.location)
+        return self.done
+
+
+def _download_in_ranges(
+    url: str, location: Path, auth: Auth, progress: _RangeDownloadProgress, head: Optional[Response] = None
+):
+    """
+    Downloads the file in parts concurrently, using HTTP range requests.
+
+    Parts are written straight to their offset in a preallocated ``.dagshub-partial`` file next to the location.
+    Completed parts are recorded in a sidecar progress file,
+    so if the download gets interrupted, calling this function again only downloads the missing parts.
+    Once all parts are there, the partial file is renamed to the location.
+
+    Args:
+        head: Response to the first request of the download, with the beginning of the file.
+            The parts it has are written from it on the calling thread, while the rest of the parts get downloaded.
+    """
+    _start_ranged_download(location, progress)
+    head_writer = None
+    if head is not None:
+        head_writer = _HeadPartsWriter(location, progress, _parse_content_range(head)[0])
+
+    def write_head():
+        with head_writer:
+            for chunk in head.iter_bytes(config.download_chunk_size):
+                if head_writer.write(chunk):
+                    break
+
+    skipped_parts = head_writer.parts if head_writer is not None else range(0)
+    missing_parts = [
+        p for p in range(progress.num_parts) if p not in progress.completed_parts and p not in skipped_parts
+    ]
+    _download_parts(url, location, auth, progress, missing_parts, write_head if head_writer is not None else None)
+    _finish_ranged_download(location)
+
+
+def _download_parts(
+    url: str,
+    location: Path,
+    auth: Auth,
+    progress: _RangeDownloadProgress,
+    parts: List[int],
+    alongside: Optional[Callable[[], None]] = None,
+):
+    """
+    Downloads the parts of a started ranged download concurrently.
+    ``alongside`` is run on the calling thread while the parts are downloading.
+    """
+    partial_path = _partial_file_path(location)
+
+    def download_part(part: int):
+        start, end = progress.part_range(part)
+        headers = {"Range": f"bytes={start}-{end}"}
+        if progress.etag is not None:
+            # If the file changed, the server will return the whole file with status 200 instead of a 206
+            headers["If-Range"] = progress.etag
+        with http_stream("GET", url, auth=auth, timeout=600, headers=headers) as resp:
+            if resp.status_code == 200 or resp.status_code == 416:
+                raise RangesNotSupportedError()
+            if resp.status_code != 206:
+                raise DownloadError(resp)
+            with open(partial_path, "r+b") as f:
+                f.seek(start)
+                written = 0
+                for chunk in resp.iter_bytes(config.download_chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            if written != end - start + 1:
+                raise RangesNotSupportedError()
+        progress.complete_part(part, location)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(config.download_part_threads, len(parts)))) as tp:
+        futures = [tp.submit(download_part, part) for part in parts]
+        try:
+            if alongside is not None:
+                alongside()
+            for f in as_completed(futures):
+                f.result()
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+
+@contextmanager
+def atomic_write(location: Path) -> Iterator[BinaryIO]:
+    """
+    Opens a temporary file next to ``location`` for binary writing.
+    Once the context exits successfully, the temporary file is renamed to ``location``.
+    On failure the temporary file is deleted, so partially written files never show up at ``location``.
+    """
+    location = Path(location)
+    location.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=location.parent, prefix=f".{location.name}.", suffix=".dagshub-tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, location)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_response_to_file(resp: Response, location: Path, chunk_size: Optional[int] = None):
+    """
+    Streams the body of the response into ``location`` in chunks, keeping memory usage bounded by the chunk size.
+
+    Args:
+        resp: Response opened in streaming mode, with its body not read yet
+        location: Where to save the file
+        chunk_size: Size of the chunks to read. Default is the config value of download_chunk_size (1 MiB)
+    """
+    if chunk_size is None:
+        chunk_size = config.download_chunk_size
+    with atomic_write(location) as f:
+        for chunk in resp.iter_bytes(chunk_size):
+            f.write(chunk)
+
+
+def read_response_range(
+    resp: Response, start: int, end: Optional[int] = None, chunk_size: Optional[int] = None
+) -> bytes:
+    """
+    Reads a byte range out of a response with the whole file, e.g. when the server ignored the Range header.
+    Only the bytes of the range are kept in memory, and the rest of the response isn't read after the range ends.
+
+    Args:
+        resp: Response opened in streaming mode, with its body not read yet
+        start: First byte of the range
+        end: Last byte of the range (inclusive). If None, reads until the end of the file
+        chunk_size: Size of the chunks to read. Default is the config value of download_chunk_size (1 MiB)
+    """
+    if chunk_size is None:
+        chunk_size = config.download_chunk_size
+    parts = []
+    offset = 0
+    for chunk in resp.iter_bytes(chunk_size):
+        chunk_end = offset + len(chunk)
+        if chunk_end > start:
+            parts.append(chunk[max(start - offset, 0) : None if end is None else end + 1 - offset])
+        offset = chunk_end
+        if end is not None and offset > end:
+            break
+    return b"".join(parts)
+
+
+def _write_content_to_file(content: Union[bytes, BinaryIO], location: Path):
+    with atomic_write(location) as f:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            f.write(content)
+        else:
+            if hasattr(content, "seek"):
+                content.seek(0)
+            shutil.copyfileobj(content, f, config.download_chunk_size)
 
 
 BucketDownloaderFuncType = Callable[[str, str], bytes]
 
 _bucket_downloader_map: Dict[str, BucketDownloaderFuncType] = {}
-_default_downloader: Optional[Callable[[str], bytes]] = None
+_default_downloader: Optional[DownloadFunctionType] = None
 
 
 def add_bucket_downloader(proto: Literal["gs", "s3", "azure"], func: BucketDownloaderFuncType):
@@ -186,19 +593,78 @@ def _download_wrapper(url: str, location: Path, skip_if_exists: bool):
     assert _default_downloader is not None
     if bucket_tuple is None:
         # Not a bucket path - download regularly
-        content = _default_downloader(url)
+        _default_downloader(url, location)
     else:
         # Bucket path - try to look if there's a custom downloader
         proto, bucket_name, bucket_path = bucket_tuple
         bucket_downloader = _bucket_downloader_map.get(proto)
         if bucket_downloader is None:
-            content = _default_downloader(url)
+            _default_downloader(url, location)
         else:
-            content = bucket_downloader(bucket_name, bucket_path)
+            _write_content_to_file(bucket_downloader(bucket_name, bucket_path), location)
 
-    location.parent.mkdir(parents=True, exist_ok=True)
-    with open(location, "wb") as f:
-        f.write(content)
+
+def deduplicated_download_fn(
+    object_store: "ObjectStore",
+    content_keys: Mapping[str, str],
+    download_fn: Optional[DownloadFunctionType] = None,
+    skip_if_exists=True,
+) -> DownloadFunctionType:
+    """
+    Wraps the download function, so files with content that is already in the object store
+    get hardlinked from the store instead of being downloaded, and downloaded files get added to the store.
+
+    Parameters:
+        object_store: Store of the downloaded files, e.g. :func:`~dagshub.common.object_store.get_file_store`
+        content_keys: Keys of the files' content in the store, by download url.
+            Files without a key are downloaded as usual. The mapping can be filled while the download is running
+        download_fn: Function that downloads the file, same as in :func:`download_files`
+        skip_if_exists: skip the download if the file exists
+    """
+    if download_fn is None:
+        _ensure_default_downloader_exists()
+        download_fn = partial(_download_wrapper, skip_if_exists=skip_if_exists)
+
+    def download(url: str, location: Path):
+        if skip_if_exists and os.path.exists(location):
+            return
+        key = content_keys.get(url)
+        if key is not None and object_store.link(key, location) is not None:
+            return
+        download_fn(url, location)
+        if key is not None and os.path.exists(location):
+            try:
+                object_store.add_file(key, location)
+            except OSError:
+                logger.warning(f"Couldn't add {location} to the object store", exc_info=True)
+
+    return download
+
+
+def cache_recording_download_fn(
+    file_cache: "ManagedFileCache",
+    download_fn: Optional[DownloadFunctionType] = None,
+    skip_if_exists=True,
+) -> DownloadFunctionType:
+    """
+    Wraps the download function, so every file gets recorded in the file cache as soon as it's downloaded.
+    This way the cache evicts older files during the download, instead of going over its max size
+    by the size of all the downloaded files first.
+
+    Parameters:
+        file_cache: Cache to record the files in, e.g. :func:`~dagshub.common.file_cache.get_dataset_file_cache`
+        download_fn: Function that downloads the file, same as in :func:`download_files`
+        skip_if_exists: skip the download if the file exists
+    """
+    if download_fn is None:
+        _ensure_default_downloader_exists()
+        download_fn = partial(_download_wrapper, skip_if_exists=skip_if_exists)
+
+    def download(url: str, location: Path):
+        download_fn(url, location)
+        file_cache.record(location)
+
+    return download
 
 
 def _ensure_default_downloader_exists():
@@ -216,9 +682,10 @@ def download_files(
     download_fn: Optional[DownloadFunctionType] = None,
     threads=config.download_threads,
     skip_if_exists=True,
+    engine: Optional[Literal["threads", "asyncio"]] = None,
 ):
     """
-    Download files using multithreading
+    Download files using multithreading or asyncio
 
     Parameters:
         files: list of (download_url: str, file_location: str or Path)
@@ -228,7 +695,15 @@ def download_files(
             CAUTION: function needs to be pickleable since we're using ThreadPool to execute
         threads: number of threads to run this function on, defaults to the config value of download_threads (32)
         skip_if_exists: skip the download if the file exists (only for the default downloader)
+        engine: How to download multiple files, defaults to the config value of download_engine ("threads").
+            ``"asyncio"`` downloads all the files on a single event loop, which scales better to thousands of
+            small files. Works only with the default downloader, a custom ``download_fn`` always runs on threads.
     """
+    if engine is None:
+        engine = config.download_engine
+    if engine not in ("threads", "asyncio"):
+        raise ValueError(f'Unknown download engine "{engine}". Possible values: "threads", "asyncio"')
+
     _ensure_default_downloader_exists()
 
     # Convert string paths to Path objects
@@ -236,38 +711,17 @@ def download_files(
         if isinstance(file_tuple[1], str):
             files[i] = (file_tuple[0], Path(file_tuple[1]))
 
+    # The asyncio engine has its own downloader, so it only applies when the caller didn't pass a download_fn
+    if len(files) > 1 and engine == "asyncio" and download_fn is None:
+        run_coroutine_sync(download_files_async(files, skip_if_exists=skip_if_exists))
+        return
+
     if download_fn is None:
         download_fn = partial(_download_wrapper, skip_if_exists=skip_if_exists)
 
     if len(files) > 1:
         # Multiple files - multithreaded download
-        progress = get_rich_progress(rich.progress.MofNCompleteColumn(), transient=False)
-        task = progress.add_task("Downloading files...", total=len(files))
-
-        with progress:
-            with ThreadPoolExecutor(max_workers=threads) as tp:
-
-                def cancel_download(*args):
-                    logger.warning("Interrupt received - shutting down downloader")
-                    tp.shutdown(wait=False, cancel_futures=True)
-
-                orig_interrupt = None
-                try:
-                    orig_interrupt = signal.signal(signal.SIGINT, cancel_download)
-                # ValueError means the function is not running from the main thread.
-                # TODO: figure out a workaround
-                except ValueError:
-                    pass
-
-                futures = [tp.submit(download_fn, url, location) for (url, location) in files]
-                for f in as_completed(futures):
-                    exc = f.exception()
-                    if exc is not None:
-                        logger.warning(f"Got exception {type(exc)} while downloading file: {exc}")
-                    progress.update(task, advance=1)
-
-                if orig_interrupt is not None:
-                    signal.signal(signal.SIGINT, orig_interrupt)
+        download_files_pipelined(files, download_fn, threads=threads, total=len(files))
 
     elif len(files) == 1:
         # Single file - don't bother with the multithreading, just download the file
@@ -276,3 +730,234 @@ def download_files(
             download_fn(url, location)
         except Exception as exc:
             logger.warning(f"Got exception {type(exc)} while downloading file: {exc}")
+
+
+_NO_MORE_FILES = object()
+
+
+def download_files_pipelined(
+    files: Iterable[Tuple[str, Union[str, Path]]],
+    download_fn: Optional[DownloadFunctionType] = None,
+    threads: Optional[int] = None,
+    skip_if_exists=True,
+    queue_size: Optional[int] = None,
+    total: Optional[int] = None,
+    progress: Optional[rich.progress.Progress] = None,
+) -> int:
+    """
+    Download files while they are still being produced, e.g. by a repository traversal.
+
+    The files are consumed from the iterable on the calling thread and handed over to the download threads
+    through a bounded queue.
+    When the downloads can't keep up, consuming the iterable blocks until there's room in the queue,
+    so the memory use doesn't depend on the number of files.
+    An interrupt (Ctrl+C) stops both consuming the iterable and downloading the files that are still queued.
+
+    Parameters:
+        files: iterable of (download_url: str, file_location: str or Path)
+        download_fn: Optional function that will download the file, same as in :func:`download_files`
+        threads: number of download threads, defaults to the config value of download_threads (32)
+        skip_if_exists: skip the download if the file exists (only for the default downloader)
+        queue_size: maximum number of files waiting for a download thread,
+            defaults to the config value of download_queue_size
+        total: Number of files, if known in advance. Otherwise the progress shows the number of files found so far
+        progress: Progress to show the download in. If None, a new progress is shown for the download.
+
+    Returns:
+        Number of files that were consumed from the iterable
+    """
+    _ensure_default_downloader_exists()
+
+    if download_fn is None:
+        download_fn = partial(_download_wrapper, skip_if_exists=skip_if_exists)
+    if threads is None:
+        threads = config.download_threads
+    if queue_size is None:
+        queue_size = config.download_queue_size
+
+    work_queue: "queue.Queue" = queue.Queue(maxsize=max(queue_size, 1))
+    cancelled = threading.Event()
+
+    own_progress = progress is None
+    if own_progress:
+        progress = get_rich_progress(rich.progress.MofNCompleteColumn(), transient=False)
+    task = progress.add_task("Downloading files...", total=total)
+
+    def download_worker():
+        while True:
+            # Every worker gets its own end marker, so the workers can block on the queue
+            item = work_queue.get()
+            if item is _NO_MORE_FILES:
+                return
+            if cancelled.is_set():
+                # Drain the queue without downloading
+                continue
+            url, location = item
+            try:
+                download_fn(url, location)
+            except Exception as exc:
+                logger.warning(f"Got exception {type(exc)} while downloading file: {exc}")
+            progress.update(task, advance=1)
+
+    def enqueue(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                work_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def cancel_download(*args):
+        logger.warning("Interrupt received - shutting down downloader")
+        cancelled.set()
+
+    orig_interrupt = None
+    try:
+        orig_interrupt = signal.signal(signal.SIGINT, cancel_download)
+    # ValueError means the function is not running from the main thread.
+    except ValueError:
+        pass
+
+    num_files = 0
+    try:
+        if own_progress:
+            progress.start()
+        with ThreadPoolExecutor(max_workers=threads) as tp:
+            workers = []
+            try:
+                for url, location in files:
+                    if isinstance(location, str):
+                        location = Path(location)
+                    # Workers are only started for the files that are there, up to the number of threads
+                    if len(workers) < threads:
+                        workers.append(tp.submit(download_worker))
+                    if not enqueue((url, location)):
+                        break
+                    num_files += 1
+                    if total is None:
+                        progress.update(task, total=num_files)
+            except BaseException:
+                cancelled.set()
+                raise
+            finally:
+                for _ in workers:
+                    work_queue.put(_NO_MORE_FILES)
+                wait(workers)
+    finally:
+        if orig_interrupt is not None:
+            signal.signal(signal.SIGINT, orig_interrupt)
+        if own_progress:
+            progress.stop()
+    return num_files
+
+
+async def _async_dagshub_download(client: AsyncClient, url: str, location: Path, auth: Auth):
+    if _RangeDownloadProgress.load(location) is not None:
+        # Interrupted ranged download - let the threaded downloader resume it
+        await asyncio.to_thread(_dagshub_download, url, location, auth)
+        return
+
+    request_args = _add_default_request_args({"auth": auth, "timeout": 600, "headers": _first_request_headers()})
+    async with client.stream("GET", url, **request_args) as resp:
+        if resp.status_code != 200 and resp.status_code != 206 and resp.status_code != 416:
+            raise DownloadError(resp)
+        if resp.status_code == 200 or _is_whole_file(resp):
+            # Files under the range threshold are written right on the loop, the writes are short enough
+            with atomic_write(location) as f:
+                async for chunk in resp.aiter_bytes(config.download_chunk_size):
+                    f.write(chunk)
+            return
+        progress = _get_ranged_download_progress(url, resp)
+        if progress is not None:
+            # The file is big enough to get downloaded in parts - the rest of the parts are downloaded on threads,
+            # while the beginning of the file is written out of this response
+            try:
+                await _async_download_in_ranges(url, location, auth, progress, head=resp)
+                return
+            except RangesNotSupportedError:
+                _discard_ranged_download(location)
+    # The server couldn't give the file in ranges - let the threaded downloader get all of it
+    await asyncio.to_thread(_dagshub_download, url, location, auth)
+
+
+async def _async_download_in_ranges(
+    url: str, location: Path, auth: Auth, progress: _RangeDownloadProgress, head: Response
+):
+    _start_ranged_download(location, progress)
+    head_writer = _HeadPartsWriter(location, progress, _parse_content_range(head)[0])
+    missing_parts = [p for p in range(progress.num_parts) if p not in head_writer.parts]
+
+    async def write_head():
+        with head_writer:
+            async for chunk in head.aiter_bytes(config.download_chunk_size):
+                if head_writer.write(chunk):
+                    break
+
+    # Both have to finish before anything happens to the partial file
+    results = await asyncio.gather(
+        write_head(),
+        asyncio.to_thread(_download_parts, url, location, auth, progress, missing_parts),
+        return_exceptions=True,
+    )
+    for res in results:
+        if isinstance(res, BaseException):
+            raise res
+    _finish_ranged_download(location)
+
+
+async def _async_download_wrapper(client: AsyncClient, url: str, location: Path, auth: Auth, skip_if_exists: bool):
+    if skip_if_exists and os.path.exists(location):
+        return
+
+    bucket_tuple = download_url_to_bucket_path(url)
+    if bucket_tuple is not None:
+        proto, bucket_name, bucket_path = bucket_tuple
+        bucket_downloader = _bucket_downloader_map.get(proto)
+        if bucket_downloader is not None:
+            # Bucket downloaders are blocking
+            content = await asyncio.to_thread(bucket_downloader, bucket_name, bucket_path)
+            await asyncio.to_thread(_write_content_to_file, content, location)
+            return
+    await _retry_on_server_error(_async_dagshub_download)(client, url, location, auth)
+
+
+async def download_files_async(
+    files: List[Tuple[str, Union[str, Path]]],
+    concurrency: Optional[int] = None,
+    skip_if_exists=True,
+):
+    """
+    Download files concurrently on the running event loop with the default DagsHub downloader.
+
+    Awaiting this from an already running loop (e.g. in Jupyter) doesn't block the loop.
+    From synchronous code use :func:`download_files` with ``engine="asyncio"``.
+
+    Parameters:
+        files: list of (download_url: str, file_location: str or Path)
+        concurrency: Maximum number of files being downloaded at the same time,
+            defaults to the config value of async_download_concurrency (256)
+        skip_if_exists: skip the download if the file exists
+    """
+    if concurrency is None:
+        concurrency = config.async_download_concurrency
+    auth = get_authenticator()
+
+    progress = get_rich_progress(rich.progress.MofNCompleteColumn(), transient=False)
+    task = progress.add_task("Downloading files...", total=len(files))
+
+    # A fixed number of workers share the iterator instead of a task per file,
+    # so the memory use doesn't grow with the number of files
+    files_iter = iter(files)
+
+    async def download_worker():
+        for url, location in files_iter:
+            try:
+                await _async_download_wrapper(client, url, Path(location), auth, skip_if_exists)
+            except Exception as exc:
+                logger.warning(f"Got exception {type(exc)} while downloading file: {exc}")
+            progress.update(task, advance=1)
+
+    with progress:
+        async with create_async_client(max_connections=concurrency) as client:
+            await asyncio.gather(*(download_worker() for _ in range(min(concurrency, len(files)))))
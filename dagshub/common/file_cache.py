@@ -0,0 +1,236 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Literal, Optional, Set, Tuple, Union
+
+from dagshub.common import config
+from dagshub.common.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger(__name__)
+
+EvictionPolicy = Literal["lru", "lfu"]
+
+_eviction_order: Dict[str, str] = {
+    "lru": "last_access ASC",
+    "lfu": "access_count ASC, last_access ASC",
+}
+
+
+class ManagedFileCache:
+    """
+    Size-bounded cache of downloaded files.
+
+    The files stay where they were downloaded to, the cache only keeps an index of them
+    (size, time of the last access, number of accesses), so eviction never needs to scan directories.
+    Once the total size of the indexed files goes over ``max_size``,
+    the least recently used (``"lru"``) or least frequently used (``"lfu"``) files are deleted.
+
+    Files that are in use can be pinned, pinned files are never evicted.
+    Pins are held per process - pins of processes that have exited are ignored.
+
+    The index can be shared between threads and processes.
+
+    Args:
+        index_location: Location of the index database
+        max_size: Maximum total size of the files in bytes
+        policy: Eviction policy, ``"lru"`` or ``"lfu"``
+    """
+
+    # The total size of the files is kept in a single-row table, updated by triggers in the same transaction
+    # as the changes of the files, so checking the budget doesn't need to go over all the files
+    _schema = """
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        last_access REAL NOT NULL,
+        access_count INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS files_lru ON files (last_access);
+    CREATE INDEX IF NOT EXISTS files_lfu ON files (access_count, last_access);
+    CREATE TABLE IF NOT EXISTS pins (
+        path TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (path, pid)
+    );
+    CREATE TABLE IF NOT EXISTS total (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        size INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO total (id, size)
+        SELECT 0, COALESCE(SUM(size), 0) FROM files WHERE NOT EXISTS (SELECT 1 FROM total);
+    CREATE TRIGGER IF NOT EXISTS files_insert AFTER INSERT ON files
+        BEGIN UPDATE total SET size = size + NEW.size; END;
+    CREATE TRIGGER IF NOT EXISTS files_update AFTER UPDATE OF size ON files
+        BEGIN UPDATE total SET size = size - OLD.size + NEW.size; END;
+    CREATE TRIGGER IF NOT EXISTS files_delete AFTER DELETE ON files
+        BEGIN UPDATE total SET size = size - OLD.size; END;
+    COMMIT;
+    """
+
+    # Number of eviction candidates that are read from the index at a time
+    _eviction_batch = 64
+
+    def __init__(self, index_location: Union[str, Path], max_size: int, policy: EvictionPolicy = "lru"):
+        if policy not in _eviction_order:
+            raise ValueError(f'Unknown eviction policy "{policy}". Possible values: {list(_eviction_order.keys())}')
+        self.max_size = max_size
+        self.policy = policy
+        self.db = SqliteDatabase(index_location, self._schema)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return str(Path(path).absolute())
+
+    def record(self, *paths: Union[str, Path]):
+        """
+        Records an access to the files (adding them to the index if they're new), and evicts files if needed.
+        The recorded files themselves aren't evicted by this call.
+        """
+        now = time.time()
+        rows = []
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            rows.append((self._key(path), size, now))
+        if not rows:
+            return
+        self.db.executemany(
+            "INSERT INTO files (path, size, last_access, access_count) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT(path) DO UPDATE SET "
+            "size = excluded.size, last_access = excluded.last_access, access_count = access_count + 1",
+            rows,
+        )
+        self.evict(keep={row[0] for row in rows})
+
+    def pin(self, *paths: Union[str, Path]):
+        """
+        Protects the files from being evicted until they're unpinned. Pins are counted.
+        """
+        pid = os.getpid()
+        self.db.executemany(
+            "INSERT INTO pins (path, pid, count) VALUES (?, ?, 1) "
+            "ON CONFLICT(path, pid) DO UPDATE SET count = count + 1",
+            [(self._key(path), pid) for path in paths],
+        )
+
+    def unpin(self, *paths: Union[str, Path]):
+        pid = os.getpid()
+        keys = [(self._key(path), pid) for path in paths]
+        self.db.executemany("UPDATE pins SET count = count - 1 WHERE path = ? AND pid = ?", keys)
+        self.db.execute("DELETE FROM pins WHERE count <= 0")
+
+    @contextmanager
+    def pinned(self, *paths: Union[str, Path]) -> Iterator[None]:
+        """
+        Pins the files for the duration of the context
+        """
+        self.pin(*paths)
+        try:
+            yield
+        finally:
+            self.unpin(*paths)
+
+    def total_size(self) -> int:
+        return self.db.execute("SELECT size FROM total")[0][0]
+
+    def evict(self, keep: Optional[Set[str]] = None):
+        """
+        Deletes files until the total size is at most the max size of the cache.
+        Pinned files, and files from ``keep`` are skipped.
+        """
+        excess = self.total_size() - self.max_size
+        if excess <= 0:
+            return
+        skipped = self._pinned_paths()
+        if keep is not None:
+            skipped |= keep
+        # The candidates are read in batches, evicted files leave the index, so the next batch starts after
+        # the files that were left in place
+        left_in_place = 0
+        while excess > 0:
+            rows = self.db.execute(
+                f"SELECT path, size FROM files ORDER BY {_eviction_order[self.policy]} LIMIT ? OFFSET ?",
+                (self._eviction_batch, left_in_place),
+            )
+            if not rows:
+                break
+            evicted = []
+            for path, size in rows:
+                if excess <= 0:
+                    break
+                if path in skipped:
+                    left_in_place += 1
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.debug(f"Couldn't evict {path}: {e}")
+                    left_in_place += 1
+                    continue
+                evicted.append((path,))
+                excess -= size
+            self.db.executemany("DELETE FROM files WHERE path = ?", evicted)
+        if excess > 0:
+            logger.warning(
+                f"Files that are in use take more space than the cache budget of {self.max_size} bytes, "
+                f"the cache is {excess} bytes over the budget"
+            )
+
+    def _pinned_paths(self) -> Set[str]:
+        rows = self.db.execute("SELECT path, pid FROM pins")
+        alive: Dict[int, bool] = {}
+        res = set()
+        dead_pins = []
+        for path, pid in rows:
+            if pid not in alive:
+                alive[pid] = _is_process_alive(pid)
+            if alive[pid]:
+                res.add(path)
+            else:
+                dead_pins.append((path, pid))
+        if dead_pins:
+            self.db.executemany("DELETE FROM pins WHERE path = ? AND pid = ?", dead_pins)
+        return res
+
+
+def _is_process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows, assume that it's alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists, but belongs to another user
+        return True
+    return True
+
+
+_caches: Dict[Tuple[str, int, str], ManagedFileCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_dataset_file_cache() -> Optional[ManagedFileCache]:
+    """
+    Returns the cache of the datapoint files downloaded by the data engine,
+    or None if there's no budget configured for them
+    """
+    if config.dataset_cache_max_size <= 0:
+        return None
+    key = (config.dataset_cache_index_location, config.dataset_cache_max_size, config.dataset_cache_eviction_policy)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ManagedFileCache(*key)
+        return _caches[key]
@@ -3,9 +3,8 @@ import urllib
 from os.path import ismount
 from pathlib import Path
 
-import httpx
-
 from dagshub.common import config, rich_console
+from dagshub.common.http_pool import get_http_pool
 
 default_logger = logging.getLogger("dagshub")
 
@@ -41,6 +40,9 @@ def http_request(method, url, **kwargs):
     """
     Perform an HTTP request using the specified method and URL.
 
+    The request is sent through the process-wide pooled client,
+    so connections to the same host are kept alive and reused between requests.
+
     Args:
         method (str): The HTTP method (e.g., 'GET', 'POST') for the request.
         url (str): The URL to send the HTTP request to.
@@ -48,6 +50,29 @@ def http_request(method, url, **kwargs):
     Returns:
         httpx.Response: The HTTP response object containing the result of the request.
     """
+    return get_http_pool().request(method, url, **_add_default_request_args(kwargs))
+
+
+def http_stream(method, url, **kwargs):
+    """
+    Same as :func:`http_request`, but doesn't read the body of the response.
+    Use as a context manager, and consume the body in chunks with ``response.iter_bytes()``::
+
+        with http_stream("GET", url) as resp:
+            for chunk in resp.iter_bytes():
+                ...
+
+    Args:
+        method (str): The HTTP method (e.g., 'GET', 'POST') for the request.
+        url (str): The URL to send the HTTP request to.
+
+    Returns:
+        Context manager yielding the httpx.Response with an unread body.
+    """
+    return get_http_pool().stream(method, url, **_add_default_request_args(kwargs))
+
+
+def _add_default_request_args(kwargs):
     mixin_args = {"timeout": config.http_timeout, "follow_redirects": True}
     # Set only if it's not set previously
     for arg in mixin_args:
@@ -57,7 +82,7 @@ def http_request(method, url, **kwargs):
     headers = kwargs.get("headers", {})
     headers.update(config.requests_headers)
     kwargs["headers"] = headers
-    return httpx.request(method, url, **kwargs)
+    return kwargs
 
 
 def get_project_root(root):
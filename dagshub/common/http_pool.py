@@ -0,0 +1,228 @@
+import atexit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from dagshub.common import config
+
+logger = logging.getLogger(__name__)
+
+# httpcore trace events that mean that a new connection had to be opened for the request
+_NEW_CONNECTION_EVENTS = {
+    "connection.connect_tcp.started",
+    "connection.connect_unix_socket.started",
+}
+
+OriginType = Tuple[str, str, int]
+
+
+@dataclass
+class HTTPPoolStats:
+    """
+    Connection reuse statistics of the pooled HTTP client of a single host
+    """
+
+    requests: int = 0
+    """
+    Number of requests sent to the host (a redirect chain counts as one request)
+    """
+    hits: int = 0
+    """
+    Requests that were fully served by already open keep-alive connections
+    """
+    misses: int = 0
+    """
+    Requests that had to open at least one new connection
+    """
+
+    @property
+    def hit_rate(self) -> float:
+        if self.requests == 0:
+            return 0.0
+        return self.hits / self.requests
+
+
+def _client_settings(max_connections: int) -> Dict[str, Any]:
+    """
+    Settings shared by the sync and async clients
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(config.http_max_keepalive_connections, max_connections),
+        keepalive_expiry=config.http_keepalive_expiry,
+    )
+    # Don't let cookies leak between requests, every request should behave as if it was sent on its own
+    cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    http2 = config.http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 was requested, but the h2 package isn't installed. Falling back to HTTP/1.1")
+            http2 = False
+    return {"limits": limits, "http2": http2, "cookies": cookies}
+
+
+def create_async_client(max_connections: Optional[int] = None) -> httpx.AsyncClient:
+    """
+    Creates an ``httpx.AsyncClient`` with the same settings as the clients of the pool.
+
+    Async clients are bound to the event loop they were first used in, so they aren't pooled.
+    The caller owns the client and needs to close it.
+
+    Args:
+        max_connections: Maximum number of open connections. Default is the config value of
+            http_max_connections_per_host
+    """
+    if max_connections is None:
+        max_connections = config.http_max_connections_per_host
+    return httpx.AsyncClient(**_client_settings(max_connections))
+
+
+class HTTPClientPool:
+    """
+    Process-wide pool of ``httpx.Client`` objects, one per origin (scheme, host, port).
+
+    Every client keeps its connections alive between requests,
+    so consecutive requests to the same host don't pay for a new TCP+TLS handshake.
+    Having a client per origin makes the connection limits from the config apply per host.
+
+    The pool is thread-safe, and gets recreated in forked child processes,
+    because sockets can't be shared safely between processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[OriginType, httpx.Client] = {}
+        self._stats: Dict[OriginType, HTTPPoolStats] = {}
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _origin(url) -> OriginType:
+        url = httpx.URL(url)
+        port = url.port
+        if port is None:
+            port = 443 if url.scheme == "https" else 80
+        return url.scheme, url.host, port
+
+    @staticmethod
+    def _create_client() -> httpx.Client:
+        return httpx.Client(**_client_settings(config.http_max_connections_per_host))
+
+    def _check_fork(self):
+        pid = os.getpid()
+        if pid != self._pid:
+            # Forked - the parent's connections can't be used here, start with an empty pool.
+            # Not closing the clients on purpose, that would shut down the sockets of the parent process
+            self._lock = threading.Lock()
+            self._clients = {}
+            self._stats = {}
+            self._pid = pid
+
+    def get_client(self, url) -> httpx.Client:
+        """
+        Returns the client that should be used to send requests to the origin of the url
+        """
+        self._check_fork()
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(origin)
+            if client is None:
+                client = self._create_client()
+                self._clients[origin] = client
+                self._stats[origin] = HTTPPoolStats()
+        return client
+
+    def request(self, method, url, **kwargs) -> httpx.Response:
+        opened_connection = self._add_connection_trace(kwargs)
+        resp = self.get_client(url).request(method, url, **kwargs)
+        self._record(url, opened_connection[0])
+        return resp
+
+    @contextmanager
+    def stream(self, method, url, **kwargs) -> Iterator[httpx.Response]:
+        """
+        Sends a request without reading the body of the response.
+        The body can be consumed in chunks with ``response.iter_bytes()`` inside the context.
+        """
+        opened_connection = self._add_connection_trace(kwargs)
+        with self.get_client(url).stream(method, url, **kwargs) as resp:
+            self._record(url, opened_connection[0])
+            yield resp
+
+    @staticmethod
+    def _add_connection_trace(request_kwargs) -> List[bool]:
+        """
+        Adds a trace hook to the request arguments.
+        The first element of the returned list gets set to True if a new connection was opened for the request.
+        """
+        opened_connection = [False]
+
+        def trace(event_name, info):
+            if event_name in _NEW_CONNECTION_EVENTS:
+                opened_connection[0] = True
+
+        request_kwargs["extensions"] = {**request_kwargs.get("extensions", {}), "trace": trace}
+        return opened_connection
+
+    def _record(self, url, opened_connection: bool):
+        origin = self._origin(url)
+        with self._lock:
+            stats = self._stats.setdefault(origin, HTTPPoolStats())
+            stats.requests += 1
+            if opened_connection:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+
+    def stats(self) -> Dict[str, HTTPPoolStats]:
+        """
+        Returns a copy of the connection reuse statistics, keyed by ``scheme://host:port``
+        """
+        with self._lock:
+            return {
+                f"{scheme}://{host}:{port}": HTTPPoolStats(s.requests, s.hits, s.misses)
+                for (scheme, host, port), s in self._stats.items()
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            for origin in self._stats:
+                self._stats[origin] = HTTPPoolStats()
+
+    def close(self):
+        """
+        Closes all the clients and their connections
+        """
+        with self._lock:
+            if os.getpid() == self._pid:
+                for client in self._clients.values():
+                    client.close()
+            self._clients = {}
+
+
+_pool = HTTPClientPool()
+atexit.register(_pool.close)
+
+
+def get_http_pool() -> HTTPClientPool:
+    """
+    Returns the process-wide HTTP client pool used by all requests the client makes
+    """
+    return _pool
+
+
+def http_pool_stats() -> Dict[str, HTTPPoolStats]:
+    """
+    Returns the per-host connection reuse statistics of the process-wide HTTP client pool
+    """
+    return _pool.stats()
@@ -0,0 +1,349 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from dagshub.common import config
+from dagshub.common.api.responses import ContentAPIEntry
+from dagshub.common.download import atomic_write
+from dagshub.common.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger(__name__)
+
+_key_regex = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+class CorruptedObjectError(Exception):
+    pass
+
+
+class ObjectStore:
+    """
+    On-disk content-addressed store of objects, keyed by the hash of their content.
+
+    Objects are stored once, and get hardlinked into the places where they're needed,
+    so the same content that is used in multiple places doesn't get downloaded and stored multiple times.
+    Where hardlinks aren't possible (e.g. a different filesystem), the objects get copied instead.
+
+    Stored objects are read-only, and so are the hardlinks to them, because they all share the same file:
+    writing to one of them would change all the others.
+    Use :func:`detach` to get a writable copy of a linked file in place.
+
+    The store is bounded by size: once it grows over ``max_size``, the least recently used objects get evicted.
+    Evicting an object doesn't delete the hardlinks to it, only the store's own copy.
+
+    The sha256 digest of every object is recorded when it's added. Contents that are read with :func:`get`
+    are checked against the digest. Objects that are linked are checked by their size and modification time,
+    so the link doesn't read the whole file. Corrupted or modified objects are thrown away instead of being served.
+
+    The store can be shared between threads and processes.
+
+    Args:
+        root: Directory of the store
+        max_size: Maximum total size of the objects in bytes
+    """
+
+    # The total size of the objects is kept in a single-row table, updated by triggers in the same transaction
+    # as the changes of the objects, so checking the size of the store doesn't need to go over all the objects
+    _schema = """
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS objects (
+        key TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        digest TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS objects_last_access ON objects (last_access);
+    CREATE TABLE IF NOT EXISTS total (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        size INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO total (id, size)
+        SELECT 0, COALESCE(SUM(size), 0) FROM objects WHERE NOT EXISTS (SELECT 1 FROM total);
+    CREATE TRIGGER IF NOT EXISTS objects_insert AFTER INSERT ON objects
+        BEGIN UPDATE total SET size = size + NEW.size; END;
+    CREATE TRIGGER IF NOT EXISTS objects_update AFTER UPDATE OF size ON objects
+        BEGIN UPDATE total SET size = size - OLD.size + NEW.size; END;
+    CREATE TRIGGER IF NOT EXISTS objects_delete AFTER DELETE ON objects
+        BEGIN UPDATE total SET size = size - OLD.size; END;
+    COMMIT;
+    """
+
+    # Number of eviction candidates that are read from the index at a time
+    _eviction_batch = 64
+
+    def __init__(self, root: Union[str, Path], max_size: int):
+        self.root = Path(root)
+        self.max_size = max_size
+        self.db = SqliteDatabase(self.root / "index.sqlite", self._schema)
+
+    @staticmethod
+    def is_valid_key(key: str) -> bool:
+        return _key_regex.match(key) is not None
+
+    def object_path(self, key: str) -> Path:
+        if not self.is_valid_key(key):
+            raise ValueError(f"Invalid object key {key!r}")
+        return self.root / "objects" / key[:2] / key
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """
+        Returns the path of the stored object, or None if it's not stored or is corrupted.
+        The file at the path shouldn't be modified, use :func:`link` to get a copy of it somewhere else.
+        """
+        path = self.object_path(key)
+        try:
+            self._verify(key, path)
+        except (FileNotFoundError, CorruptedObjectError) as e:
+            self._discard(key, e)
+            return None
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the content of the stored object, or None if it's not stored or is corrupted.
+        """
+        path = self.object_path(key)
+        try:
+            content = path.read_bytes()
+            self._verify(key, path, content)
+        except (FileNotFoundError, CorruptedObjectError) as e:
+            self._discard(key, e)
+            return None
+        return content
+
+    def put(self, key: str, content: bytes) -> Path:
+        """
+        Stores the content under the key, and returns the path of the stored object.
+        """
+        path = self.object_path(key)
+        with atomic_write(path) as f:
+            f.write(content)
+        _make_read_only(path)
+        self._add(key, path, hashlib.sha256(content).hexdigest())
+        return path
+
+    def put_file(self, key: str, source: Union[str, Path]) -> Path:
+        """
+        Moves the file at ``source`` into the store under the key, and returns the path of the stored object.
+        """
+        path = self.object_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = _file_digest(source)
+        _make_read_only(source)
+        os.replace(source, path)
+        self._add(key, path, digest)
+        return path
+
+    def add_file(self, key: str, source: Union[str, Path]) -> Optional[Path]:
+        """
+        Adds the file at ``source`` to the store under the key, leaving the file in place.
+        The file gets hardlinked into the store, and becomes read-only.
+        If the file can't be hardlinked into the store, it isn't added, so it doesn't take the disk space twice.
+
+        Returns:
+            The path of the stored object, or None if the file wasn't added.
+        """
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{key}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            try:
+                os.link(source, tmp_path)
+            except OSError as e:
+                logger.debug(f"Couldn't hardlink {source} into the object store, not adding it: {e}")
+                return None
+            return self.put_file(key, tmp_path)
+        finally:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+
+    def link(self, key: str, target: Union[str, Path]) -> Optional[Path]:
+        """
+        Makes the stored object show up at ``target``.
+        The object gets hardlinked as a read-only file, if that's not possible - copied as a regular file.
+        An existing file at ``target`` is replaced.
+
+        Returns:
+            ``target``, or None if the object isn't stored.
+        """
+        path = self.get_path(key)
+        if path is None:
+            return None
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.dagshub-tmp")
+        try:
+            try:
+                os.link(path, tmp_target)
+            except OSError:
+                # Different filesystems, or a filesystem that doesn't support hardlinks.
+                # No symlinks - they would dangle once the object gets evicted
+                shutil.copyfile(path, tmp_target)
+            os.replace(tmp_target, target)
+        except BaseException:
+            if os.path.lexists(tmp_target):
+                os.remove(tmp_target)
+            raise
+        return target
+
+    @staticmethod
+    def detach(path: Union[str, Path]) -> bool:
+        """
+        If the file at ``path`` is hardlinked from a store, replaces it with a writable copy of itself,
+        so it can be modified without changing the stored object and the other links to it.
+
+        Returns:
+            Whether the file was replaced
+        """
+        path = Path(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_nlink < 2 or st.st_mode & _write_bits:
+            return False
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.dagshub-tmp")
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def total_size(self) -> int:
+        return self.db.execute("SELECT size FROM total")[0][0]
+
+    def evict(self, max_size: Optional[int] = None):
+        """
+        Removes the least recently used objects until the total size of the store is at most ``max_size``
+        (by default - the max size of the store)
+        """
+        if max_size is None:
+            max_size = self.max_size
+        excess = self.total_size() - max_size
+        while excess > 0:
+            rows = self.db.execute(
+                "SELECT key, size FROM objects ORDER BY last_access ASC LIMIT ?", (self._eviction_batch,)
+            )
+            if not rows:
+                return
+            for key, size in rows:
+                if excess <= 0:
+                    return
+                self._remove(key)
+                excess -= size
+
+    def _add(self, key: str, path: Path, digest: str):
+        st = os.stat(path)
+        # An upsert rather than INSERT OR REPLACE: the replaced row wouldn't fire the delete trigger
+        self.db.execute(
+            "INSERT INTO objects (key, size, digest, mtime_ns, last_access) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET size = excluded.size, digest = excluded.digest, "
+            "mtime_ns = excluded.mtime_ns, last_access = excluded.last_access",
+            (key, st.st_size, digest, st.st_mtime_ns, time.time()),
+        )
+        self.evict()
+
+    def _verify(self, key: str, path: Path, content: Optional[bytes] = None):
+        rows = self.db.execute("SELECT size, digest, mtime_ns FROM objects WHERE key = ?", (key,))
+        if not rows:
+            raise FileNotFoundError(key)
+        size, digest, mtime_ns = rows[0]
+        if content is not None:
+            if len(content) != size or hashlib.sha256(content).hexdigest() != digest:
+                raise CorruptedObjectError(f"Object {key} doesn't match its recorded digest")
+        else:
+            # Any write to the object (e.g. through one of its hardlinks) changes its modification time
+            st = os.stat(path)
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                raise CorruptedObjectError(f"Object {key} was modified after it was stored")
+        self.db.execute("UPDATE objects SET last_access = ? WHERE key = ?", (time.time(), key))
+
+    def _discard(self, key: str, reason: Exception):
+        if isinstance(reason, CorruptedObjectError):
+            logger.warning(f"{reason}, removing it from the store")
+        self._remove(key)
+
+    def _remove(self, key: str):
+        self.db.execute("DELETE FROM objects WHERE key = ?", (key,))
+        path = self.object_path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # Windows doesn't remove read-only files
+            os.chmod(path, stat.S_IWUSR | stat.S_IRUSR)
+            os.remove(path)
+
+
+_write_bits = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def _make_read_only(path: Union[str, Path]):
+    os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) & ~_write_bits)
+
+
+def _file_digest(path: Union[str, Path]) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(config.download_chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+_stores: Dict[str, ObjectStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store() -> Optional[ObjectStore]:
+    """
+    Returns the store of the data engine's metadata blobs, or None if the store is disabled
+    """
+    if config.disable_blob_store:
+        return None
+    location = config.blob_store_location
+    with _stores_lock:
+        if location not in _stores:
+            _stores[location] = ObjectStore(location, config.blob_store_max_size)
+        return _stores[location]
+
+
+def get_file_store(force: bool = False) -> Optional[ObjectStore]:
+    """
+    Returns the store of the downloaded repository files, shared between all repos and revisions,
+    or None if the store isn't enabled (with ``DAGSHUB_ENABLE_FILE_STORE``)
+
+    Args:
+        force: Return the store even if it isn't enabled
+    """
+    if not config.enable_file_store and not force:
+        return None
+    location = config.file_store_location
+    with _stores_lock:
+        if location not in _stores:
+            _stores[location] = ObjectStore(location, config.file_store_max_size)
+        return _stores[location]
+
+
+def content_key(entry: ContentAPIEntry) -> Optional[str]:
+    """
+    Returns the key of the file's content in a store of repository files,
+    or None if the file can't be deduplicated by its hash.
+    Only files versioned by git or DVC qualify, hashes of bucket files don't always reflect their content.
+    """
+    if entry.type != "file" or not entry.hash or entry.versioning not in ("git", "dvc"):
+        return None
+    key = f"{entry.versioning}-{entry.hash}"
+    return key if ObjectStore.is_valid_key(key) else None
@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Generic, Hashable, Iterator, Optional, TypeVar
+
+from dagshub.common import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of lock files that the keys are spread over. Keys that land on the same lock file wait for each other,
+# but the number of files in the locks directory stays bounded no matter how many files get downloaded
+LOCK_STRIPES = 4096
+
+
+@contextmanager
+def process_lock(key: str) -> Iterator[None]:
+    """
+    Exclusive lock of ``key`` between processes, held with ``flock()`` on a lock file
+    in the directory at the config value of download_locks_location.
+
+    The OS releases the lock if the process holding it dies, so a crashed download doesn't block the others.
+    On platforms without ``flock()`` (Windows) and if the lock file can't be created, this doesn't lock anything.
+    """
+    if fcntl is None:
+        yield
+        return
+    stripe = int(hashlib.sha1(key.encode()).hexdigest(), 16) % LOCK_STRIPES
+    lock_path = os.path.join(config.download_locks_location, f"{stripe:03x}.lock")
+    try:
+        os.makedirs(config.download_locks_location, exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+    except OSError as e:
+        logger.debug(f"Couldn't open lock file {lock_path}, not locking {key}: {e}")
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file releases the lock
+        os.close(fd)
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls for the same key into one.
+
+    The first thread that calls :func:`do` with a key runs the function, threads that call it with the same key
+    while the function is running wait for it and get the same result (or exception).
+    Once the function finishes, the next call with the key runs it again.
+
+    With ``across_processes=True``, the function also runs under :func:`process_lock` of the key,
+    so processes doing the same thing (e.g. dataloader workers) wait for each other too.
+    Because of that, the function should check whether the work was already done by another process first.
+    """
+
+    def __init__(self, across_processes: bool = False):
+        self.across_processes = across_processes
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future: Optional[Future] = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+        if not is_leader:
+            return future.result()
+
+        try:
+            if self.across_processes:
+                with process_lock(str(key)):
+                    result = fn()
+            else:
+                result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
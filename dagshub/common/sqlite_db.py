@@ -0,0 +1,79 @@
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteDatabase:
+    """
+    Small wrapper over a sqlite database used for the on-disk caches.
+
+    The database can be shared between processes (it runs in WAL mode with a busy timeout),
+    and the wrapper can be shared between threads - statements are serialized with a lock.
+    The connection is reopened lazily in forked processes.
+
+    Args:
+        path: Location of the database file. Parent directories are created if they don't exist.
+        schema: SQL script that creates the tables. Needs to be idempotent (``CREATE TABLE IF NOT EXISTS``).
+    """
+
+    BUSY_TIMEOUT_SECONDS = 30
+
+    def __init__(self, path: Union[str, Path], schema: str):
+        self.path = Path(path)
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            if self._pid != pid:
+                # Connections can't be carried over forks
+                self._lock = threading.Lock()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=self.BUSY_TIMEOUT_SECONDS, check_same_thread=False, isolation_level=None
+            )
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.OperationalError:
+                # Some filesystems (e.g. network mounts) don't support WAL, the default journal still works
+                logger.debug(f"Couldn't turn on WAL mode for {self.path}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            self._conn = conn
+            self._pid = pid
+        return self._conn
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """
+        Runs a single statement and returns all the resulting rows
+        """
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def executemany(self, sql: str, params: Iterable[Sequence[Any]]):
+        """
+        Runs the statement for every set of params in a single transaction
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(sql, params)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
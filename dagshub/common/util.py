@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import datetime
 import functools
@@ -5,8 +6,9 @@ import gzip
 import types
 import logging
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
-from typing import Union, TypeVar, Dict, Optional
+from typing import Union, TypeVar, Dict, Optional, Coroutine, Any
 from urllib.parse import urljoin, quote
 
 logger = logging.getLogger(__name__)
@@ -141,3 +143,21 @@ def wrap_bytes(val: bytes) -> str:
     """
     compressed = gzip.compress(val)
     return base64.b64encode(compressed).decode("utf-8")
+
+
+T = TypeVar("T")
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs the coroutine to completion from synchronous code and returns its result.
+
+    If the calling thread already runs an event loop (e.g. in Jupyter), the loop can't be blocked on,
+    so the coroutine gets its own event loop in a separate thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as tp:
+        return tp.submit(asyncio.run, coro).result()
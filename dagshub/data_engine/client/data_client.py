@@ -1,5 +1,6 @@
 import datetime
 import logging
+import threading
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import dacite
@@ -24,6 +25,7 @@ from dagshub.data_engine.client.models import (
     MetadataFieldSchema,
     ScanOption,
 )
+from dagshub.data_engine.client.pager import QueryPager
 from dagshub.data_engine.client.query_builder import GqlQuery
 from dagshub.data_engine.model.errors import DataEngineGqlError
 from dagshub.data_engine.model.query_result import QueryResult
@@ -54,6 +56,18 @@ class DataClient:
         self.repo = repo
         self.host = config.host
         self.client = self._init_client()
+        # The gql client runs one request at a time (it raises TransportAlreadyConnected otherwise),
+        # and the query pager runs its requests from a background thread
+        self._exec_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_exec_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._exec_lock = threading.Lock()
 
     def _init_client(self):
         url = f"{self.host}/api/v1/repos/{self.repo}/data-engine/graphql"
@@ -122,55 +136,79 @@ class DataClient:
         if n is None:
             return self._get_all(datasource, include_metadata)
 
-        has_next_page = True
-        after = None
         res = QueryResult([], datasource, [])
-        left = n
+        pager = self.get_pages(datasource, include_metadata, limit=n)
 
         progress = get_rich_progress(rich.progress.MofNCompleteColumn())
-        total_task = progress.add_task("Downloading metadata...", total=left)
+        total_task = progress.add_task("Downloading metadata...", total=n)
 
         with progress:
-            while has_next_page and left > 0:
-                take = min(left, self.FULL_LIST_PAGE_SIZE)
-                resp = self._datasource_query(datasource, include_metadata, take, after)
-                has_next_page = resp["pageInfo"]["hasNextPage"]
-                after = resp["pageInfo"]["endCursor"]
-                new_entries = QueryResult.from_gql_query(resp, datasource)
-                res.entries += new_entries.entries
-                res.fields = new_entries.fields
-                res.query_data_time = new_entries.query_data_time
-                left -= take
-                progress.update(total_task, advance=len(res.entries), refresh=True)
+            for page in pager:
+                res._extend(page)
+                progress.update(total_task, advance=len(page), refresh=True)
+        self._log_page_timings(pager)
         return res
 
     def get_datapoints(self, datasource: "Datasource") -> QueryResult:
         return self._get_all(datasource, True)
 
     def _get_all(self, datasource: "Datasource", include_metadata: bool) -> QueryResult:
-        has_next_page = True
-        after = None
         res = QueryResult([], datasource, [])
         # TODO: smarter batch sizing. Query a constant size at first
         #       On next queries adjust depending on the amount of metadata columns
+        pager = self.get_pages(datasource, include_metadata)
 
         progress = get_rich_progress(rich.progress.MofNCompleteColumn())
         total_task = progress.add_task("Downloading metadata...", total=None)
 
         with progress:
-            while has_next_page:
-                resp = self._datasource_query(datasource, include_metadata, self.FULL_LIST_PAGE_SIZE, after)
-                has_next_page = resp["pageInfo"]["hasNextPage"]
-                after = resp["pageInfo"]["endCursor"]
-
-                new_entries = QueryResult.from_gql_query(resp, datasource)
-                res.entries += new_entries.entries
-                res.fields = new_entries.fields
-                res.query_data_time = new_entries.query_data_time
-                progress.update(total_task, advance=len(new_entries.entries), refresh=True)
+            for page in pager:
+                res._extend(page)
+                progress.update(total_task, advance=len(page), refresh=True)
+        self._log_page_timings(pager)
 
         return res
 
+    def get_pages(
+        self,
+        datasource: "Datasource",
+        include_metadata: bool,
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> QueryPager:
+        """
+        Returns an iterator over the pages of the datasource's query result.
+        The next pages are requested while the received ones are parsed.
+
+        Args:
+            datasource (Datasource): The datasource to query.
+            include_metadata (bool): Whether to include metadata in the result.
+            page_size (Optional[int]): Maximum number of datapoints in a page. Defaults to FULL_LIST_PAGE_SIZE.
+            after (Optional[str]): Cursor to start after. If None, starts from the first page.
+            limit (Optional[int]): Maximum number of datapoints in all pages. If None, gets all the pages.
+            prefetch (Optional[int]): How many pages to request ahead.
+                Defaults to the config value of dataengine_query_prefetch_pages.
+
+        Returns:
+            QueryPager: Iterator over the pages, that also records how long it took to fetch and parse them.
+        """
+        if page_size is None:
+            page_size = self.FULL_LIST_PAGE_SIZE
+        return QueryPager(self, datasource, include_metadata, page_size, after=after, limit=limit, prefetch=prefetch)
+
+    @staticmethod
+    def _log_page_timings(pager: QueryPager):
+        if not pager.timings:
+            return
+        fetch_time = sum(t.fetch_seconds for t in pager.timings)
+        parse_time = sum(t.parse_seconds for t in pager.timings)
+        logger.debug(
+            f"Got {sum(t.rows for t in pager.timings)} datapoints in {len(pager.timings)} pages, "
+            f"fetching took {fetch_time:.3f}s and parsing took {parse_time:.3f}s"
+        )
+
     def _exec(
         self,
         query: GqlQuery,
@@ -188,13 +226,14 @@ class DataClient:
         if not config.disable_traceparent:
             traceparent = build_traceparent()
             headers["traceparent"] = traceparent
-        try:
-            resp = self.client.execute(q, variable_values=params, extra_args={"headers": headers})
-        except TransportError as e:
-            support_id = self.client.transport.response_headers.get("X-DagsHub-Support-Id")
-            if support_id is None:
-                support_id = traceparent
-            raise DataEngineGqlError(e, support_id)
+        with self._exec_lock:
+            try:
+                resp = self.client.execute(q, variable_values=params, extra_args={"headers": headers})
+            except TransportError as e:
+                support_id = self.client.transport.response_headers.get("X-DagsHub-Support-Id")
+                if support_id is None:
+                    support_id = traceparent
+                raise DataEngineGqlError(e, support_id)
         return resp
 
     def _datasource_query(
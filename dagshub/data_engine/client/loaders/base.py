@@ -1,14 +1,22 @@
 import logging
+from contextlib import nullcontext
 from types import FunctionType
-from typing import List, Union
+from typing import List, Optional, Union
 
 from pathlib import Path
 from multiprocessing import Pool, Process
 
 from dagshub.common.api.repo import PathNotFoundError
+from dagshub.common.download import atomic_write
+from dagshub.common.file_cache import get_dataset_file_cache
+from dagshub.common.singleflight import SingleFlight
+from dagshub.streaming.prefetch import PrefetchEngine, SequencePrefetchPolicy
 
 logger = logging.getLogger(__name__)
 
+# Files that are needed by several dataloader workers or prefetch threads at once get downloaded only once
+_downloads: SingleFlight[None] = SingleFlight(across_processes=True)
+
 
 class DagsHubDataset:
     def __init__(
@@ -21,6 +29,7 @@ class DagsHubDataset:
         savedir: str = None,
         processes: int = 8,
         for_dataloader: bool = False,
+        prefetch: int = 0,
     ):
         """
         Initialize a dataset using the specified parameters.
@@ -36,6 +45,9 @@ class DagsHubDataset:
         savedir (str, optional): Location where the dataset is stored. Defaults to None.
         processes (int, optional): number of parallel processes that download the dataset. Defaults to 8.
         for_dataloader (bool, optional): Whether the dataset is used in a dataloader context. Defaults to False.
+        prefetch (int, optional): number of datapoints to download in the background ahead of the accessed one,
+            in the order of the dataloader's sampler. Defaults to 0 (no prefetching).
+            With ``persistent_workers``, the workers keep following the order of the first epoch.
 
         """
         self.metadata_columns = metadata_columns
@@ -54,6 +66,14 @@ class DagsHubDataset:
         self.datasource_root = Path(self.entries[0].path_in_repo.as_posix()[: -len(self.entries[0].path)])
         self.processes = processes
         self.order = None
+        self._sequential_order = range(len(self.entries))
+        self.prefetcher: Optional[PrefetchEngine] = None
+        if prefetch > 0:
+            self.prefetcher = PrefetchEngine(
+                self._prefetch_datapoint,
+                [SequencePrefetchPolicy(self._access_order, lookahead=prefetch)],
+                is_present=self._is_downloaded,
+            )
         self.file_columns = file_columns or self._get_file_columns()
 
         self.tensorizers = (
@@ -112,6 +132,8 @@ class DagsHubDataset:
         out = []
         entry = self.entries[idx]
 
+        if self.prefetcher is not None:
+            self.prefetcher.on_access(idx)
         self._download(entry)
         out.append((self.savedir / entry.path).as_posix())
         for idx, column in enumerate(self.metadata_columns):
@@ -124,10 +146,14 @@ class DagsHubDataset:
         return out
 
     def __getitem__(self, idx: int) -> List[Union["torch.Tensor", "tf.Tensor"]]:  # noqa: F821
-        if type(self.tensorizers) is list:
-            return [tensorizer(data) for tensorizer, data in zip(self.tensorizers, self.get(idx))]
-        else:
-            return self.tensorizers(self.get(idx))
+        # Don't let the files get evicted from the cache while they're being tensorized
+        file_cache = get_dataset_file_cache()
+        pinned = nullcontext() if file_cache is None else file_cache.pinned(*self._local_paths(self.entries[idx]))
+        with pinned:
+            if type(self.tensorizers) is list:
+                return [tensorizer(data) for tensorizer, data in zip(self.tensorizers, self.get(idx))]
+            else:
+                return self.tensorizers(self.get(idx))
 
     def pull(self) -> None:
         if self.order is not None:
@@ -140,26 +166,53 @@ class DagsHubDataset:
             p.map(self._download, entries, 1)
         logger.info("Dataset download complete!")
 
-    def _download(self, datapoint) -> None:
-        paths = [
+    def _file_paths(self, datapoint) -> List[str]:
+        return [
             datapoint.path,
             *[datapoint.metadata.get(column) for column in self.file_columns],
         ]
 
+    def _local_paths(self, datapoint) -> List[Path]:
+        return [self.savedir / path for path in self._file_paths(datapoint)]
+
+    def _access_order(self):
+        return self.order if self.order is not None else self._sequential_order
+
+    def _prefetch_datapoint(self, idx: int) -> int:
+        datapoint = self.entries[idx]
+        self._download(datapoint)
+        return sum(path.stat().st_size for path in self._local_paths(datapoint))
+
+    def _is_downloaded(self, idx: int) -> bool:
+        return all(path.is_file() for path in self._local_paths(self.entries[idx]))
+
+    def _download(self, datapoint) -> None:
+        paths = self._file_paths(datapoint)
+
         for path in paths:
-            (self.savedir / Path(path).parent).mkdir(parents=True, exist_ok=True)
-            if not (self.savedir / path).is_file():
-                if self.source == "repo":
-                    data = self.repo.get_file(f"{self.datasource_root}/{path}")
-                else:
-                    data = self.repo.get_storage_file(
-                        f"{'/'.join(list(self.datasource.source.path_parts().values())[:2])}"
-                        f"/{self.datasource_root}/{path}"
-                    )
+            filepath = self.savedir / path
+            if not filepath.is_file():
+                _downloads.do(str(filepath.absolute()), lambda: self._download_file(path))
 
-                filepath = self.savedir / path
-                with open(filepath, "wb") as file:
-                    file.write(data)
+        # Files of datasets that don't fit on the disk get evicted as the dataset is iterated over
+        file_cache = get_dataset_file_cache()
+        if file_cache is not None:
+            file_cache.record(*self._local_paths(datapoint))
+
+    def _download_file(self, path: str) -> None:
+        filepath = self.savedir / path
+        # Another worker might have downloaded the file while this one was waiting for it
+        if filepath.is_file():
+            return
+        if self.source == "repo":
+            data = self.repo.get_file(f"{self.datasource_root}/{path}")
+        else:
+            data = self.repo.get_storage_file(
+                f"{'/'.join(list(self.datasource.source.path_parts().values())[:2])}" f"/{self.datasource_root}/{path}"
+            )
+        # Other workers can read the file as soon as it shows up, so it never shows up partially written
+        with atomic_write(filepath) as file:
+            file.write(data)
 
     def _get_tensorizers(self, datatypes: Union[str, List[Union[str, FunctionType]]]) -> FunctionType:
         if datatypes in ["auto", "guess"]:  # guess is an easter egg argument
@@ -1,6 +1,6 @@
 from multiprocessing import Process
 from dagshub.common.util import lazy_load
-from typing import TYPE_CHECKING, Union, Any
+from typing import TYPE_CHECKING, Any, List, Optional, Union
 from dagshub.data_engine.client.loaders.base import DagsHubDataset
 
 torch = lazy_load("torch")
@@ -35,14 +35,49 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter, torch.utils.data.datal
         super().__init__(*args, **kwargs)
 
 
+class _EpochIndexSampler:
+    """
+    Index sampler of a :class:`PyTorchDataLoader`, yielding the indices that the loader drew for the current epoch
+    """
+
+    def __init__(self, loader: "PyTorchDataLoader"):
+        self.loader = loader
+
+    def __iter__(self):
+        indices = self.loader._epoch_indices
+        if indices is None:
+            indices = self.loader._sampler_indices()
+        return iter(indices)
+
+    def __len__(self):
+        return len(self.loader._sampler_indices())
+
+
 class PyTorchDataLoader(torch.utils.data.DataLoader):
     def __init__(self, *args, post_hook=lambda x: x, **kwargs):
         super().__init__(*args, **kwargs)
         self.post_hook = post_hook
+        self._epoch_indices: Optional[List] = None
         self.dataset.order = list(self.sampler)
         if self.dataset.strategy == "background":
             Process(target=self.dataset.pull).start()
 
+    def __iter__(self):
+        # The indices of the epoch are drawn before the iteration starts, so the prefetching follows them,
+        # even when the sampler shuffles differently on every epoch
+        self._epoch_indices = list(self._sampler_indices())
+        self.dataset.order = [
+            idx for batch in self._epoch_indices for idx in (batch if isinstance(batch, (list, tuple)) else [batch])
+        ]
+        return super().__iter__()
+
+    def _sampler_indices(self):
+        return super()._index_sampler
+
+    @property
+    def _index_sampler(self):
+        return _EpochIndexSampler(self)
+
     def _get_iterator(self) -> "_BaseDataLoaderIter":
         if self.num_workers == 0:
             return _SingleProcessDataLoaderIter(self, post_hook=self.post_hook)
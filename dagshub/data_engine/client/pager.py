@@ -0,0 +1,148 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from dagshub.common import config
+from dagshub.data_engine.model.query_result import QueryResult
+
+if TYPE_CHECKING:
+    from dagshub.data_engine.client.data_client import DataClient
+    from dagshub.data_engine.model.datasource import Datasource
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+@dataclass
+class PageTiming:
+    """
+    Time it took to get a page of the query result
+    """
+
+    rows: int
+    fetch_seconds: float
+    """Time of the request of the page"""
+    parse_seconds: float
+    """Time of turning the response into a :class:`.QueryResult`"""
+
+
+class QueryPager:
+    """
+    Gets the pages of a datasource query one after another, following the end cursor of every page.
+
+    With ``prefetch`` above 0, the pages are requested in a background thread,
+    which stays up to ``prefetch`` pages ahead of the page that's being parsed,
+    so waiting for the server overlaps with parsing the pages that were already received.
+    The pages are yielded in order either way.
+
+    The time of fetching and parsing every page is recorded in :attr:`timings`.
+
+    Args:
+        client: Client to query with
+        datasource: Datasource to query
+        include_metadata: Whether to include metadata in the result
+        page_size: Maximum number of datapoints in a page
+        after: Cursor to start after. If None, starts from the first page
+        limit: Maximum number of datapoints in all pages. If None, gets all pages
+        prefetch: How many pages to request ahead. Default is the config value of dataengine_query_prefetch_pages (2).
+            0 requests every page only after the previous one was parsed
+    """
+
+    def __init__(
+        self,
+        client: "DataClient",
+        datasource: "Datasource",
+        include_metadata: bool,
+        page_size: int,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ):
+        self.client = client
+        self.datasource = datasource
+        self.include_metadata = include_metadata
+        self.page_size = page_size
+        self.limit = limit
+        self.prefetch = config.dataengine_query_prefetch_pages if prefetch is None else prefetch
+        self.cursor = after
+        """End cursor of the last yielded page"""
+        self.has_next_page = True
+        """Whether there are pages after the last yielded page"""
+        self.timings: List[PageTiming] = []
+
+    def __iter__(self) -> Iterator[QueryResult]:
+        responses = self._requests() if self.prefetch <= 0 else self._background_requests()
+        try:
+            for resp, fetch_seconds in responses:
+                start = time.perf_counter()
+                page = QueryResult.from_gql_query(resp, self.datasource)
+                parse_seconds = time.perf_counter() - start
+
+                timing = PageTiming(rows=len(page), fetch_seconds=fetch_seconds, parse_seconds=parse_seconds)
+                self.timings.append(timing)
+                logger.debug(
+                    f"Page {len(self.timings)} with {timing.rows} datapoints: "
+                    f"fetched in {fetch_seconds:.3f}s, parsed in {parse_seconds:.3f}s"
+                )
+                if resp["pageInfo"]["endCursor"] is not None:
+                    self.cursor = resp["pageInfo"]["endCursor"]
+                self.has_next_page = resp["pageInfo"]["hasNextPage"]
+                yield page
+        finally:
+            # Closing the iteration early stops the background requests right away
+            responses.close()
+
+    def _requests(self) -> Iterator[Tuple[Dict[str, Any], float]]:
+        after = self.cursor
+        left = self.limit
+        while left is None or left > 0:
+            take = self.page_size if left is None else min(left, self.page_size)
+            start = time.perf_counter()
+            resp = self.client._datasource_query(self.datasource, self.include_metadata, take, after)
+            yield resp, time.perf_counter() - start
+            if not resp["pageInfo"]["hasNextPage"]:
+                return
+            after = resp["pageInfo"]["endCursor"]
+            if left is not None:
+                left -= take
+
+    def _background_requests(self) -> Iterator[Tuple[Dict[str, Any], float]]:
+        received: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stopped = threading.Event()
+
+        def put(item):
+            # Don't get stuck on a full queue if the iteration was stopped
+            while not stopped.is_set():
+                try:
+                    received.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def fetch():
+            try:
+                for item in self._requests():
+                    put(item)
+                    # Don't request the next page once the iteration was stopped
+                    if stopped.is_set():
+                        return
+            except Exception as e:
+                put(e)
+            put(_END)
+
+        fetcher = threading.Thread(target=fetch, name="dagshub-query-pager", daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                item = received.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
@@ -0,0 +1,460 @@
+from collections.abc import Mapping, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from dagshub.common.util import lazy_load
+from dagshub.data_engine.client.models import MetadataSelectFieldSchema
+from dagshub.data_engine.dtypes import MetadataFieldType
+from dagshub.data_engine.model.datapoint import BlobHashMetadata, Datapoint, _datetime_from_timestamp
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow as pa
+
+    from dagshub.data_engine.model.datasource import Datasource
+else:
+    pa = lazy_load("pyarrow")
+
+# Marks values deleted from the metadata of a datapoint
+_DELETED = object()
+
+
+def _arrow_type(value_type: Optional[MetadataFieldType]) -> Optional["pa.DataType"]:
+    if value_type == MetadataFieldType.BOOLEAN:
+        return pa.bool_()
+    elif value_type == MetadataFieldType.INTEGER:
+        return pa.int64()
+    elif value_type == MetadataFieldType.FLOAT:
+        return pa.float64()
+    elif value_type in (MetadataFieldType.STRING, MetadataFieldType.BLOB):
+        return pa.string()
+    elif value_type == MetadataFieldType.DATETIME:
+        # The values are milliseconds since the epoch
+        return pa.timestamp("ms", tz="UTC")
+    # Fields that aren't in the schema - arrow infers the type from the values
+    return None
+
+
+class ColumnarMetadata:
+    """
+    Metadata of the datapoints of a query result, kept in pyarrow arrays, one per field,
+    instead of a dictionary per datapoint.
+
+    Values that get set after the query (e.g. paths of the downloaded blobs) are kept on the side,
+    and take precedence over the values in the arrays.
+    Columns whose values don't fit into an arrow array (e.g. values of different types in a field that isn't
+    in the schema) are kept as lists of python values.
+
+    Appending pages with :func:`extend` adds a chunk per page to the arrays, without copying them.
+    Looking up a value by row in an array of many chunks goes over the chunks,
+    so the chunks get combined once, on the first lookup of a row after pages were appended.
+    """
+
+    def __init__(
+        self,
+        ids: "pa.ChunkedArray",
+        paths: "pa.ChunkedArray",
+        columns: Dict[str, "pa.ChunkedArray"],
+        field_types: Dict[str, MetadataFieldType],
+        timezones: Optional[Dict[str, "pa.ChunkedArray"]] = None,
+        objects: Optional[Dict[str, List[Any]]] = None,
+    ):
+        self.ids = ids
+        self.paths = paths
+        self.columns = columns
+        self.field_types = field_types
+        self.timezones = timezones or {}
+        self.objects = objects or {}
+        self.overrides: Dict[str, Dict[int, Any]] = {}
+        self._combined = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def from_gql_edges(edges: List[Dict], fields: List[MetadataSelectFieldSchema]) -> "ColumnarMetadata":
+        """
+        Builds the columns straight from the edges of a GraphQL query response
+        """
+        field_types = {f.name: f.valueType for f in fields}
+        n = len(edges)
+        ids = [0] * n
+        paths = [""] * n
+        values: Dict[str, List[Any]] = {}
+        timezones: Dict[str, List[Optional[str]]] = {}
+        for i, edge in enumerate(edges):
+            node = edge["node"]
+            ids[i] = int(node["id"])
+            paths[i] = node["path"]
+            for meta_dict in node["metadata"]:
+                key = meta_dict["key"]
+                column = values.get(key)
+                if column is None:
+                    column = values[key] = [None] * n
+                column[i] = meta_dict["value"]
+                if field_types.get(key) == MetadataFieldType.DATETIME:
+                    tz_column = timezones.get(key)
+                    if tz_column is None:
+                        tz_column = timezones[key] = [None] * n
+                    tz_column[i] = meta_dict.get("timeZone")
+
+        columns = {}
+        objects = {}
+        for key, column in values.items():
+            array = _to_arrow(column, field_types.get(key))
+            if array is None:
+                objects[key] = column
+            else:
+                columns[key] = pa.chunked_array([array])
+        return ColumnarMetadata(
+            ids=pa.chunked_array([pa.array(ids, pa.int64())]),
+            paths=pa.chunked_array([pa.array(paths, pa.string())]),
+            columns=columns,
+            field_types=field_types,
+            timezones={key: pa.chunked_array([pa.array(tz, pa.string())]) for key, tz in timezones.items()},
+            objects=objects,
+        )
+
+    def keys(self) -> List[str]:
+        """
+        Names of the fields that have a value in at least one of the datapoints
+        """
+        res = [key for key, column in self.columns.items() if column.null_count < len(column)]
+        res += [key for key, column in self.objects.items() if any(v is not None for v in column)]
+        res += [key for key in self.overrides if key not in res and self._has_override(key)]
+        return res
+
+    def _has_override(self, key: str) -> bool:
+        return any(v is not _DELETED for v in self.overrides[key].values())
+
+    def combine_chunks(self):
+        """
+        Combines the chunks of every array into one, so looking up a row doesn't need to go over the chunks.
+        Done automatically on the first lookup of a row after :func:`extend`
+        """
+        if self._combined:
+            return
+        self.ids = _combined(self.ids)
+        self.paths = _combined(self.paths)
+        self.columns = {key: _combined(column) for key, column in self.columns.items()}
+        self.timezones = {key: _combined(column) for key, column in self.timezones.items()}
+        self._combined = True
+
+    def row_keys(self, row: int) -> List[str]:
+        keys = set(self.columns) | set(self.objects) | set(self.overrides)
+        return [key for key in keys if self._raw_value(row, key) is not None]
+
+    def get(self, row: int, key: str) -> Any:
+        """
+        Returns the value of the field in the row, in the same form as in the metadata of a regular Datapoint.
+        Raises KeyError if the row doesn't have a value in the field
+        """
+        override = self.overrides.get(key)
+        if override is not None and row in override:
+            value = override[row]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        value = self._raw_value(row, key)
+        if value is None:
+            raise KeyError(key)
+        value_type = self.field_types.get(key)
+        if value_type == MetadataFieldType.FLOAT:
+            return float(value)
+        elif value_type == MetadataFieldType.DATETIME:
+            timestamp = value.timestamp() if hasattr(value, "timestamp") else value / 1000
+            self.combine_chunks()
+            timezone = self.timezones[key][row].as_py() if key in self.timezones else None
+            return _datetime_from_timestamp(timestamp, timezone or "+00:00")
+        elif value_type == MetadataFieldType.BLOB and isinstance(value, str):
+            return BlobHashMetadata(value)
+        return value
+
+    def _raw_value(self, row: int, key: str) -> Any:
+        override = self.overrides.get(key)
+        if override is not None and row in override:
+            value = override[row]
+            return None if value is _DELETED else value
+        column = self.columns.get(key)
+        if column is not None:
+            self.combine_chunks()
+            return self.columns[key][row].as_py()
+        objects = self.objects.get(key)
+        if objects is not None:
+            return objects[row]
+        return None
+
+    def set(self, row: int, key: str, value: Any):
+        self.overrides.setdefault(key, {})[row] = value
+
+    def delete(self, row: int, key: str):
+        self.get(row, key)
+        self.overrides.setdefault(key, {})[row] = _DELETED
+
+    def extend(self, other: "ColumnarMetadata"):
+        """
+        Appends the rows of the other metadata in place. The arrays of the other metadata aren't copied
+        """
+        offset = len(self)
+        self.field_types = {**self.field_types, **other.field_types}
+        object_keys = self.objects.keys() | other.objects.keys()
+        for key in self.columns.keys() | other.columns.keys():
+            if key in object_keys:
+                continue
+            merged = _concat(self.columns.get(key), other.columns.get(key), offset, len(other))
+            if merged is None:
+                # Different types in the pages, keep the values as python objects
+                self.objects[key] = self.columns.pop(key).to_pylist() + other.columns[key].to_pylist()
+            else:
+                self.columns[key] = merged
+        for key in object_keys:
+            values = self.objects.get(key)
+            if values is None:
+                values = self.objects[key] = _to_pylist(self.columns.pop(key, None), offset)
+            if key in other.objects:
+                values.extend(other.objects[key])
+            else:
+                values.extend(_to_pylist(other.columns.get(key), len(other)))
+        for key in self.timezones.keys() | other.timezones.keys():
+            self.timezones[key] = _concat(self.timezones.get(key), other.timezones.get(key), offset, len(other))
+        for key, values in other.overrides.items():
+            overrides = self.overrides.setdefault(key, {})
+            for row, value in values.items():
+                overrides[offset + row] = value
+        self.ids = pa.chunked_array(self.ids.chunks + other.ids.chunks, pa.int64())
+        self.paths = pa.chunked_array(self.paths.chunks + other.paths.chunks, pa.string())
+        self._combined = False
+
+    def take(self, rows: Iterable[int]) -> "ColumnarMetadata":
+        """
+        Returns the metadata of the rows at the indices
+        """
+        rows = list(rows)
+        indices = pa.array(rows, pa.int64())
+        res = ColumnarMetadata(
+            ids=pa.chunked_array([self.ids.take(indices)]),
+            paths=pa.chunked_array([self.paths.take(indices)]),
+            columns={key: pa.chunked_array([column.take(indices)]) for key, column in self.columns.items()},
+            field_types=dict(self.field_types),
+            timezones={key: pa.chunked_array([column.take(indices)]) for key, column in self.timezones.items()},
+            objects={key: [column[i] for i in rows] for key, column in self.objects.items()},
+        )
+        for key, values in self.overrides.items():
+            res.overrides[key] = {new: values[old] for new, old in enumerate(rows) if old in values}
+        return res
+
+    def _column_values(self, key: str) -> Union["pa.ChunkedArray", List[Any]]:
+        """
+        Values of the column, with the overrides applied.
+        Columns without overrides are returned as arrow arrays, without copying them
+        """
+        overrides = self.overrides.get(key)
+        if key in self.columns and not overrides:
+            return self.columns[key]
+        if key in self.columns:
+            values = self.columns[key].to_pylist()
+        elif key in self.objects:
+            values = list(self.objects[key])
+        else:
+            values = [None] * len(self)
+        for row, value in (overrides or {}).items():
+            values[row] = None if value is _DELETED else value
+        return values
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        Returns a table with the ``datapoint_id`` and ``path`` columns, and a column for each field.
+        Blob fields that weren't downloaded have the hash of the blob,
+        datetime fields are timestamps in UTC.
+        """
+        arrays = {"datapoint_id": self.ids, "path": self.paths}
+        for key in sorted(self.keys()):
+            values = self._column_values(key)
+            if not isinstance(values, list):
+                arrays[key] = values
+                continue
+            try:
+                arrays[key] = pa.array(values, _arrow_type(self.field_types.get(key)))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # E.g. a column with downloaded blobs - let arrow figure out the type, or store it as strings
+                try:
+                    arrays[key] = pa.array(values)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    arrays[key] = pa.array([None if v is None else str(v) for v in values], pa.string())
+        return pa.table(arrays)
+
+    def to_pandas(self, download_url: Callable[[str], str]) -> "pandas.DataFrame":
+        """
+        Returns a dataframe with the same columns as :attr:`.QueryResult.dataframe`,
+        converting the arrow columns in bulk
+        """
+        import pandas as pd
+
+        keys = sorted(self.keys())
+        arrow_keys = [key for key in keys if key in self.columns and not self.overrides.get(key)]
+        df = pa.table({key: self.columns[key] for key in arrow_keys}).to_pandas() if arrow_keys else pd.DataFrame()
+        paths = self.paths.to_pylist()
+        generated = pd.DataFrame(
+            {
+                "path": paths,
+                "datapoint_id": self.ids.to_numpy(),
+                "dagshub_download_url": [download_url(p) for p in paths],
+            }
+        )
+        df = pd.concat([generated, df], axis=1)
+        for key in keys:
+            if key not in arrow_keys:
+                df[key] = pd.Series(self._column_values(key), dtype=object)
+        return df[list(generated.columns) + keys]
+
+
+def _to_arrow(values: List[Any], value_type: Optional[MetadataFieldType]) -> Optional["pa.Array"]:
+    """
+    Returns the values as an arrow array, or None if they can't be stored in one
+    """
+    arrow_type = _arrow_type(value_type)
+    try:
+        return pa.array(values, arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    if value_type == MetadataFieldType.FLOAT:
+        # Floats might come in as strings or ints
+        try:
+            return pa.array([None if v is None else float(v) for v in values], arrow_type)
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+def _concat(
+    ours: Optional["pa.ChunkedArray"], theirs: Optional["pa.ChunkedArray"], our_len: int, their_len: int
+) -> Optional["pa.ChunkedArray"]:
+    """
+    Concatenates the chunks of two columns, filling in nulls for a column that one of the sides doesn't have.
+    Returns None if the types of the columns don't match
+    """
+    if ours is None and theirs is None:
+        return None
+    arrow_type = ours.type if ours is not None else theirs.type
+    if ours is None:
+        ours = pa.chunked_array([pa.nulls(our_len, arrow_type)])
+    if theirs is None:
+        theirs = pa.chunked_array([pa.nulls(their_len, arrow_type)])
+    if theirs.type != arrow_type:
+        if pa.types.is_null(theirs.type):
+            theirs = pa.chunked_array([pa.nulls(their_len, arrow_type)])
+        elif pa.types.is_null(arrow_type):
+            arrow_type = theirs.type
+            ours = pa.chunked_array([pa.nulls(our_len, arrow_type)])
+        else:
+            return None
+    return pa.chunked_array(ours.chunks + theirs.chunks, arrow_type)
+
+
+def _combined(column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+    if column.num_chunks <= 1:
+        return column
+    return pa.chunked_array([column.combine_chunks()], column.type)
+
+
+def _to_pylist(column: Optional["pa.ChunkedArray"], length: int) -> List[Any]:
+    return [None] * length if column is None else column.to_pylist()
+
+
+class _RowMetadata(MutableMapping):
+    """
+    Metadata of one datapoint, that reads the values from the columns when they're accessed
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: ColumnarMetadata, row: int):
+        self._columns = columns
+        self._row = row
+
+    def __getitem__(self, key):
+        return self._columns.get(self._row, key)
+
+    def __setitem__(self, key, value):
+        self._columns.set(self._row, key, value)
+
+    def __delitem__(self, key):
+        self._columns.delete(self._row, key)
+
+    def __iter__(self):
+        return iter(self._columns.row_keys(self._row))
+
+    def __len__(self):
+        return len(self._columns.row_keys(self._row))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class DatapointRows(Sequence):
+    """
+    Datapoints of a columnar query result.
+    The :class:`.Datapoint` objects are views of the rows of the columns, created when they're accessed,
+    so a query result with millions of datapoints doesn't hold millions of objects.
+    Changes to the metadata of a datapoint are kept in the columns, and are visible to all views of the row.
+    """
+
+    def __init__(self, columns: ColumnarMetadata, datasource: "Datasource"):
+        self.columns = columns
+        self.datasource = datasource
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return DatapointRows(self.columns.take(range(len(self))[item]), self.datasource)
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("datapoint index out of range")
+        self.columns.combine_chunks()
+        return self._view(item, self.columns.ids[item].as_py(), self.columns.paths[item].as_py())
+
+    def __iter__(self) -> Iterator[Datapoint]:
+        for row, (datapoint_id, path) in enumerate(zip(self.columns.ids.to_pylist(), self.columns.paths.to_pylist())):
+            yield self._view(row, datapoint_id, path)
+
+    def _view(self, row: int, datapoint_id: int, path: str) -> Datapoint:
+        return Datapoint(
+            datapoint_id=datapoint_id, path=path, metadata=_RowMetadata(self.columns, row), datasource=self.datasource
+        )
+
+    def extend(self, other: "DatapointRows"):
+        self.columns.extend(other.columns)
+
+    def path_lookup(self) -> "_PathLookup":
+        return _PathLookup(self)
+
+
+class _PathLookup(Mapping):
+    """
+    Lookup of the datapoints of :class:`DatapointRows` by their path.
+    The index of the paths is built on the first lookup
+    """
+
+    def __init__(self, rows: DatapointRows):
+        self._rows = rows
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {path: row for row, path in enumerate(self._rows.columns.paths.to_pylist())}
+        return self._index
+
+    def __getitem__(self, path: str) -> Datapoint:
+        return self._rows[self.index[path]]
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
@@ -1,14 +1,18 @@
 import datetime
 import logging
+import sqlite3
 from dataclasses import dataclass
+from functools import lru_cache
 from os import PathLike
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Sequence, Union
 
 from tenacity import Retrying, before_sleep_log, retry_if_exception_type, stop_after_attempt, wait_exponential
 
-from dagshub.common.download import download_files
+from dagshub.common.download import atomic_write, download_files
 from dagshub.common.helpers import http_request
+from dagshub.common.object_store import get_blob_store
+from dagshub.common.singleflight import SingleFlight
 from dagshub.data_engine.annotation import MetadataAnnotations
 from dagshub.data_engine.client.models import DatapointHistoryResult, MetadataSelectFieldSchema
 from dagshub.data_engine.dtypes import MetadataFieldType
@@ -24,6 +28,9 @@ _generated_fields: Dict[str, Callable[["Datapoint"], Any]] = {
 
 logger = logging.getLogger(__name__)
 
+# Blob downloads in progress, by the path of their cache file
+_blob_downloads: SingleFlight[Optional[bytes]] = SingleFlight(across_processes=True)
+
 
 @dataclass(frozen=True)
 class BlobHashMetadata:
@@ -136,29 +143,28 @@ class Datapoint:
 
     @staticmethod
     def from_gql_edge(edge: Dict, datasource: "Datasource", fields: List[MetadataSelectFieldSchema]) -> "Datapoint":
-        res = Datapoint(
-            datapoint_id=int(edge["node"]["id"]),
-            path=edge["node"]["path"],
-            metadata={},
-            datasource=datasource,
-        )
-
-        float_fields = {f.name for f in fields if f.valueType == MetadataFieldType.FLOAT}
-        date_fields = {f.name for f in fields if f.valueType == MetadataFieldType.DATETIME}
-        blob_fields = {f.name for f in fields if f.valueType == MetadataFieldType.BLOB}
+        return Datapoint.from_gql_edges([edge], datasource, fields)[0]
 
-        for meta_dict in edge["node"]["metadata"]:
-            key = meta_dict["key"]
-            value = meta_dict["value"]
-            if key in float_fields:
-                value = float(value)
-            else:
-                if key in date_fields:
-                    timezone = meta_dict.get("timeZone")
-                    value = _datetime_from_timestamp(value / 1000, timezone or "+00:00")
-                elif key in blob_fields and isinstance(value, str):
-                    value = BlobHashMetadata(value)
-            res.metadata[key] = value
+    @staticmethod
+    def from_gql_edges(
+        edges: List[Dict], datasource: "Datasource", fields: List[MetadataSelectFieldSchema]
+    ) -> List["Datapoint"]:
+        """
+        Decodes a page of edges of a GraphQL query response into datapoints.
+        How to convert the values of every field is decided once for the whole page, not for every value.
+        """
+        decoders = _field_decoders(fields)
+        res = []
+        for edge in edges:
+            node = edge["node"]
+            metadata = {}
+            for meta_dict in node["metadata"]:
+                key = meta_dict["key"]
+                decode = decoders.get(key)
+                metadata[key] = meta_dict["value"] if decode is None else decode(meta_dict)
+            res.append(
+                Datapoint(datapoint_id=int(node["id"]), path=node["path"], metadata=metadata, datasource=datasource)
+            )
         return res
 
     def to_dict(self, metadata_keys: Sequence[str]) -> Dict[str, Any]:
@@ -322,6 +328,24 @@ def _get_blob(
                 cache_path = str(cache_path)
             return cache_path
 
+    if not cache_on_disk:
+        content = _fetch_blob(url, auth)
+    else:
+        # Threads and processes loading the same blob at the same time download it once
+        content = _blob_downloads.do(str(cache_path), lambda: _download_blob_to_cache(url, cache_path, auth))
+        if content is None and return_blob:
+            with cache_path.open("rb") as f:
+                content = f.read()
+
+    if return_blob:
+        return content
+    else:
+        if path_format == "str":
+            cache_path = str(cache_path)
+        return cache_path
+
+
+def _fetch_blob(url: str, auth) -> bytes:
     def get():
         resp = http_request("GET", url, auth=auth)
         if 200 <= resp.status_code < 300:
@@ -344,23 +368,82 @@ def _get_blob(
                 content = get()
     except Exception as e:
         raise BlobDownloadError(str(e)) from e
+    return content
 
-    if cache_on_disk:
-        with cache_path.open("wb") as f:
+
+def _download_blob_to_cache(url: str, cache_path: Path, auth) -> Optional[bytes]:
+    """
+    Puts the blob at ``cache_path``, from the blob store if it's there, otherwise by downloading it.
+    Returns the content of the blob if it was downloaded, None if it was already on disk.
+    """
+    # Another process might have downloaded the blob while this one was waiting for the lock
+    if cache_path.exists():
+        return None
+
+    # The name of the cache file is the hash of the blob
+    blob_hash = cache_path.name
+    blob_store = get_blob_store()
+
+    # The blob might've been downloaded already for another datasource
+    if blob_store is not None:
+        try:
+            if blob_store.link(blob_hash, cache_path) is not None:
+                return None
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Couldn't get blob {blob_hash} from the blob store: {e}")
+
+    content = _fetch_blob(url, auth)
+
+    stored = False
+    if blob_store is not None:
+        try:
+            blob_store.put(blob_hash, content)
+            stored = blob_store.link(blob_hash, cache_path) is not None
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Couldn't add blob {blob_hash} to the blob store: {e}")
+    if not stored:
+        with atomic_write(cache_path) as f:
             f.write(content)
+    return content
 
-    if return_blob:
-        return content
-    else:
-        if path_format == "str":
-            cache_path = str(cache_path)
-        return cache_path
+
+def _field_decoders(fields: List[MetadataSelectFieldSchema]) -> Dict[str, Callable[[Dict], Any]]:
+    """
+    Returns the functions that turn the GraphQL metadata entries of the fields into the values of the metadata.
+    Fields that keep the values as they are don't have a function
+    """
+    decoders = {}
+    for f in fields:
+        if f.valueType == MetadataFieldType.FLOAT:
+            decoders[f.name] = _decode_float
+        elif f.valueType == MetadataFieldType.DATETIME:
+            decoders[f.name] = _decode_datetime
+        elif f.valueType == MetadataFieldType.BLOB:
+            decoders[f.name] = _decode_blob
+    return decoders
 
 
-def _datetime_from_timestamp(timestamp, utc_offset):
+def _decode_float(meta_dict: Dict) -> float:
+    return float(meta_dict["value"])
+
+
+def _decode_datetime(meta_dict: Dict) -> datetime.datetime:
+    return _datetime_from_timestamp(meta_dict["value"] / 1000, meta_dict.get("timeZone") or "+00:00")
+
+
+def _decode_blob(meta_dict: Dict) -> Any:
+    value = meta_dict["value"]
+    return BlobHashMetadata(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=None)
+def _timezone(utc_offset: str) -> datetime.timezone:
     offset_hours, offset_minutes = map(int, utc_offset.split(":"))
-    offset = datetime.timedelta(hours=offset_hours, minutes=offset_minutes)
+    # The minutes have the sign of the hours ("-03:30" is 3.5 hours behind UTC)
+    if utc_offset.startswith("-"):
+        offset_minutes = -offset_minutes
+    return datetime.timezone(datetime.timedelta(hours=offset_hours, minutes=offset_minutes))
 
-    tz = datetime.timezone(offset)
 
-    return datetime.datetime.fromtimestamp(timestamp).astimezone(tz)
+def _datetime_from_timestamp(timestamp, utc_offset):
+    return datetime.datetime.fromtimestamp(timestamp, _timezone(utc_offset))
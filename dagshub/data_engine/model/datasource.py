@@ -71,7 +71,7 @@ if TYPE_CHECKING:
     import ngrok
     import pandas
 
-    from dagshub.data_engine.model.query_result import QueryResult
+    from dagshub.data_engine.model.query_result import QueryResult, QueryResultPages
 else:
     plugin_server_module = lazy_load("dagshub.data_engine.voxel_plugin_server.server")
     fo = lazy_load("fiftyone")
@@ -337,6 +337,49 @@ class Datasource:
             ds = self.limit(None)
         return ds.fetch(load_documents=load_documents, load_annotations=load_annotations)
 
+    def iter_all(
+        self, page_size: int = 5000, after: Optional[str] = None, load_documents=True, load_annotations=True
+    ) -> "QueryResultPages":
+        """
+        Executes the query and returns an iterator over the pages of **all** datapoints, that gets them lazily.
+        Unlike :func:`all()`, only the current page and the pages requested ahead of it are held in memory,
+        so this can go over datasources that are too big to load at once.
+
+        Example::
+
+            with ds.iter_all(page_size=10000) as pages:
+                for page in pages:
+                    print(page.dataframe["size"].sum())
+
+            # Or, datapoint by datapoint
+            for dp in ds.iter_all().datapoints():
+                print(dp.path)
+
+        .. warning::
+            Same as :func:`all()`, this function will override any limits set on the query.
+
+        Args:
+            page_size: How many datapoints to get in a page
+            after: Cursor to continue from, saved from the :attr:`cursor <.QueryResultPages.cursor>`
+                of a previous iteration. Pages after the cursor are returned
+            load_documents: Automatically download all document blob fields of every page
+            load_annotations: Automatically download all annotation blob fields of every page
+        """
+        from dagshub.data_engine.model.query_result import QueryResultPages
+
+        self._check_preprocess()
+        ds = self
+        if self._query.limit:
+            log_message(
+                "Calling iter_all() on a datasource with a limited query.\n"
+                "This will override the limiting and get ALL datapoints in the current query.",
+                logger,
+            )
+            ds = self.limit(None)
+        return QueryResultPages(
+            ds, page_size, after=after, load_documents=load_documents, load_annotations=load_annotations
+        )
+
     def select(self, *selected: Union[str, Field]) -> "Datasource":
         """
         Select which fields should appear in the query result.
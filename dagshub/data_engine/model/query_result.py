@@ -5,12 +5,15 @@ import json
 import logging
 import os
 import os.path
+import posixpath
+import threading
 from collections import Counter, defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from os import PathLike
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple, Union
 
 import dacite
 import dagshub_annotation_converter.converters.yolo
@@ -32,8 +35,11 @@ from dagshub.auth import get_token
 from dagshub.common import config
 from dagshub.common.analytics import send_analytics_event
 from dagshub.common.api import UserAPI
-from dagshub.common.download import download_files
+from dagshub.common.api.repo import PathNotFoundError
+from dagshub.common.download import cache_recording_download_fn, deduplicated_download_fn, download_files
+from dagshub.common.file_cache import get_dataset_file_cache
 from dagshub.common.helpers import log_message, prompt_user, sizeof_fmt
+from dagshub.common.object_store import content_key, get_file_store
 from dagshub.common.rich_util import get_rich_progress
 from dagshub.common.util import lazy_load, multi_urljoin
 from dagshub.data_engine.annotation import MetadataAnnotations
@@ -46,6 +52,7 @@ from dagshub.data_engine.annotation.voxel_conversion import (
 from dagshub.data_engine.client.loaders.base import DagsHubDataset
 from dagshub.data_engine.client.models import DatasourceType, MetadataSelectFieldSchema
 from dagshub.data_engine.dtypes import MetadataFieldType
+from dagshub.data_engine.model.columnar import ColumnarMetadata, DatapointRows
 from dagshub.data_engine.model.datapoint import (
     BlobDownloadError,
     BlobHashMetadata,
@@ -64,6 +71,7 @@ if TYPE_CHECKING:
     import tensorflow as tf
 
     import dagshub.data_engine.voxel_plugin_server.server as plugin_server_module
+    from dagshub.data_engine.client.pager import PageTiming
     from dagshub.data_engine.model.datasource import Datasource
 else:
     plugin_server_module = lazy_load("dagshub.data_engine.voxel_plugin_server.server")
@@ -105,7 +113,7 @@ class QueryResult:
 
     """
 
-    _entries: List[Datapoint]
+    _entries: Union[List[Datapoint], DatapointRows]
     datasource: "Datasource"
     fields: List[MetadataSelectFieldSchema]
     query_data_time: Optional[datetime.datetime] = None
@@ -127,10 +135,35 @@ class QueryResult:
         self._refresh_lookups()
 
     def _refresh_lookups(self):
+        if isinstance(self._entries, DatapointRows):
+            self._datapoint_path_lookup = self._entries.path_lookup()
+            return
         self._datapoint_path_lookup = {}
         for e in self.entries:
             self._datapoint_path_lookup[e.path] = e
 
+    def _extend(self, other: "QueryResult"):
+        """
+        Appends the datapoints of another result (e.g. the next page of the query) to this one in place.
+        Only the new datapoints get added to the path lookup, so accumulating pages takes linear time overall.
+        The fields and the query time are taken from the other result.
+        """
+        if isinstance(other.entries, DatapointRows) and (
+            isinstance(self._entries, DatapointRows) or len(self._entries) == 0
+        ):
+            # Keep columnar results columnar
+            if isinstance(self._entries, DatapointRows):
+                self._entries.extend(other.entries)
+            else:
+                self._entries = other.entries
+            self._datapoint_path_lookup = self._entries.path_lookup()
+        else:
+            self._entries.extend(other.entries)
+            for e in other.entries:
+                self._datapoint_path_lookup[e.path] = e
+        self.fields = other.fields
+        self.query_data_time = other.query_data_time
+
     @property
     def dataframe(self):
         """
@@ -138,9 +171,15 @@ class QueryResult:
         `pandas.DataFrame <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_.
 
         The created dataframe has a copy of the QueryResult's data.
+
+        For columnar results (see :func:`to_arrow`), the columns are converted in bulk.
+        Blob fields that weren't downloaded have the hash of the blob, and datetime fields are in UTC.
         """
         import pandas as pd
 
+        if isinstance(self._entries, DatapointRows):
+            return self._entries.columns.to_pandas(self.datasource.source.raw_path)
+
         metadata_key_set = set()
         for e in self.entries:
             metadata_key_set.update(e.metadata.keys())
@@ -148,6 +187,29 @@ class QueryResult:
         metadata_keys = list(sorted(metadata_key_set))
         return pd.DataFrame.from_records([dp.to_dict(metadata_keys) for dp in self.entries])
 
+    @property
+    def is_columnar(self) -> bool:
+        """
+        Whether the metadata of this result is kept in pyarrow columns.
+        Query results are columnar when the ``DAGSHUB_DE_COLUMNAR_RESULTS`` environment variable is set
+        """
+        return isinstance(self._entries, DatapointRows)
+
+    def to_arrow(self):
+        """
+        Represent the contents of this QueryResult as a
+        `pyarrow.Table <https://arrow.apache.org/docs/python/generated/pyarrow.Table.html>`_,
+        with the ``datapoint_id`` and ``path`` columns and a column for each field.
+
+        For columnar results the table shares the memory of the result. Otherwise, it's built from the datapoints.
+        Requires pyarrow: ``pip install dagshub[arrow]``.
+        """
+        import pyarrow as pa
+
+        if isinstance(self._entries, DatapointRows):
+            return self._entries.columns.to_arrow()
+        return pa.Table.from_pandas(self.dataframe.drop(columns="dagshub_download_url"), preserve_index=False)
+
     def __len__(self):
         return len(self.entries)
 
@@ -159,7 +221,11 @@ class QueryResult:
         return f"QueryResult of datasource {self.datasource.source.name} with {len(self.entries)} datapoint(s)"
 
     @staticmethod
-    def from_gql_query(query_resp: Dict[str, Any], datasource: "Datasource") -> "QueryResult":
+    def from_gql_query(
+        query_resp: Dict[str, Any], datasource: "Datasource", columnar: Optional[bool] = None
+    ) -> "QueryResult":
+        if columnar is None:
+            columnar = config.dataengine_columnar_results
         raw_fields = query_resp.get("selectFields") or []
         fields = [dacite.from_dict(MetadataSelectFieldSchema, f, dacite_config) for f in raw_fields]
         # If no fields - get the default datasource ones
@@ -169,7 +235,10 @@ class QueryResult:
         edges = query_resp.get("edges", [])
         if edges is None:
             edges = []
-        datapoints = [Datapoint.from_gql_edge(edge, datasource, fields) for edge in edges]
+        if columnar:
+            datapoints = DatapointRows(ColumnarMetadata.from_gql_edges(edges, fields), datasource)
+        else:
+            datapoints = Datapoint.from_gql_edges(edges, datasource, fields)
         query_data_time = datetime.datetime.fromtimestamp(query_resp.get("queryDataTime"), tz=datetime.timezone.utc)
 
         return QueryResult(_entries=datapoints, datasource=datasource, fields=fields, query_data_time=query_data_time)
@@ -199,6 +268,8 @@ class QueryResult:
             savedir (str|Path): Where to store the datapoint files. Default is :func:`datasource's default location \
                 <dagshub.data_engine.model.datasource.Datasource.default_dataset_location>`
             processes (int): number of parallel processes to download the datapoints with. Default is 8.
+            prefetch (int): number of datapoints to download in the background ahead of the datapoint \
+                that is being accessed, following the order of the dataloader's sampler. Default is 0 (off).
             tensorizers: How to transform the datapoint file/metadata into tensors. Possible values:
 
                 - ``"auto"`` - try to guess the tensorizers for every field.\
@@ -306,15 +377,19 @@ class QueryResult:
             # Download blobs as paths, so later a user can apply ds.cast_column on the blobs
             self.get_blob_fields(load_into_memory=False, path_format="str")
 
-        df = self.dataframe
-
         if download_datapoints:
-            # Do the same for the actual datapoint files, changing the path
-
             if target_dir is None:
                 target_dir = self.datasource.default_dataset_location
             elif isinstance(target_dir, str):
                 target_dir = Path(target_dir).absolute()
+
+        if self.is_columnar:
+            return self._columnar_hf_dataset(target_dir if download_datapoints else None)
+
+        df = self.dataframe
+
+        if download_datapoints:
+            # Do the same for the actual datapoint files, changing the path
             new_paths = []
             self.download_files(target_dir=target_dir)
             for dp in df["path"]:
@@ -329,6 +404,21 @@ class QueryResult:
 
         return hf_ds.Dataset.from_pandas(df)
 
+    def _columnar_hf_dataset(self, target_dir: Optional[Path]) -> "hf_ds.Dataset":
+        """
+        Creates the HuggingFace dataset straight from the arrow columns, without going through pandas
+        """
+        import pyarrow as pa
+
+        table = self.to_arrow()
+        table = table.select([name for name in table.column_names if name not in _generated_fields or name == "path"])
+        if target_dir is not None:
+            self.download_files(target_dir=target_dir)
+            prefix = target_dir / self.datasource.source.source_prefix
+            new_paths = pa.array([str(prefix / p) for p in table.column("path").to_pylist()], pa.string())
+            table = table.set_column(table.schema.get_field_index("path"), "path", new_paths)
+        return hf_ds.Dataset(hf_ds.table.InMemoryTable(table))
+
     def __getitem__(self, item: Union[str, int, slice]):
         """
         Gets datapoint by its path (string) or by its index in the result (or slice)
@@ -371,7 +461,9 @@ class QueryResult:
 
                 If False: the datapoints' specified fields will contain Path objects to the file of the downloaded blob
             cache_on_disk: Whether to cache the blobs on disk or not (valid only if load_into_memory is set to True)
-                Cache location is ``~/dagshub/datasets/<repo>/<datasource_id>/.metadata_blobs/``
+                Cache location is ``~/dagshub/datasets/<repo>/<datasource_id>/.metadata_blobs/``.
+                The blobs are linked there from a global blob store shared by all datasources,
+                so a blob is downloaded only once, even if it's used in multiple datasources.
             num_proc: number of download threads
             path_format: What way the paths to the file should be represented.
                 ``path`` returns a Path object, and ``str`` returns a string of this path.
@@ -731,6 +823,17 @@ class QueryResult:
             and have the same format as the path of the datapoint, including not having the prefix.
             For now, you can't download arbitrary paths/urls.
 
+        .. note::
+            If ``DAGSHUB_DATASET_CACHE_MAX_SIZE`` is set, older downloaded datapoint files
+            get deleted once the downloaded files exceed this size. The files are recorded as they get downloaded,
+            so downloading more than this size also deletes the files that were downloaded first.
+
+        .. note::
+            If ``DAGSHUB_ENABLE_FILE_STORE`` is set, for repository datasources,
+            files with content that was already downloaded before (e.g. from another revision of the repository)
+            are hardlinked from the local file store instead of being downloaded again.
+            The hardlinked files are read-only.
+
         Returns:
             Path to the directory with the downloaded files
         """
@@ -773,7 +876,26 @@ class QueryResult:
 
         download_args = [(dp_url(dp), dp_path(dp)) for dp in self.entries if dp_path(dp) is not None]
 
-        download_files(download_args, skip_if_exists=not redownload)
+        download_fn = None
+        object_store = get_file_store()
+        if object_store is not None and self.datasource.source.source_type == DatasourceType.REPOSITORY:
+            # Files that were already downloaded before (e.g. from another revision) get hardlinked from the store
+            repo_paths = {}
+            for dp in self.entries:
+                path_val = dp.metadata.get(path_field) if path_field is not None else dp.path
+                if path_val is None:
+                    continue
+                location = dp_path(dp)
+                if redownload or not os.path.exists(location):
+                    repo_paths[(self.datasource.source.source_prefix / path_val).as_posix()] = dp_url(dp)
+            content_keys = _DirectoryContentKeys(self.datasource.source, repo_paths)
+            download_fn = deduplicated_download_fn(object_store, content_keys, skip_if_exists=not redownload)
+
+        file_cache = get_dataset_file_cache()
+        if file_cache is not None:
+            download_fn = cache_recording_download_fn(file_cache, download_fn, skip_if_exists=not redownload)
+
+        download_files(download_args, download_fn=download_fn, skip_if_exists=not redownload)
         return target_path
 
     def _get_all_annotations(self, annotation_field: str) -> List[IRTaskAnnotation]:
@@ -1455,6 +1577,173 @@ class QueryResult:
         return self.datasource._log_to_mlflow(artifact_name, run, self.query_data_time)
 
 
+class QueryResultPages:
+    """
+    Result of a query that gets the datapoints lazily, one page at a time.
+    Returned by :func:`Datasource.iter_all() <dagshub.data_engine.model.datasource.Datasource.iter_all>`.
+
+    Iterating over this object yields every page as a :class:`QueryResult`.
+    Pages are requested only once the iteration starts, and aren't kept after they're yielded,
+    so going over the whole datasource takes as much memory as a few pages::
+
+        with ds.iter_all(page_size=10000) as pages:
+            for page in pages:
+                update_statistics(page)
+                save_checkpoint(pages.cursor)
+
+    You can stop iterating at any point. Call :func:`close` (or use the object as a context manager, like above)
+    to stop the requests of the pages ahead, otherwise they go on until the object is garbage collected.
+    To continue later, from the page after the last fully processed one,
+    pass the saved :attr:`cursor` to ``iter_all(after=cursor)``.
+
+    Use :func:`datapoints` to iterate over the datapoints instead of pages.
+
+    The next pages are requested in the background while the current page is processed,
+    up to the config value of dataengine_query_prefetch_pages (2) pages ahead.
+    """
+
+    def __init__(
+        self,
+        datasource: "Datasource",
+        page_size: int,
+        after: Optional[str] = None,
+        load_documents: bool = True,
+        load_annotations: bool = True,
+    ):
+        self.datasource = datasource
+        self.page_size = page_size
+        self.cursor = after
+        """
+        Cursor of the end of the last yielded page. Pass it to ``iter_all(after=...)`` to get the pages after it
+        """
+        self.load_documents = load_documents
+        self.load_annotations = load_annotations
+        self._pager = None
+        self._pages: Optional[Iterator[QueryResult]] = None
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> QueryResult:
+        if self._closed:
+            raise StopIteration
+        if self._pager is None:
+            self._pager = self.datasource.source.client.get_pages(
+                self.datasource, True, page_size=self.page_size, after=self.cursor
+            )
+            self._pages = iter(self._pager)
+        try:
+            for page in self._pages:
+                if len(page) == 0:
+                    self.cursor = self._pager.cursor
+                    continue
+                page._load_autoload_fields(documents=self.load_documents, annotations=self.load_annotations)
+                # Only move past the page once it's ready to be returned,
+                # so resuming from the cursor after a failure doesn't skip the page
+                self.cursor = self._pager.cursor
+                return page
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        raise StopIteration
+
+    def close(self):
+        """
+        Stops the iteration, and the requests of the pages ahead of the last yielded page.
+        Done automatically once all pages were yielded.
+        """
+        self._closed = True
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+
+    def __enter__(self) -> "QueryResultPages":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def timings(self) -> List["PageTiming"]:
+        """
+        Time it took to fetch and parse each of the pages yielded so far
+        """
+        return [] if self._pager is None else self._pager.timings
+
+    def datapoints(self) -> Iterator[Datapoint]:
+        """
+        Yields the datapoints of all pages, one by one.
+        :attr:`cursor` points at the end of the page of the last yielded datapoint.
+        Closing the returned generator, or stopping to iterate over it, also :func:`closes <close>` the pages
+        """
+        try:
+            for page in self:
+                yield from page
+        finally:
+            self.close()
+
+
+class _DirectoryContentKeys(Mapping):
+    """
+    Keys of the files' content in the file store, by download url.
+
+    Hashes of the files come from the listings of their directories. A directory gets listed the first time
+    the key of one of its files is needed, so the download of a file only waits for the listing of its own directory,
+    instead of the listings of all the directories.
+
+    Args:
+        source: Source of the files
+        repo_paths: Download urls of the files, by their path in the repository
+    """
+
+    def __init__(self, source, repo_paths: Dict[str, str]):
+        self.source = source
+        self.repo_paths = repo_paths
+        self._dirs = {url: posixpath.dirname(path) for path, url in repo_paths.items()}
+        self._keys: Dict[str, str] = {}
+        self._listings: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, url: str) -> str:
+        dir_path = self._dirs.get(url)
+        if dir_path is None:
+            raise KeyError(url)
+        self._list_dir(dir_path)
+        return self._keys[url]
+
+    def __iter__(self):
+        return iter(self._dirs)
+
+    def __len__(self) -> int:
+        return len(self._dirs)
+
+    def _list_dir(self, dir_path: str):
+        with self._lock:
+            listing = self._listings.get(dir_path)
+            if listing is None:
+                listing = self._listings[dir_path] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            listing.result()
+            return
+        try:
+            entries = self.source.repoApi.list_path(dir_path, self.source.revision)
+            for entry in entries:
+                url = self.repo_paths.get(entry.path)
+                key = content_key(entry) if url is not None else None
+                if key is not None:
+                    self._keys[url] = key
+        except (PathNotFoundError, RuntimeError) as e:
+            logger.debug(f"Couldn't list {dir_path}, its files will be downloaded without deduplication: {e}")
+        finally:
+            # Files of a directory that couldn't be listed are downloaded as usual
+            listing.set_result(None)
+
+
 # to support depedency-free dataloading, `_Batcher` is a barebones dataloader that sets up batched inference
 class _Batcher:
     def __init__(self, dset, batch_size):
@@ -0,0 +1,254 @@
+import asyncio
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import dacite
+import httpx
+from tenacity import RetryError, before_sleep_log, retry, retry_if_result, stop_after_attempt, wait_exponential
+
+from dagshub.common import config
+from dagshub.common.api.responses import ContentAPIEntry, StorageContentAPIResult
+from dagshub.common.download import atomic_write
+from dagshub.common.helpers import _add_default_request_args
+from dagshub.common.http_pool import create_async_client
+from dagshub.streaming.dataclasses import DagshubPath
+from dagshub.streaming.filesystem import SPECIAL_FILE, DagsHubFilesystem, _is_server_error
+
+logger = logging.getLogger(__name__)
+
+PathType = Union[str, bytes, "os.PathLike[str]"]
+
+
+class AsyncDagsHubFilesystem:
+    """
+    Asynchronous counterpart of :class:`~dagshub.streaming.DagsHubFilesystem`,
+    for using streaming from async code (async web services, async data pipelines) without blocking the event loop.
+
+    All requests to DagsHub are sent with a pooled async HTTP client, so many files can be fetched at the same time,
+    e.g. with ``asyncio.gather()``. Concurrent opens of the same file download it only once.
+
+    The async filesystem works on top of a regular filesystem and shares all of its caches:
+    files downloaded by one of them, and listings made by one of them, are reused by the other.
+
+    Create it with :func:`create` (takes the same arguments as ``DagsHubFilesystem``),
+    or wrap an existing filesystem::
+
+        fs = await AsyncDagsHubFilesystem.create(project_root="repo", repo_url="https://dagshub.com/user/repo")
+        with await fs.open("data/labels.csv") as f:
+            labels = f.read()
+
+    Args:
+        fs: The filesystem to work on top of
+        max_connections: Maximum number of open connections to DagsHub.
+            Default is the config value of http_max_connections_per_host
+    """
+
+    def __init__(self, fs: DagsHubFilesystem, max_connections: Optional[int] = None):
+        self.fs = fs
+        self.max_connections = max_connections or config.http_max_connections_per_host
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._downloads: Dict[str, "asyncio.Task[httpx.Response]"] = {}
+        self._auth = None
+        self._resolved = False
+
+    @classmethod
+    async def create(cls, *args, max_connections: Optional[int] = None, **kwargs) -> "AsyncDagsHubFilesystem":
+        """
+        Creates a new filesystem. The arguments are the same as the arguments of ``DagsHubFilesystem``
+        """
+        # Constructing the filesystem makes requests to DagsHub
+        fs = await asyncio.to_thread(DagsHubFilesystem, *args, **kwargs)
+        return cls(fs, max_connections=max_connections)
+
+    async def __aenter__(self) -> "AsyncDagsHubFilesystem":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the connections of the filesystem. The underlying synchronous filesystem stays usable
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # Async clients and tasks can't be shared between event loops
+            self._client = create_async_client(self.max_connections)
+            self._client_loop = loop
+            self._downloads = {}
+        if not self._resolved:
+            # Getting the credentials and the revision can make requests or run git
+            self._auth = await asyncio.to_thread(self._resolve_auth_and_revision)
+            self._resolved = True
+        return self._client
+
+    def _resolve_auth_and_revision(self):
+        _ = self.fs._current_revision
+        return self.fs.auth
+
+    def _parse_path(self, file: PathType) -> DagshubPath:
+        if type(file) is bytes:
+            file = os.fsdecode(file)
+        return self.fs._parse_path(file)
+
+    async def open(self, file: PathType, mode="r", buffering=-1, encoding=None, errors=None, newline=None):
+        """
+        Opens the file, downloading it first if it isn't present locally.
+
+        The returned file object is a regular file object - by the time it's returned, the file is on the disk,
+        so reading from it doesn't make any requests.
+
+        Arguments are the same as the arguments of the built-in ``open()``.
+        """
+        path = self._parse_path(file)
+        if not path.is_in_repo or path.is_passthrough_path:
+            return self.fs.open(file, mode, buffering, encoding, errors, newline)
+        if path.relative_path == SPECIAL_FILE:
+            return io.BytesIO(self.fs._special_file())
+        if "r" not in mode:
+            # Write modes can download the file for appending, and check the remote tree
+            return await asyncio.to_thread(self.fs.open, file, mode, buffering, encoding, errors, newline)
+
+        await self._ensure_downloaded(path)
+        return self.fs._DagsHubFilesystem__open(path.absolute_path, mode, buffering, encoding, errors, newline)
+
+    async def fetch(self, *files: PathType):
+        """
+        Downloads the files concurrently, without opening them
+        """
+        await asyncio.gather(*(self._ensure_downloaded(self._parse_path(file)) for file in files))
+
+    async def listdir(self, path: PathType = ".") -> List[Union[str, bytes]]:
+        """
+        Lists the directory, same as ``os.listdir()``
+        """
+        parsed_path = self._parse_path(path)
+        if parsed_path.is_in_repo and not parsed_path.is_passthrough_path and not self._is_storage_root(parsed_path):
+            await self._api_listdir(parsed_path)
+        # The listing is cached now, listing with the regular filesystem doesn't make requests
+        return self.fs.listdir(path)
+
+    async def stat(self, path: PathType) -> os.stat_result:
+        """
+        Returns the status of the file or directory, same as ``os.stat()``
+        """
+        parsed_path = self._parse_path(path)
+        if (
+            parsed_path.is_in_repo
+            and not parsed_path.is_passthrough_path
+            and parsed_path.relative_path != SPECIAL_FILE
+            and not self.fs._is_downloaded(parsed_path.relative_path.as_posix())
+        ):
+            parent = DagshubPath(
+                self.fs,
+                parsed_path.absolute_path.parent,
+                parsed_path.relative_path.parent,
+                parsed_path.original_path.parent,
+            )
+            if not self._is_storage_root(parent):
+                await self._api_listdir(parent)
+        return self.fs.stat(path)
+
+    @staticmethod
+    def _is_storage_root(path: DagshubPath) -> bool:
+        # .dagshub/storage/<type>/ are virtual directories, they're never listed on DagsHub
+        len_parts = len(path.relative_path.parts)
+        return 0 < len_parts <= 3 and path.relative_path.parts[0] == ".dagshub"
+
+    async def _ensure_downloaded(self, path: DagshubPath):
+        relative_path = path.relative_path.as_posix()
+        if self.fs.prefetcher is not None:
+            # Waits for the file if it's being prefetched
+            await asyncio.to_thread(self.fs.prefetcher.on_access, relative_path)
+        client = await self._get_client()
+        # No awaits from here until the download is registered, so concurrent opens can't both start a download
+        if self.fs._is_downloaded(relative_path):
+            return
+        if self.fs._is_known_missing(path):
+            raise FileNotFoundError(f"Error finding {path.relative_path} in repo or on DagsHub")
+
+        task = self._downloads.get(relative_path)
+        if task is None:
+            task = asyncio.ensure_future(self._download(client, path))
+            self._downloads[relative_path] = task
+            task.add_done_callback(lambda _: self._downloads.pop(relative_path, None))
+        try:
+            # Cancelling one of the opens shouldn't cancel the download for the other ones
+            resp = await asyncio.shield(task)
+        except RetryError:
+            raise RuntimeError(f"Couldn't download {path.relative_path} after multiple attempts")
+        if resp.status_code == 404:
+            self.fs._record_missing(path)
+            raise FileNotFoundError(f"Error finding {path.relative_path} in repo or on DagsHub")
+        elif resp.status_code >= 400:
+            raise RuntimeError(
+                f"Got response code {resp.status_code} from DagsHub while downloading file {path.relative_path}"
+            )
+
+    async def _download(self, client: httpx.AsyncClient, path: DagshubPath) -> httpx.Response:
+        key = self.fs._object_store_key(path)
+        if key is not None and await asyncio.to_thread(self.fs._link_object, key, path):
+            # Same content was already downloaded, e.g. for another revision of the repo
+            return httpx.Response(200)
+        resp = await self._api_download_file_git(client, path)
+        if key is not None and resp.status_code < 400:
+            await asyncio.to_thread(self.fs._store_object, key, path)
+        return resp
+
+    @retry(
+        retry=retry_if_result(_is_server_error),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+    )
+    async def _api_download_file_git(self, client: httpx.AsyncClient, path: DagshubPath) -> httpx.Response:
+        request_args = _add_default_request_args({"auth": self._auth, "timeout": None})
+        async with client.stream("GET", self.fs._raw_url_for_path(path), **request_args) as resp:
+            if resp.status_code < 400:
+                self.fs._mkdirs(path.absolute_path.parent)
+                with atomic_write(Path(path.absolute_path)) as f:
+                    async for chunk in resp.aiter_bytes(config.download_chunk_size):
+                        f.write(chunk)
+        return resp
+
+    async def _api_listdir(self, path: DagshubPath, include_size: bool = False) -> Optional[List[ContentAPIEntry]]:
+        client = await self._get_client()
+        response, hit = self.fs._check_listing_caches(path, include_size)
+        if hit:
+            return response
+        params = self.fs._listdir_params(path, include_size)
+        url = self.fs._content_url_for_path(path)
+
+        async def _get() -> Optional[httpx.Response]:
+            request_args = _add_default_request_args({"params": params, "auth": self._auth, "timeout": self.fs.timeout})
+            resp = await client.get(url, **request_args)
+            return self.fs._check_listdir_response(path, resp)
+
+        response = await _get()
+        if response is None:
+            return None
+        if path.is_storage_path:
+            res: List[ContentAPIEntry] = []
+            result = dacite.from_dict(StorageContentAPIResult, response.json())
+            res += result.entries
+            while result.next_token is not None:
+                params["from_token"] = result.next_token
+                new_resp = await _get()
+                if new_resp is None:
+                    return None
+                result = dacite.from_dict(StorageContentAPIResult, new_resp.json())
+                res += result.entries
+        else:
+            res = self.fs._parse_listing(response.json())
+
+        self.fs._cache_listing(path, include_size, res)
+        return res
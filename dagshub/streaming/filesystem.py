@@ -6,12 +6,13 @@ import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from configparser import ConfigParser
-from functools import wraps, cached_property
+from functools import wraps, cached_property, lru_cache
 from multiprocessing import AuthenticationError
 from os import PathLike
 from pathlib import Path, PurePosixPath
-from typing import Optional, TypeVar, Union, Dict, Set, Tuple, List, Any, Callable
+from typing import Optional, TypeVar, Union, Dict, Set, Tuple, List, Any, Callable, TYPE_CHECKING
 from urllib.parse import urlparse, ParseResult
 
 import dacite
@@ -21,9 +22,19 @@ from tenacity import retry, retry_if_result, stop_after_attempt, wait_exponentia
 from dagshub.common import config, is_inside_notebook, is_inside_colab
 from dagshub.common.api.repo import RepoAPI, CommitNotFoundError
 from dagshub.common.api.responses import ContentAPIEntry, StorageContentAPIResult
-from dagshub.common.helpers import http_request, get_project_root, log_message
+from dagshub.common.download import write_response_to_file
+from dagshub.common.helpers import http_request, http_stream, get_project_root, log_message
+from dagshub.common.object_store import ObjectStore, content_key, get_file_store
+from dagshub.common.singleflight import SingleFlight
+from dagshub.common.util import multi_urljoin
 from dagshub.streaming.dataclasses import DagshubPath
 from dagshub.streaming.errors import FilesystemAlreadyMountedError
+from dagshub.streaming.listing_cache import PersistentListingCache, get_listing_cache
+from dagshub.streaming.negative_cache import NegativeLookupCache, get_negative_lookup_cache
+from dagshub.streaming.prefetch import PrefetchEngine, PrefetchPolicy, SiblingPrefetchPolicy
+
+if TYPE_CHECKING:
+    from dagshub.streaming.router import FilesystemRouter
 
 # Pre 3.11 - need to patch _NormalAccessor for _pathlib, because it pre-caches open and other functions.
 # In 3.11 _NormalAccessor was removed
@@ -66,6 +77,24 @@ class dagshub_ScandirIterator:
 
 SPECIAL_FILE = Path(".dagshub-streaming")
 
+# Downloads of files in progress, by their absolute path. Shared by all filesystems of the process
+_downloads: SingleFlight[Response] = SingleFlight(across_processes=True)
+
+
+@lru_cache(maxsize=4096)
+def _normpath(path: str) -> str:
+    return os.path.normpath(path)
+
+
+def _abspath(path: str) -> str:
+    """
+    Same as ``os.path.abspath()``, with the normalization of the path cached,
+    since the patched functions get called with the same paths over and over
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    return _normpath(path)
+
 
 def _is_server_error(resp: Response):
     return resp.status_code >= 500
@@ -97,7 +126,7 @@ class DagsHubFilesystem:
     """
 
     already_mounted_filesystems: Dict[Path, "DagsHubFilesystem"] = {}
-    hooked_instance: Optional["DagsHubFilesystem"] = None
+    hooked_instance: Optional[Union["DagsHubFilesystem", "FilesystemRouter"]] = None
 
     # Framework-specific override functions.
     # These functions will be patched with a function that calls fs.open() before calling the original function
@@ -162,6 +191,9 @@ class DagsHubFilesystem:
         self.exclude_globs: List[str] = exclude_globs
 
         self._listdir_cache: Dict[str, Optional[Tuple[List[ContentAPIEntry], bool]]] = {}
+        self.prefetcher: Optional[PrefetchEngine] = None
+        # Files with content that was already downloaded (e.g. for another revision) get hardlinked from the store
+        self.object_store: Optional[ObjectStore] = get_file_store()
 
         self._api = self._generate_repo_api(self.parsed_repo_url)
 
@@ -175,6 +207,9 @@ class DagsHubFilesystem:
 
         self._storages = self._api.get_connected_storages()
 
+        if config.streaming_prefetch:
+            self.enable_prefetch()
+
     def _generate_repo_api(self, repo_url: ParseResult) -> RepoAPI:
         host = f"{repo_url.scheme}://{repo_url.netloc}"
         repo = repo_url.path
@@ -242,10 +277,9 @@ class DagsHubFilesystem:
         """
 
         def is_subpath(a: Path, b: Path) -> bool:
-            # Checks if either a or b are subpaths of each other
-            a_str = a.as_posix()
-            b_str = b.as_posix()
-            return a_str.startswith(b_str) or b_str.startswith(a_str)
+            # Checks if either a or b are subpaths of each other.
+            # Compares whole components, so siblings like data-v1 and data-v10 don't count as nested
+            return a == b or a in b.parents or b in a.parents
 
         for p, f in DagsHubFilesystem.already_mounted_filesystems.items():
             if is_subpath(p, self.project_root):
@@ -321,24 +355,37 @@ class DagsHubFilesystem:
         self.cleanup()
 
     def cleanup(self):
+        if getattr(self, "prefetcher", None) is not None:
+            self.prefetcher.close()
         # Remove from map of mounted filesystems
         if hasattr(self, "project_root") and self.project_root in DagsHubFilesystem.already_mounted_filesystems:
             DagsHubFilesystem.already_mounted_filesystems.pop(self.project_root)
 
+    @cached_property
+    def _project_root_prefix(self) -> str:
+        root = os.path.abspath(self.project_root)
+        return root if root.endswith(os.sep) else root + os.sep
+
     def _parse_path(self, file: Union[str, PathLike, int]) -> DagshubPath:
-        orig_path = Path(file)
         if isinstance(file, int):
-            return DagshubPath(self, None, None, orig_path)
-        if file == "":
-            return DagshubPath(self, None, None, orig_path)
-        abspath = Path(os.path.abspath(file))
-        try:
-            relpath = abspath.relative_to(os.path.abspath(self.project_root))
-            if str(relpath).startswith("<"):
-                return DagshubPath(self, abspath, None, orig_path)
-            return DagshubPath(self, abspath, relpath, orig_path)
-        except ValueError:
-            return DagshubPath(self, abspath, None, orig_path)
+            return DagshubPath(self, None, None, None)
+        str_path = os.fspath(file)
+        if isinstance(str_path, bytes):
+            str_path = os.fsdecode(str_path)
+        if str_path == "":
+            return DagshubPath(self, None, None, Path(str_path))
+        abspath = _abspath(str_path)
+        # Fast path: every patched call in the process comes through here,
+        # so paths outside of the repo are rejected with a string comparison, without building any Path objects
+        prefix = self._project_root_prefix
+        if not abspath.startswith(prefix):
+            if abspath == prefix[:-1]:
+                return DagshubPath(self, Path(abspath), Path(), Path(str_path))
+            return DagshubPath(self, None, None, None)
+        relpath = abspath[len(prefix) :]
+        if relpath.startswith("<"):
+            return DagshubPath(self, None, None, None)
+        return DagshubPath(self, Path(abspath), Path(relpath), Path(str_path))
 
     def _special_file(self):
         # TODO Include more information in this file
@@ -382,22 +429,26 @@ class DagsHubFilesystem:
             elif path.relative_path == SPECIAL_FILE:
                 return io.BytesIO(self._special_file())
             else:
+                if self.prefetcher is not None and "r" in mode:
+                    self.prefetcher.on_access(path.relative_path.as_posix())
+                if any(c in mode for c in "wax+"):
+                    self._detach_object(path)
                 try:
                     return self.__open(path.absolute_path, mode, buffering, encoding, errors, newline, closefd)
                 except FileNotFoundError as err:
                     # Open for reading - try to download the file
                     if "r" in mode:
+                        if self._is_known_missing(path):
+                            raise FileNotFoundError(f"Error finding {path.relative_path} in repo or on DagsHub")
                         try:
-                            resp = self._api_download_file_git(path)
+                            # TODO: Handle symlinks
+                            resp = self._download_once(path)
                         except RetryError:
                             raise RuntimeError(f"Couldn't download {path.relative_path} after multiple attempts")
                         if resp.status_code < 400:
-                            self._mkdirs(path.absolute_path.parent)
-                            # TODO: Handle symlinks
-                            with self.__open(path.absolute_path, "wb") as output:
-                                output.write(resp.content)
                             return self.__open(path.absolute_path, mode, buffering, encoding, errors, newline, closefd)
                         elif resp.status_code == 404:
+                            self._record_missing(path)
                             raise FileNotFoundError(f"Error finding {path.relative_path} in repo or on DagsHub")
                         else:
                             raise RuntimeError(
@@ -415,12 +466,9 @@ class DagsHubFilesystem:
                         # Try to download the file if we're in append modes
                         if "a" in mode or "+" in mode:
                             try:
-                                resp = self._api_download_file_git(path)
+                                self._api_download_file_git(path)
                             except RetryError:
                                 raise RuntimeError(f"Couldn't download {path.relative_path} after multiple attempts")
-                            if resp.status_code < 400:
-                                with self.__open(path.absolute_path, "wb") as output:
-                                    output.write(resp.content)
                         return self.__open(path.absolute_path, mode, buffering, encoding, errors, newline, closefd)
 
         else:
@@ -441,6 +489,7 @@ class DagsHubFilesystem:
         if dir_fd is not None:  # If dir_fd supplied, path is relative to that dir's fd, will handle in the future
             logger.debug("fs.os_open - NotImplemented")
             raise NotImplementedError("DagsHub's patched os.open() (for pathlib only) does not support dir_fd")
+        orig_path = path
         path = self._parse_path(path)
         if path.is_in_repo:
             try:
@@ -455,7 +504,8 @@ class DagsHubFilesystem:
                 logger.debug("fs.os_open - successfully materialized path")
             except FileNotFoundError:
                 logger.debug("fs.os_open - failed to materialize path, os.open will throw")
-        return os.open(path.absolute_path, flags, mode, dir_fd=dir_fd)
+            return os.open(path.absolute_path, flags, mode, dir_fd=dir_fd)
+        return os.open(orig_path, flags, mode, dir_fd=dir_fd)
 
     def stat(self, path, *args, dir_fd=None, follow_symlinks=True):
         """
@@ -498,6 +548,8 @@ class DagsHubFilesystem:
                     return self.__stat(parsed_path.absolute_path)
                 except FileNotFoundError as err:
                     logger.debug("fs.stat - FileNotFoundError")
+                    if self._is_known_missing(parsed_path):
+                        raise err
                     logger.debug(f"remote_tree: {self.remote_tree}")
                     parent_path = parsed_path.relative_path.parent
                     if str(parent_path) not in self.remote_tree:
@@ -620,7 +672,7 @@ class DagsHubFilesystem:
                 resp = self._api_listdir(parsed_path)
                 if resp is not None:
                     dircontents.update(Path(f.path).name for f in resp)
-                    self.remote_tree[str(parsed_path.relative_path)] = {Path(f.path).name: f.type for f in resp}
+                    self._update_remote_tree(parsed_path, resp)
                     return encode_results(dircontents)
                 else:
                     if error is not None:
@@ -631,6 +683,139 @@ class DagsHubFilesystem:
         else:
             return self.__listdir(path)
 
+    def _update_remote_tree(self, path: DagshubPath, entries: List[ContentAPIEntry]):
+        self.remote_tree[str(path.relative_path)] = {PurePosixPath(f.path).name: f.type for f in entries}
+
+    def prefetch_tree(
+        self, path: Union[str, PathLike] = ".", depth: Optional[int] = None, max_workers: Optional[int] = None
+    ) -> int:
+        """
+        Lists the whole directory tree under ``path`` ahead of time, filling up the listing caches.
+
+        After prefetching, ``os.walk()``, ``os.listdir()`` and ``os.stat()``
+        (and anything using them, e.g. torchvision's ``ImageFolder``) inside of the tree
+        don't need to make a request to DagsHub for every directory.
+
+        Directories are listed concurrently, with at most ``max_workers`` requests in flight.
+
+        Args:
+            path: Directory to prefetch. Defaults to the current directory.
+            depth: How many levels of subdirectories to list. ``0`` lists only ``path`` itself.
+                ``None`` (default) lists the whole subtree.
+            max_workers: Maximum number of concurrent listing requests.
+                Defaults to the config value of download_threads (32).
+
+        Returns:
+            Number of directories that were listed.
+
+        .. note::
+            Connected storage buckets are only traversed if ``path`` is inside of the bucket,
+            e.g. ``.dagshub/storage/s3/bucket-name``.
+        """
+        root = self._parse_path(path)
+        if not root.is_in_repo:
+            raise ValueError(f"Path {path} is not inside of the repository root {self.project_root}")
+        if max_workers is None:
+            max_workers = config.download_threads
+
+        listed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as tp:
+            pending = {tp.submit(self._prefetch_listdir, root): (root, 0)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dir_path, level = pending.pop(future)
+                    entries = future.result()
+                    if entries is None:
+                        continue
+                    listed += 1
+                    if depth is not None and level >= depth:
+                        continue
+                    for entry in entries:
+                        if entry.type == "dir":
+                            child = dir_path / PurePosixPath(entry.path).name
+                            pending[tp.submit(self._prefetch_listdir, child)] = (child, level + 1)
+        return listed
+
+    def _prefetch_listdir(self, path: DagshubPath) -> Optional[List[ContentAPIEntry]]:
+        entries = self._api_listdir(path)
+        if entries is not None:
+            self._update_remote_tree(path, entries)
+        return entries
+
+    def enable_prefetch(
+        self,
+        policies: Optional[List[PrefetchPolicy]] = None,
+        max_workers: Optional[int] = None,
+        disk_budget: Optional[int] = None,
+    ) -> PrefetchEngine:
+        """
+        Starts downloading files in the background before they get opened.
+
+        Every time a file gets opened for reading, the policies decide which files are likely to be opened next,
+        and those get downloaded ahead on a background pool.
+        Opening a file that is still being prefetched waits for the prefetch instead of downloading the file again.
+        Files can also be prefetched explicitly with :func:`prefetch_files`.
+
+        Args:
+            policies: Prefetch policies. Default is to prefetch the files that come after the opened file
+                in its directory (:class:`~dagshub.streaming.prefetch.SiblingPrefetchPolicy`)
+            max_workers: Number of download threads. Default is the config value of prefetch_threads (4)
+            disk_budget: Maximum total size of prefetched files that weren't opened yet.
+                Default is the config value of prefetch_disk_budget (1 GiB)
+
+        Returns:
+            The prefetch engine. Its :attr:`~dagshub.streaming.prefetch.PrefetchEngine.stats`
+            has the hit/miss counters.
+        """
+        self.disable_prefetch()
+        if policies is None:
+            policies = [SiblingPrefetchPolicy(self)]
+        self.prefetcher = PrefetchEngine(
+            self._prefetch_file,
+            policies,
+            is_present=self._is_downloaded,
+            max_workers=max_workers,
+            disk_budget=disk_budget,
+        )
+        return self.prefetcher
+
+    def disable_prefetch(self):
+        """
+        Stops prefetching files
+        """
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self.prefetcher = None
+
+    def prefetch_files(self, *paths: Union[str, PathLike]):
+        """
+        Downloads the files in the background, ahead of them being opened.
+        Requires prefetching to be enabled with :func:`enable_prefetch`.
+        """
+        if self.prefetcher is None:
+            raise RuntimeError("Prefetching is not enabled, call enable_prefetch() first")
+        keys = []
+        for path in paths:
+            parsed_path = self._parse_path(path)
+            if parsed_path.is_in_repo and not parsed_path.is_passthrough_path:
+                keys.append(parsed_path.relative_path.as_posix())
+        self.prefetcher.hint(*keys)
+
+    def _prefetch_file(self, relative_path: str) -> int:
+        path = self._parse_path(self.project_root / relative_path)
+        resp = self._download_once(path)
+        if resp.status_code >= 400:
+            return 0
+        return self.__stat(path.absolute_path).st_size
+
+    def _is_downloaded(self, relative_path: str) -> bool:
+        try:
+            self.__stat(self.project_root / relative_path)
+            return True
+        except FileNotFoundError:
+            return False
+
     @cached_property
     def project_root_dagshub_path(self):
         return DagshubPath(absolute_path=self.project_root, relative_path=Path(), original_path=Path(), fs=self)
@@ -700,31 +885,64 @@ class DagsHubFilesystem:
                     continue
         return res
 
+    def _remote_file_size(self, path: DagshubPath) -> Optional[int]:
+        """
+        Returns the size of the file on the remote, or None if there's no such file
+        """
+        entry = self._remote_file_entry(path, include_size=True)
+        return entry.size if entry is not None else None
+
+    def _remote_file_entry(
+        self, path: DagshubPath, include_size: bool = False, cached_only: bool = False
+    ) -> Optional[ContentAPIEntry]:
+        """
+        Returns the entry of the file in the listing of its directory on the remote, or None if there's no such file.
+        With ``cached_only``, doesn't make a request, and returns None if the directory's listing isn't cached.
+        """
+        if not path.is_in_repo:
+            return None
+        parent = DagshubPath(self, path.absolute_path.parent, path.relative_path.parent, path.original_path.parent)
+        if cached_only:
+            entries, _ = self._check_listing_caches(parent, include_size)
+        else:
+            entries = self._api_listdir(parent, include_size=include_size)
+        if entries is None:
+            return None
+        for entry in entries:
+            if entry.type == "file" and PurePosixPath(entry.path).name == path.name:
+                return entry
+        return None
+
+    def _object_store_key(self, path: DagshubPath) -> Optional[str]:
+        """
+        Returns the key of the file's content in the object store,
+        or None if the file can't be deduplicated (no object store, bucket file, or unknown hash).
+
+        The hash comes from the listing of the file's directory, only if it's already cached
+        (e.g. after os.listdir(), os.walk() or prefetch_tree()), so downloads don't wait for an extra request.
+        """
+        if self.object_store is None or path.is_storage_path:
+            return None
+        entry = self._remote_file_entry(path, cached_only=True)
+        return content_key(entry) if entry is not None else None
+
     def _api_listdir(self, path: DagshubPath, include_size: bool = False) -> Optional[List[ContentAPIEntry]]:
-        response, hit = self._check_listdir_cache(path.relative_path.as_posix(), include_size)
+        response, hit = self._check_listing_caches(path, include_size)
         if hit:
             return response
-        params: Dict[str, Any] = {"include_size": "true"} if include_size else {}
-        if path.is_storage_path:
-            params["paging"] = True
+        params = self._listdir_params(path, include_size)
         url = self._content_url_for_path(path)
 
         def _get() -> Optional[Response]:
             resp = self.http_get(url, params=params, headers=config.requests_headers)
-            if resp.status_code == 404:
-                logger.debug(f"Got HTTP code {resp.status_code} while listing {path}, no results will be returned")
-                return None
-            elif resp.status_code >= 400:
-                logger.warning(f"Got HTTP code {resp.status_code} while listing {path}, no results will be returned")
-                return None
-            return resp
+            return self._check_listdir_response(path, resp)
 
         response = _get()
         if response is None:
             return None
-        res: List[ContentAPIEntry] = []
         # Storage - token pagination, different return structure + if there's a token we do another request
         if path.is_storage_path:
+            res: List[ContentAPIEntry] = []
             result = dacite.from_dict(StorageContentAPIResult, response.json())
             res += result.entries
             while result.next_token is not None:
@@ -735,16 +953,68 @@ class DagsHubFilesystem:
                 result = dacite.from_dict(StorageContentAPIResult, new_resp.json())
                 res += result.entries
         else:
-            for entry_raw in response.json():
-                entry = dacite.from_dict(ContentAPIEntry, entry_raw)
-                # Ignore storage root entries, we handle them separately in a different place
-                if entry.type == "storage":
-                    continue
-                res.append(entry)
+            res = self._parse_listing(response.json())
 
-        self._listdir_cache[path.relative_path.as_posix()] = (res, include_size)
+        self._cache_listing(path, include_size, res)
         return res
 
+    def _check_listing_caches(
+        self, path: DagshubPath, include_size: bool
+    ) -> Tuple[Optional[List[ContentAPIEntry]], bool]:
+        """
+        Checks all caches that can answer a listing without a request.
+        Returns the listing (None if the path is known to be missing), and whether the caches had an answer.
+        """
+        response, hit = self._check_listdir_cache(path.relative_path.as_posix(), include_size)
+        if hit:
+            return response, True
+        if not path.is_storage_path:
+            response = self._check_persistent_listdir_cache(path.relative_path.as_posix(), include_size)
+            if response is not None:
+                return response, True
+        if self._is_known_missing(path):
+            return None, True
+        return None, False
+
+    @staticmethod
+    def _listdir_params(path: DagshubPath, include_size: bool) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"include_size": "true"} if include_size else {}
+        if path.is_storage_path:
+            params["paging"] = True
+        return params
+
+    def _check_listdir_response(self, path: DagshubPath, resp: Response) -> Optional[Response]:
+        """
+        Returns the response if it has a listing, or None if it's an error
+        """
+        if resp.status_code == 404:
+            logger.debug(f"Got HTTP code {resp.status_code} while listing {path}, no results will be returned")
+            self._record_missing(path)
+            return None
+        elif resp.status_code >= 400:
+            logger.warning(f"Got HTTP code {resp.status_code} while listing {path}, no results will be returned")
+            return None
+        return resp
+
+    @staticmethod
+    def _parse_listing(entries_raw: List[Dict[str, Any]]) -> List[ContentAPIEntry]:
+        res = []
+        for entry_raw in entries_raw:
+            entry = dacite.from_dict(ContentAPIEntry, entry_raw)
+            # Ignore storage root entries, we handle them separately in a different place
+            if entry.type == "storage":
+                continue
+            res.append(entry)
+        return res
+
+    def _cache_listing(self, path: DagshubPath, include_size: bool, entries: List[ContentAPIEntry]):
+        str_path = path.relative_path.as_posix()
+        self._listdir_cache[str_path] = (entries, include_size)
+        if not path.is_storage_path and self._persistent_listing_cache is not None:
+            self._persistent_listing_cache.put(
+                self._listing_cache_repo_key, self._current_revision, str_path, include_size, entries
+            )
+
     def _check_listdir_cache(self, path: str, include_size: bool) -> Tuple[Optional[List[ContentAPIEntry]], bool]:
         # Checks that path has a pre-cached response
         # If include_size is True, but only a response without size is cached, that's a cache miss
@@ -754,6 +1024,43 @@ class DagsHubFilesystem:
                 return cache_val, True
         return None, False
 
+    def _check_persistent_listdir_cache(self, path: str, include_size: bool) -> Optional[List[ContentAPIEntry]]:
+        # Checks the on-disk cache, shared between processes. On hit also populates the in-memory cache
+        if self._persistent_listing_cache is None:
+            return None
+        res = self._persistent_listing_cache.get(
+            self._listing_cache_repo_key, self._current_revision, path, include_size
+        )
+        if res is not None:
+            self._listdir_cache[path] = (res, include_size)
+        return res
+
+    @cached_property
+    def _persistent_listing_cache(self) -> Optional[PersistentListingCache]:
+        return get_listing_cache()
+
+    @cached_property
+    def _listing_cache_repo_key(self) -> str:
+        return multi_urljoin(self._api.host, self._api.full_name)
+
+    @cached_property
+    def _negative_lookup_cache(self) -> Optional[NegativeLookupCache]:
+        return get_negative_lookup_cache()
+
+    def _negative_lookup_key(self, path: DagshubPath) -> Tuple[str, str, str]:
+        # Connected storages aren't versioned, their entries are cached with an empty revision, which expires
+        revision = "" if path.is_storage_path else self._current_revision
+        return self._listing_cache_repo_key, revision, path.relative_path.as_posix()
+
+    def _is_known_missing(self, path: DagshubPath) -> bool:
+        if self._negative_lookup_cache is None:
+            return False
+        return self._negative_lookup_cache.is_missing(*self._negative_lookup_key(path))
+
+    def _record_missing(self, path: DagshubPath):
+        if self._negative_lookup_cache is not None:
+            self._negative_lookup_cache.add(*self._negative_lookup_key(path))
+
     def _content_url_for_path(self, path: DagshubPath):
         if not path.is_in_repo:
             raise RuntimeError(f"Can't access path {path.absolute_path} outside of repo")
@@ -778,10 +1085,66 @@ class DagsHubFilesystem:
         wait=wait_exponential(multiplier=1, min=4, max=10),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
-    def _api_download_file_git(self, path: DagshubPath):
-        resp = self.http_get(self._raw_url_for_path(path), headers=config.requests_headers, timeout=None)
+    def _api_download_file_git(self, path: DagshubPath) -> Response:
+        """
+        Downloads the file from the server to its place on disk, streaming it in chunks.
+        The file only shows up at its path once it's fully downloaded.
+
+        Returns the response of the request (with the body already consumed),
+        if the status code is >=400, nothing is written.
+        """
+        key = self._object_store_key(path)
+        if key is not None and self._link_object(key, path):
+            # Same content was already downloaded, e.g. for another revision of the repo
+            return Response(200)
+        with self.http_stream(self._raw_url_for_path(path), headers=config.requests_headers, timeout=None) as resp:
+            if resp.status_code < 400:
+                self._mkdirs(path.absolute_path.parent)
+                write_response_to_file(resp, path.absolute_path)
+        if key is not None and resp.status_code < 400:
+            self._store_object(key, path)
         return resp
 
+    def _download_once(self, path: DagshubPath) -> Response:
+        """
+        Downloads the file, making sure that it gets downloaded only once
+        when multiple threads or processes need it at the same time.
+        The threads and processes that didn't download it wait for the download to finish and get the same result.
+        """
+
+        def download():
+            # Another process might have downloaded the file while this one was waiting for the lock
+            if self._is_downloaded(path.relative_path):
+                return Response(200)
+            return self._api_download_file_git(path)
+
+        return _downloads.do(str(path.absolute_path), download)
+
+    def _link_object(self, key: str, path: DagshubPath) -> bool:
+        """
+        Puts the object from the object store at the path of the file. Returns False if the object isn't stored
+        """
+        self._mkdirs(path.absolute_path.parent)
+        return self.object_store.link(key, path.absolute_path) is not None
+
+    def _detach_object(self, path: DagshubPath):
+        """
+        Gives the file a writable copy of its content, if it's hardlinked from the object store.
+        Files linked from the store share their content with the store and other checkouts
+        """
+        try:
+            st = self.__stat(path.absolute_path)
+        except FileNotFoundError:
+            return
+        if st.st_nlink > 1:
+            ObjectStore.detach(path.absolute_path)
+
+    def _store_object(self, key: str, path: DagshubPath):
+        try:
+            self.object_store.add_file(key, path.absolute_path)
+        except OSError:
+            logger.warning(f"Couldn't add {path.relative_path} to the object store", exc_info=True)
+
     def http_get(self, path: str, **kwargs):
         timeout = self.timeout
         if "timeout" in kwargs:
@@ -789,6 +1152,13 @@ class DagsHubFilesystem:
             del kwargs["timeout"]
         return http_request("GET", path, auth=self.auth, timeout=timeout, **kwargs)
 
+    def http_stream(self, path: str, **kwargs):
+        timeout = self.timeout
+        if "timeout" in kwargs:
+            timeout = kwargs["timeout"]
+            del kwargs["timeout"]
+        return http_stream("GET", path, auth=self.auth, timeout=timeout, **kwargs)
+
     def install_hooks(self):
         """
         Install hooks to override default file and directory operations with DagsHub-aware functionality.
@@ -809,12 +1179,27 @@ class DagsHubFilesystem:
 
         Call :func:`~DagsHubFilesystem.uninstall_hooks` to undo the monkey patching.
         """
-        if not hasattr(self.__class__, f"_{self.__class__.__name__}__unpatched"):
+        self._patch_builtins(self)
+        self._install_framework_hooks()
+
+        msg = (
+            f'Repository "{self._api.full_name}" is now hooked at path "{self.project_root}".\n'
+            f"Any calls to Python file access function like open() and listdir() inside "
+            f"of this directory will include results from the repository."
+        )
+        log_message(msg, logger)
+
+    @classmethod
+    def _patch_builtins(cls, target: "Union[DagsHubFilesystem, FilesystemRouter]"):
+        """
+        Replaces the builtin file I/O functions with the functions of ``target``
+        """
+        if not hasattr(cls, f"_{cls.__name__}__unpatched"):
             # TODO: DRY this dictionary. i.e. __open() links cls.__open
             #  and io.open even though this dictionary links them
             #  Cannot use a dict as the source of truth because type hints rely on
             #  __get_unpatched inferring the right type
-            self.__class__.__unpatched = {
+            cls.__unpatched = {
                 "open": builtins.open,
                 "stat": os.stat,
                 "listdir": os.listdir,
@@ -822,7 +1207,7 @@ class DagsHubFilesystem:
                 "chdir": os.chdir,
             }
             if PRE_PYTHON3_11:
-                self.__class__.__unpatched["pathlib_open"] = _pathlib.open
+                cls.__unpatched["pathlib_open"] = _pathlib.open
 
         # IPython patches io.open to its own override, so we need to overwrite that also
         # More at _modified_open function in IPython sources:
@@ -832,35 +1217,27 @@ class DagsHubFilesystem:
 
             instance = IPython.core.interactiveshell.InteractiveShell._instance  # noqa
             if instance is not None and hasattr(instance, "user_ns") and "open" in instance.user_ns:
-                self.__class__.__unpatched["notebook_open"] = instance.user_ns["open"]
-                instance.user_ns["open"] = self.open
-
-        io.open = builtins.open = self.open
-        os.stat = self.stat
-        os.listdir = self.listdir
-        os.scandir = self.scandir
-        os.chdir = self.chdir
+                # Hooks can be installed again (e.g. by a FilesystemRouter), keep the original open
+                cls.__unpatched.setdefault("notebook_open", instance.user_ns["open"])
+                instance.user_ns["open"] = target.open
+
+        io.open = builtins.open = target.open
+        os.stat = target.stat
+        os.listdir = target.listdir
+        os.scandir = target.scandir
+        os.chdir = target.chdir
         if PRE_PYTHON3_11:
             if sys.version_info.minor == 10:
                 # Python 3.10 - pathlib uses io.open
-                _pathlib.open = self.open
+                _pathlib.open = target.open
             else:
                 # Python <=3.9 - pathlib uses os.open
-                _pathlib.open = self.os_open
-            _pathlib.stat = self.stat
-            _pathlib.listdir = self.listdir
-            _pathlib.scandir = self.scandir
-
-        self._install_framework_hooks()
+                _pathlib.open = target.os_open
+            _pathlib.stat = target.stat
+            _pathlib.listdir = target.listdir
+            _pathlib.scandir = target.scandir
 
-        DagsHubFilesystem.hooked_instance = self
-
-        msg = (
-            f'Repository "{self._api.full_name}" is now hooked at path "{self.project_root}".\n'
-            f"Any calls to Python file access function like open() and listdir() inside "
-            f"of this directory will include results from the repository."
-        )
-        log_message(msg, logger)
+        DagsHubFilesystem.hooked_instance = target
 
     _framework_key_prefix = "framework_"
 
@@ -995,10 +1372,11 @@ class DagsHubFilesystem:
 
     @classmethod
     def __get_unpatched(cls, key, alt: T) -> T:
-        if hasattr(cls, f"_{cls.__name__}__unpatched"):
-            return cls.__unpatched[key]
-        else:
-            return alt
+        # Called on every patched call, so look the attribute up without building its mangled name every time
+        unpatched = getattr(cls, "_DagsHubFilesystem__unpatched", None)
+        if unpatched is not None:
+            return unpatched[key]
+        return alt
 
     @property
     def __open(self):
@@ -1087,7 +1465,7 @@ class dagshub_stat_result:
         elif name == "st_mode":
             return 0o100644
         elif name == "st_size":
-            if self._custom_size:
+            if self._custom_size is not None:
                 return self._custom_size
             return 1100  # hardcoded size because size requests take a disproportionate amount of time
         self._fs.open(self._path)
@@ -0,0 +1,267 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+from fsspec import AbstractFileSystem
+from fsspec.spec import AbstractBufferedFile
+
+from dagshub.auth.token_auth import HTTPBearerAuth
+from dagshub.common import config
+from dagshub.common.api.repo import PathNotFoundError, RepoAPI
+from dagshub.common.api.responses import ContentAPIEntry
+from dagshub.common.download import read_response_range
+
+logger = logging.getLogger(__name__)
+
+STORAGE_PREFIX = ".dagshub/storage/"
+
+
+@dataclass(frozen=True)
+class DagsHubFsspecPath:
+    """
+    Parsed ``owner/repo[@revision][/path]`` path
+    """
+
+    repo: str
+    revision: Optional[str]
+    path: str
+
+    @property
+    def root(self) -> str:
+        return self.repo if self.revision is None else f"{self.repo}@{self.revision}"
+
+    @property
+    def is_storage_path(self) -> bool:
+        return self.path.startswith(STORAGE_PREFIX)
+
+    @property
+    def storage_path(self) -> str:
+        """
+        Path in the format of ``<scheme>/<bucket-name>/<path>``, that the storage APIs take
+        """
+        return self.path[len(STORAGE_PREFIX) :]
+
+    def child(self, name: str) -> str:
+        return f"{self.root}/{self.path}/{name}" if self.path else f"{self.root}/{name}"
+
+
+class DagsHubFsspecFileSystem(AbstractFileSystem):
+    """
+    `fsspec <https://filesystem-spec.readthedocs.io>`_ filesystem of DagsHub repositories,
+    for reading repository files with pandas, pyarrow, dask and anything else that reads through fsspec.
+
+    Paths have the format of ``dagshub://<owner>/<repo>[@<revision>]/<path>``,
+    for example ``dagshub://user/repo@main/data/train.parquet``. Without a revision, the default branch is used.
+    Files in connected storage buckets are under ``.dagshub/storage/<scheme>/<bucket>/``,
+    same as in :class:`~dagshub.streaming.DagsHubFilesystem`.
+
+    Reads of a part of a file only download that part, with a range request.
+    Opened files download their content in blocks, with the fsspec cache given by ``cache_type``
+    (``"readahead"`` by default, ``"blockcache"``, ``"bytes"`` and the other fsspec caches work too),
+    so e.g. reading a few columns of a parquet file only downloads the row groups of those columns.
+    Reading many files or ranges at once (``cat()``, ``cat_ranges()``) sends the requests concurrently.
+
+    Requires the fsspec extra: ``pip install dagshub[fsspec]``.
+
+    Args:
+        host: URL of the DagsHub instance. Default is the configured host
+        token: DagsHub token to authenticate with. Default is the token the client is logged in with
+        max_workers: Maximum number of concurrent requests of batched reads.
+            Default is the config value of download_threads (32)
+    """
+
+    protocol = "dagshub"
+    root_marker = ""
+
+    def __init__(
+        self, host: Optional[str] = None, token: Optional[str] = None, max_workers: Optional[int] = None, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.host = host or config.host
+        self.token = token
+        self.max_workers = max_workers or config.download_threads
+        self._repo_apis: Dict[str, RepoAPI] = {}
+        self._repo_apis_lock = threading.Lock()
+
+    @classmethod
+    def _strip_protocol(cls, path) -> str:
+        if isinstance(path, list):
+            return [cls._strip_protocol(p) for p in path]
+        path = super()._strip_protocol(path)
+        return path.strip("/")
+
+    @staticmethod
+    def _parse_path(path: str) -> DagsHubFsspecPath:
+        parts = DagsHubFsspecFileSystem._strip_protocol(path).split("/", 2)
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            raise ValueError(f"Path {path} isn't in the format of dagshub://<owner>/<repo>[@<revision>]/<path>")
+        repo_name, _, revision = parts[1].partition("@")
+        return DagsHubFsspecPath(
+            repo=f"{parts[0]}/{repo_name}",
+            revision=revision or None,
+            path=parts[2] if len(parts) > 2 else "",
+        )
+
+    def _repo_api(self, repo: str) -> RepoAPI:
+        with self._repo_apis_lock:
+            if repo not in self._repo_apis:
+                auth = HTTPBearerAuth(self.token) if self.token is not None else None
+                self._repo_apis[repo] = RepoAPI(repo, host=self.host, auth=auth)
+            return self._repo_apis[repo]
+
+    def _raw_url(self, path: DagsHubFsspecPath) -> str:
+        api = self._repo_api(path.repo)
+        if path.is_storage_path:
+            return api.storage_raw_api_url(path.storage_path)
+        return api.raw_api_url(path.path, path.revision)
+
+    def ls(self, path, detail=True, **kwargs):
+        parsed = self._parse_path(path)
+        key = self._strip_protocol(path)
+        entries = self._ls_from_cache(key)
+        if entries is None:
+            api = self._repo_api(parsed.repo)
+            try:
+                if parsed.is_storage_path:
+                    listing = api.list_storage_path(parsed.storage_path, include_size=True)
+                else:
+                    listing = api.list_path(parsed.path, parsed.revision, include_size=True)
+            except PathNotFoundError:
+                raise FileNotFoundError(path)
+            entries = [self._entry_info(parsed, entry) for entry in listing if entry.type != "storage"]
+            if len(entries) == 1 and entries[0]["type"] == "file" and entries[0]["name"] == key:
+                # Listing a file returns the file itself, don't cache it as a directory
+                return entries if detail else [e["name"] for e in entries]
+            self.dircache[key] = entries
+        if detail:
+            return entries
+        return [e["name"] for e in entries]
+
+    def info(self, path, **kwargs):
+        parsed = self._parse_path(path)
+        if not parsed.path:
+            # Root of the repository - there's no parent to list
+            return {"name": parsed.root, "size": 0, "type": "directory"}
+        return super().info(path, **kwargs)
+
+    def _entry_info(self, parent: DagsHubFsspecPath, entry: ContentAPIEntry) -> Dict[str, Any]:
+        name = PurePosixPath(entry.path).name
+        listed_path = parent.storage_path if parent.is_storage_path else parent.path
+        if listed_path and PurePosixPath(entry.path).as_posix() == listed_path:
+            # Listing of a file
+            full_name = f"{parent.root}/{parent.path}"
+        else:
+            full_name = parent.child(name)
+        return {
+            "name": full_name,
+            "size": entry.size if entry.type == "file" else 0,
+            "type": "file" if entry.type == "file" else "directory",
+            "hash": entry.hash,
+        }
+
+    def _open(
+        self,
+        path,
+        mode="rb",
+        block_size=None,
+        autocommit=True,
+        cache_options=None,
+        cache_type="readahead",
+        **kwargs,
+    ):
+        if mode != "rb":
+            raise NotImplementedError("DagsHub fsspec filesystem is read-only")
+        return DagsHubFsspecFile(
+            self,
+            path,
+            mode=mode,
+            block_size=block_size or "default",
+            cache_type=cache_type,
+            cache_options=cache_options,
+            **kwargs,
+        )
+
+    def cat_file(self, path, start=None, end=None, **kwargs) -> bytes:
+        """
+        Returns the bytes of the file from ``start`` to ``end`` (exclusive), with a range request.
+        Negative offsets are counted from the end of the file.
+        """
+        parsed = self._parse_path(path)
+        if (start is not None and start < 0) or (end is not None and end < 0):
+            size = self.size(path)
+            start = size + start if start is not None and start < 0 else start
+            end = size + end if end is not None and end < 0 else end
+        start = start or 0
+        if end is not None and end <= start:
+            return b""
+        headers = {}
+        if start > 0 or end is not None:
+            headers["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        api = self._repo_api(parsed.repo)
+        with api._http_stream("GET", self._raw_url(parsed), headers=headers, timeout=None) as resp:
+            if resp.status_code == 404:
+                raise FileNotFoundError(path)
+            elif resp.status_code == 416:
+                # Range starts after the end of the file
+                return b""
+            elif resp.status_code >= 400:
+                raise RuntimeError(f"Got status code {resp.status_code} while reading {path}")
+            if resp.status_code == 200 and headers:
+                # Server ignored the range, keep only the range and stop reading after its end
+                return read_response_range(resp, start, None if end is None else end - 1)
+            return resp.read()
+
+    def cat(self, path, recursive=False, on_error="raise", **kwargs):
+        """
+        Returns the contents of the files. Multiple files are downloaded concurrently
+        """
+        paths = self.expand_path(path, recursive=recursive)
+        if len(paths) == 1 and not (isinstance(path, list) or paths[0] != self._strip_protocol(path)):
+            return self.cat_file(paths[0], **kwargs)
+        results = self._run_concurrently([(self.cat_file, (p,), kwargs) for p in paths], on_error)
+        return {p: r for p, r in zip(paths, results) if on_error != "omit" or not isinstance(r, Exception)}
+
+    def cat_ranges(self, paths, starts, ends, max_gap=None, on_error="return", **kwargs):
+        """
+        Returns the byte ranges of the files. The ranges are downloaded concurrently
+        """
+        if max_gap is not None:
+            raise NotImplementedError("max_gap isn't supported")
+        if not isinstance(paths, list):
+            raise TypeError("paths must be a list")
+        if not isinstance(starts, list):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, list):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError("paths, starts and ends must have the same length")
+        calls = [(self.cat_file, (p, s, e), kwargs) for p, s, e in zip(paths, starts, ends)]
+        return self._run_concurrently(calls, on_error)
+
+    def _run_concurrently(self, calls: List[Tuple[Any, tuple, dict]], on_error: str) -> List[Any]:
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(calls), 1))) as tp:
+            futures = [tp.submit(fn, *args, **kwargs) for fn, args, kwargs in calls]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if on_error == "raise":
+                        raise
+                    results.append(e)
+        return results
+
+    def ukey(self, path):
+        return self.info(path).get("hash") or super().ukey(path)
+
+
+class DagsHubFsspecFile(AbstractBufferedFile):
+    """
+    Read-only file of :class:`DagsHubFsspecFileSystem`, that downloads its content in ranges
+    """
+
+    def _fetch_range(self, start, end):
+        return self.fs.cat_file(self.path, start, end)
@@ -0,0 +1,103 @@
+import dataclasses
+import json
+import logging
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from dagshub.common import config
+from dagshub.common.api.responses import ContentAPIEntry
+from dagshub.common.sqlite_db import SqliteDatabase
+
+logger = logging.getLogger(__name__)
+
+_full_sha_regex = re.compile(r"^[a-f0-9]{40}$")
+
+
+class PersistentListingCache:
+    """
+    On-disk cache of the content API directory listings of repositories.
+
+    Listings are keyed by the commit SHA, so they never go stale and can be shared between processes:
+    a new process that works on an already seen commit doesn't need to list the directories again.
+
+    Only listings of full commit SHAs are stored.
+    Branch names and connected storage buckets can change, so those aren't cacheable.
+    """
+
+    _schema = """
+    CREATE TABLE IF NOT EXISTS listings (
+        repo TEXT NOT NULL,
+        revision TEXT NOT NULL,
+        path TEXT NOT NULL,
+        include_size INTEGER NOT NULL,
+        entries TEXT NOT NULL,
+        PRIMARY KEY (repo, revision, path, include_size)
+    );
+    """
+
+    def __init__(self, location: str):
+        self.db = SqliteDatabase(location, self._schema)
+
+    @staticmethod
+    def is_cacheable_revision(revision: str) -> bool:
+        return _full_sha_regex.match(revision) is not None
+
+    def get(self, repo: str, revision: str, path: str, include_size: bool) -> Optional[List[ContentAPIEntry]]:
+        """
+        Returns the cached listing of the path, or None if it's not cached.
+        A listing with sizes satisfies a request without sizes, but not the other way around.
+        """
+        if not self.is_cacheable_revision(revision):
+            return None
+        try:
+            rows = self.db.execute(
+                "SELECT entries FROM listings WHERE repo = ? AND revision = ? AND path = ? AND include_size >= ? "
+                "ORDER BY include_size DESC LIMIT 1",
+                (repo, revision, path, int(include_size)),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Couldn't read from the listing cache: {e}")
+            return None
+        if not rows:
+            return None
+        return [ContentAPIEntry(**entry) for entry in json.loads(rows[0][0])]
+
+    def put(self, repo: str, revision: str, path: str, include_size: bool, entries: List[ContentAPIEntry]):
+        self.put_many(repo, revision, {path: entries}, include_size)
+
+    def put_many(self, repo: str, revision: str, listings: Dict[str, List[ContentAPIEntry]], include_size: bool):
+        """
+        Stores listings of multiple paths in a single transaction
+        """
+        if not self.is_cacheable_revision(revision):
+            return
+        rows = [
+            (repo, revision, path, int(include_size), json.dumps([dataclasses.asdict(e) for e in entries]))
+            for path, entries in listings.items()
+        ]
+        try:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO listings (repo, revision, path, include_size, entries) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Couldn't write to the listing cache: {e}")
+
+
+_caches: Dict[str, PersistentListingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_listing_cache() -> Optional[PersistentListingCache]:
+    """
+    Returns the listing cache at the configured location, or None if the cache is disabled
+    """
+    if config.disable_streaming_listing_cache:
+        return None
+    location = config.streaming_listing_cache_location
+    with _caches_lock:
+        if location not in _caches:
+            _caches[location] = PersistentListingCache(location)
+        return _caches[location]
@@ -3,14 +3,17 @@ import logging
 import os
 import platform
 import sys
+import threading
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from os import PathLike
-from pathlib import Path
-from threading import Lock
-from typing import Optional
-from dagshub.common import rich_console
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional, Set
+from dagshub.common import config, rich_console
+from dagshub.common.download import read_response_range
 
-from .filesystem import SPECIAL_FILE, DagsHubFilesystem
+from .filesystem import SPECIAL_FILE, DagsHubFilesystem, dagshub_stat_result
+from .sparse_file import SparseFile
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,7 @@ class DagsHubFUSE(LoggingMixIn, Operations):
         username: Optional[str] = None,
         password: Optional[str] = None,
         token: Optional[str] = None,
+        block_reads: Optional[bool] = None,
     ):
         # FIXME TODO move autoconfiguration out of FUSE object constructor and to main method
         self.fs = DagsHubFilesystem(
@@ -47,7 +51,19 @@ class DagsHubFUSE(LoggingMixIn, Operations):
             token=token,
         )
         logger.debug("__init__")
-        self.rwlock = Lock()
+        # Opened before mounting, so the files cached in the project root stay reachable after the mount hides them
+        self.project_root_fd = os.open(self.fs.project_root, os.O_RDONLY)
+
+        # Block reads: files that aren't downloaded yet are read block by block, see SparseFile
+        self.block_reads = config.fuse_block_reads if block_reads is None else block_reads
+        self._sparse_lock = threading.Lock()
+        self._sparse_files: Dict[PurePosixPath, SparseFile] = {}
+        self._sparse_refs: Dict[PurePosixPath, int] = {}
+        # File handle -> sparse file it reads
+        self._sparse_handles: Dict[int, SparseFile] = {}
+        # Files whose server ignored range requests, they get downloaded whole instead
+        self._ranges_unsupported: Set[str] = set()
+        self._readahead_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dagshub-readahead")
 
     def __call__(self, op, path, *args):
         return super(DagsHubFUSE, self).__call__(op, self.fs.project_root / path[1:], *args)
@@ -106,12 +122,96 @@ class DagsHubFUSE(LoggingMixIn, Operations):
         logger.debug(f"open - path: {path}, flags: {flags}")
         if path == Path(self.fs.project_root / SPECIAL_FILE):
             return SPECIAL_FILE_FH
+        if self.block_reads and flags & os.O_ACCMODE == os.O_RDONLY:
+            fh = self._open_block_reads(path, flags)
+            if fh is not None:
+                return fh
         try:
             self.fs.open(path).close()
         except FileNotFoundError:
             raise FuseOSError(errno.ENOENT)
         logger.debug("finished fs.open")
-        return os.open(self.fs._relative_path(path), flags, dir_fd=self.fs.project_root_fd)
+        return os.open(Path(path).relative_to(self.fs.project_root), flags, dir_fd=self.project_root_fd)
+
+    def _open_block_reads(self, path, flags) -> Optional[int]:
+        """
+        Opens a file that isn't downloaded yet for block reads.
+        Returns None if the file should be opened regularly instead.
+        """
+        parsed_path = self.fs._parse_path(path)
+        if not parsed_path.is_in_repo or parsed_path.is_passthrough_path:
+            return None
+        relative_path = PurePosixPath(parsed_path.relative_path.as_posix())
+        if self.fs.prefetcher is not None:
+            # Wait for the file if it's being prefetched, and prefetch the ones that come next
+            self.fs.prefetcher.on_access(relative_path.as_posix())
+        with self._sparse_lock:
+            sparse = self._sparse_files.get(relative_path)
+            if sparse is not None:
+                return self._add_sparse_handle(sparse)
+        try:
+            # Already downloaded
+            return os.open(relative_path, flags, dir_fd=self.project_root_fd)
+        except FileNotFoundError:
+            pass
+        # Can make a request, so it's done without holding the lock
+        entry = self.fs._remote_file_entry(parsed_path, include_size=True)
+        if entry is None:
+            raise FuseOSError(errno.ENOENT)
+        url = self.fs._raw_url_for_path(parsed_path)
+        if url in self._ranges_unsupported:
+            return None
+        revision = "" if parsed_path.is_storage_path else self.fs._current_revision
+        with self._sparse_lock:
+            sparse = self._sparse_files.get(relative_path)
+            if sparse is None:
+                try:
+                    # Completed by another handle in the meantime
+                    return os.open(relative_path, flags, dir_fd=self.project_root_fd)
+                except FileNotFoundError:
+                    pass
+                sparse = SparseFile(
+                    lambda start, end: self._fetch_range(url, start, end),
+                    entry.size,
+                    relative_path,
+                    dir_fd=self.project_root_fd,
+                    readahead_executor=self._readahead_executor,
+                    version=f"{revision}:{entry.hash}",
+                )
+                self._sparse_files[relative_path] = sparse
+                self._sparse_refs[relative_path] = 0
+            return self._add_sparse_handle(sparse)
+
+    def _add_sparse_handle(self, sparse: SparseFile) -> int:
+        """
+        Opens a new file handle of the sparse file. Needs to be called with the lock held
+        """
+        self._sparse_refs[sparse.path] += 1
+        fh = os.dup(sparse.fd)
+        self._sparse_handles[fh] = sparse
+        return fh
+
+    def _fetch_range(self, url: str, start: int, end: int) -> bytes:
+        headers = {**config.requests_headers, "Range": f"bytes={start}-{end}"}
+        with self.fs.http_stream(url, headers=headers, timeout=None) as resp:
+            if resp.status_code == 206:
+                return resp.read()
+            elif resp.status_code == 200:
+                # Server ignored the range. Later opens of the file download it whole,
+                # this one reads only up to the end of the range out of the response
+                self._ranges_unsupported.add(url)
+                return read_response_range(resp, start, end)
+        logger.warning(f"Got status code {resp.status_code} while reading bytes {start}-{end} of {url}")
+        raise FuseOSError(errno.EIO)
+
+    def _release_block_reads(self, fh: int):
+        with self._sparse_lock:
+            sparse = self._sparse_handles.pop(fh)
+            self._sparse_refs[sparse.path] -= 1
+            if self._sparse_refs[sparse.path] == 0:
+                del self._sparse_refs[sparse.path]
+                del self._sparse_files[sparse.path]
+                sparse.close()
 
     def getattr(self, path, fd=None):
         """
@@ -139,6 +239,13 @@ class DagsHubFUSE(LoggingMixIn, Operations):
                 st = self.fs.stat(path)
 
             logger.debug(f"st: {st}")
+            if self.block_reads and isinstance(st, dagshub_stat_result):
+                # Remote file - the size needs to be exact for the kernel to read it block by block
+                parsed_path = self.fs._parse_path(path)
+                sparse = self._sparse_files.get(PurePosixPath(parsed_path.relative_path.as_posix()))
+                size = sparse.size if sparse is not None else self.fs._remote_file_size(parsed_path)
+                if size is not None:
+                    st._custom_size = size
             return {
                 key: getattr(st, key)
                 for key in (
@@ -174,9 +281,12 @@ class DagsHubFUSE(LoggingMixIn, Operations):
         logger.debug(f"read - path: {path}, offset: {offset}, fh: {fh}")
         if fh == SPECIAL_FILE_FH:
             return self.fs._special_file()[offset : offset + size]
-        with self.rwlock:
-            os.lseek(fh, offset, 0)
-            return os.read(fh, size)
+        sparse = self._sparse_handles.get(fh)
+        if sparse is not None:
+            return sparse.read(size, offset)
+        # Positional read doesn't touch the offset of the file descriptor,
+        # so concurrent reads (even of the same file handle) don't need to be serialized
+        return os.pread(fh, size, offset)
 
     def readdir(self, path, fh):
         """
@@ -217,8 +327,11 @@ class DagsHubFUSE(LoggingMixIn, Operations):
             ```
         """
         logger.debug(f"release - path: {path}, fh: {fh}")
-        if fh != SPECIAL_FILE_FH:
-            return os.close(fh)
+        if fh == SPECIAL_FILE_FH:
+            return
+        if fh in self._sparse_handles:
+            self._release_block_reads(fh)
+        return os.close(fh)
 
 
 def mount(
@@ -229,6 +342,7 @@ def mount(
     username: Optional[str] = None,
     password: Optional[str] = None,
     token: Optional[str] = None,
+    block_reads: Optional[bool] = None,
 ):
     """
     Mount a DagsHubFUSE filesystem.
@@ -243,6 +357,9 @@ def mount(
         username (Optional[str], optional): The username for authentication. Defaults to None.
         password (Optional[str], optional): The password for authentication. Defaults to None.
         token (Optional[str], optional): The token for authentication. Defaults to None.
+        block_reads (Optional[bool], optional): If True, files are downloaded block by block as they're read,
+            instead of being downloaded completely when they're opened.
+            Defaults to the config value of fuse_block_reads (True).
 
     Notes:
         - If the 'debug' parameter is True, the filesystem is run in the foreground with debug logging.
@@ -255,13 +372,20 @@ def mount(
     """
     logging.basicConfig(level=logging.DEBUG)
     fuse = DagsHubFUSE(
-        project_root=project_root, repo_url=repo_url, branch=branch, username=username, password=password, token=token
+        project_root=project_root,
+        repo_url=repo_url,
+        branch=branch,
+        username=username,
+        password=password,
+        token=token,
+        block_reads=block_reads,
     )
     rich_console.print(
         f"Mounting DagsHubFUSE filesystem at {fuse.fs.project_root}\n"
         f"Run `cd .` in any existing terminals to utilize mounted FS."
     )
-    FUSE(fuse, str(fuse.fs.project_root), foreground=debug, nonempty=True)
+    # Every operation is handled on its own thread, reads of different files don't wait for each other
+    FUSE(fuse, str(fuse.fs.project_root), foreground=debug, nonempty=True, nothreads=False)
     if not debug:
         os.chdir(os.path.realpath(os.curdir))
     # TODO: Clean unmounting procedure
@@ -275,6 +399,7 @@ def main():
     parser.add_argument("--username")
     parser.add_argument("--password")
     parser.add_argument("--debug", action="store_true", default=False)  # default=False, nargs=0)
+    parser.add_argument("--no-block-reads", dest="block_reads", action="store_false", default=None)
 
     args = parser.parse_args()
 
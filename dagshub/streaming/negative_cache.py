@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import PurePosixPath
+from typing import Optional, Tuple
+
+from dagshub.common import config
+from dagshub.streaming.listing_cache import PersistentListingCache
+
+_Key = Tuple[str, str, str]
+
+
+@dataclass
+class NegativeLookupStats:
+    """
+    Counters of a :class:`NegativeLookupCache`
+    """
+
+    hits: int = 0
+    """Lookups answered by the cache - each one is a request to DagsHub that didn't need to be made"""
+    misses: int = 0
+    """Lookups of paths that aren't known to be missing"""
+    added: int = 0
+    """Paths recorded as missing"""
+    expired: int = 0
+    """Entries that were dropped because their TTL ran out"""
+
+
+class NegativeLookupCache:
+    """
+    In-memory cache of paths that are known not to exist on DagsHub,
+    so repeated lookups of them (e.g. frameworks probing for their cache files) don't go to the server.
+
+    Entries are keyed by the repository and the revision. Content of a full commit SHA never changes,
+    so entries of full SHAs never expire. All other entries (short SHAs, connected storage buckets)
+    expire after ``ttl`` seconds.
+
+    A missing directory also answers lookups of all paths under it.
+
+    Args:
+        ttl: Time in seconds after which the entries of revisions that can change expire.
+            ``0`` turns caching of those revisions off
+        max_entries: Maximum number of entries, least recently used entries get dropped after that
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Value is the time when the entry expires, None - never expires
+        self._entries: "OrderedDict[_Key, Optional[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = NegativeLookupStats()
+
+    @property
+    def stats(self) -> NegativeLookupStats:
+        """
+        Snapshot of the cache's counters
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def is_missing(self, repo: str, revision: str, path: str) -> bool:
+        """
+        Returns True if the path, or one of its parent directories, is known to be missing
+        """
+        now = time.monotonic()
+        with self._lock:
+            for candidate in self._with_parents(path):
+                key = (repo, revision, candidate)
+                if key not in self._entries:
+                    continue
+                expiry = self._entries[key]
+                if expiry is not None and expiry <= now:
+                    del self._entries[key]
+                    self._stats.expired += 1
+                    continue
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return True
+            self._stats.misses += 1
+            return False
+
+    def add(self, repo: str, revision: str, path: str):
+        """
+        Records that the path doesn't exist in the revision
+        """
+        if PersistentListingCache.is_cacheable_revision(revision):
+            expiry = None
+        elif self.ttl > 0:
+            expiry = time.monotonic() + self.ttl
+        else:
+            return
+        with self._lock:
+            key = (repo, revision, path)
+            self._entries[key] = expiry
+            self._entries.move_to_end(key)
+            self._stats.added += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, repo: str, revision: str, path: str):
+        with self._lock:
+            self._entries.pop((repo, revision, path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _with_parents(path: str):
+        yield path
+        for parent in PurePosixPath(path).parents:
+            if parent == PurePosixPath("."):
+                break
+            yield parent.as_posix()
+
+
+_cache: Optional[NegativeLookupCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_negative_lookup_cache() -> Optional[NegativeLookupCache]:
+    """
+    Returns the negative lookup cache shared by all filesystems, or None if the cache is disabled
+    """
+    global _cache
+    if config.disable_negative_lookup_cache:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = NegativeLookupCache(config.negative_lookup_cache_ttl, config.negative_lookup_cache_max_entries)
+        return _cache
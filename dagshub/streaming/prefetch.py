@@ -0,0 +1,361 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from dagshub.common import config
+
+if TYPE_CHECKING:
+    from dagshub.streaming.filesystem import DagsHubFilesystem
+
+logger = logging.getLogger(__name__)
+
+FetchFn = Callable[[Hashable], Optional[int]]
+"""
+Function that downloads the item with the key, and returns the size it takes on the disk
+"""
+
+
+@dataclass
+class PrefetchStats:
+    """
+    Counters of a :class:`PrefetchEngine`
+    """
+
+    hits: int = 0
+    """Accesses of items that were prefetched (including items that were still being downloaded)"""
+    late_hits: int = 0
+    """Hits that had to wait for the prefetch of the item to finish"""
+    misses: int = 0
+    """Accesses of items that weren't prefetched and weren't present locally"""
+    prefetched: int = 0
+    """Items downloaded by the engine"""
+    failed: int = 0
+    """Prefetches that failed"""
+    skipped: int = 0
+    """Prefetches that weren't started, because the disk budget was used up"""
+    expired: int = 0
+    """Prefetched items that weren't accessed in time, and stopped counting against the disk budget"""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PrefetchPolicy:
+    """
+    Decides which items to prefetch after an item gets accessed
+    """
+
+    def next_keys(self, key: Hashable) -> Sequence[Hashable]:
+        """
+        Returns the keys of the items that are likely to be accessed after the item with the key,
+        most likely first
+        """
+        raise NotImplementedError
+
+
+class SequencePrefetchPolicy(PrefetchPolicy):
+    """
+    Prefetches the items that follow the accessed item in a known access order, for example a sampler's permutation.
+
+    Args:
+        order: The order, or a function returning the current order (the order can change between epochs)
+        lookahead: Number of items to prefetch after the accessed item.
+            Default is the config value of prefetch_lookahead (8)
+    """
+
+    def __init__(
+        self,
+        order: Union[Sequence[Hashable], Callable[[], Optional[Sequence[Hashable]]]],
+        lookahead: Optional[int] = None,
+    ):
+        self.order = order
+        self.lookahead = lookahead if lookahead is not None else config.prefetch_lookahead
+        self._order: Optional[Sequence[Hashable]] = None
+        self._positions: Dict[Hashable, int] = {}
+
+    def next_keys(self, key: Hashable) -> Sequence[Hashable]:
+        order = self.order() if callable(self.order) else self.order
+        if order is None:
+            return []
+        if order is not self._order:
+            self._positions = {k: i for i, k in reversed(list(enumerate(order)))}
+            self._order = order
+        pos = self._positions.get(key)
+        if pos is None:
+            return []
+        return order[pos + 1 : pos + 1 + self.lookahead]
+
+
+class SiblingPrefetchPolicy(PrefetchPolicy):
+    """
+    Prefetches the files that come after the accessed file in its directory, in the order of their names.
+
+    The access never waits for a listing of the directory: if the listing isn't cached yet,
+    it's requested in the background, and the siblings get prefetched once it arrives.
+
+    Args:
+        fs: Filesystem of the files. The keys are paths relative to its project root
+        lookahead: Number of files to prefetch after the accessed file.
+            Default is the config value of prefetch_lookahead (8)
+    """
+
+    def __init__(self, fs: "DagsHubFilesystem", lookahead: Optional[int] = None):
+        self.fs = fs
+        self.lookahead = lookahead if lookahead is not None else config.prefetch_lookahead
+        self._siblings: Dict[PurePosixPath, Tuple[List[str], Dict[str, int]]] = {}
+        # Directories that are being listed in the background
+        self._listing: Set[PurePosixPath] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _sorted_siblings(self, parent: PurePosixPath) -> Optional[Tuple[List[str], Dict[str, int]]]:
+        """
+        Returns the sorted names of the files in the directory, only if the listing of the directory is cached
+        """
+        with self._lock:
+            res = self._siblings.get(parent)
+        if res is not None:
+            return res
+        contents, hit = self.fs._check_listing_caches(self._parse(parent), include_size=False)
+        if not hit:
+            return None
+        return self._add_siblings(parent, contents)
+
+    def _parse(self, parent: PurePosixPath):
+        return self.fs._parse_path(self.fs.project_root / parent)
+
+    def _add_siblings(self, parent: PurePosixPath, contents) -> Tuple[List[str], Dict[str, int]]:
+        names = sorted(PurePosixPath(entry.path).name for entry in contents or [] if entry.type == "file")
+        res = names, {name: i for i, name in enumerate(names)}
+        with self._lock:
+            self._siblings[parent] = res
+        return res
+
+    def _list_in_background(self, key: Hashable):
+        parent = PurePosixPath(key).parent
+        with self._lock:
+            if parent in self._listing:
+                return
+            self._listing.add(parent)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dagshub-prefetch-listing")
+        self._executor.submit(self._list_siblings, key)
+
+    def _list_siblings(self, key: Hashable):
+        parent = PurePosixPath(key).parent
+        try:
+            self._add_siblings(parent, self.fs._api_listdir(self._parse(parent)))
+        except Exception as e:
+            logger.debug(f"Listing {parent} for prefetching failed: {e}")
+            return
+        finally:
+            with self._lock:
+                self._listing.discard(parent)
+        engine = self.fs.prefetcher
+        if engine is not None:
+            engine.hint(*self.next_keys(key))
+
+    def next_keys(self, key: Hashable) -> Sequence[Hashable]:
+        path = PurePosixPath(key)
+        siblings = self._sorted_siblings(path.parent)
+        if siblings is None:
+            self._list_in_background(key)
+            return []
+        names, positions = siblings
+        pos = positions.get(path.name)
+        if pos is None:
+            return []
+        return [(path.parent / name).as_posix() for name in names[pos + 1 : pos + 1 + self.lookahead]]
+
+
+class PrefetchEngine:
+    """
+    Downloads items ahead of their access on a background pool, according to the prefetch policies.
+
+    Every access is reported to the engine with :func:`on_access`. If the item is being prefetched,
+    the access waits for the prefetch instead of downloading the item again.
+    Then the policies are asked which items come next, and the ones that aren't present yet get prefetched.
+    Items can also be prefetched explicitly with :func:`hint`.
+
+    The engine stays within a budget:
+
+    - Disk: prefetched items that weren't accessed yet take at most ``disk_budget`` bytes.
+      Once the budget is used up, no new prefetches are started until the prefetched items get accessed.
+      Prefetched items that weren't accessed within ``ready_ttl`` accesses (e.g. items that another dataloader
+      worker read, or wrong guesses of a policy) stop counting against the budget, so they can't use it up for good.
+    - Memory: at most ``max_in_flight`` prefetches are queued or running at the same time.
+      Downloads are streamed to the disk, so this bounds the memory that the prefetches take.
+
+    When the engine gets pickled (e.g. sent to a dataloader worker process), the copy starts out empty.
+
+    Args:
+        fetch: Function that downloads an item and returns its size on the disk
+        policies: Policies that decide what to prefetch
+        is_present: Function that checks whether the item is already present locally.
+            If None, all items that aren't prefetched are considered missing
+        max_workers: Number of download threads. Default is the config value of prefetch_threads (4)
+        max_in_flight: Maximum number of queued and running prefetches. Default is twice ``max_workers``
+        disk_budget: Maximum total size of prefetched items that weren't accessed yet.
+            Default is the config value of prefetch_disk_budget (1 GiB)
+        ready_ttl: Number of accesses after which a prefetched item that wasn't accessed stops counting
+            against the disk budget. Default is twice the largest lookahead of the policies,
+            or twice the config value of prefetch_lookahead (8) if the policies don't have a lookahead
+    """
+
+    def __init__(
+        self,
+        fetch: FetchFn,
+        policies: Iterable[PrefetchPolicy] = (),
+        is_present: Optional[Callable[[Hashable], bool]] = None,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        disk_budget: Optional[int] = None,
+        ready_ttl: Optional[int] = None,
+    ):
+        self.fetch = fetch
+        self.policies = list(policies)
+        self.is_present = is_present
+        self.max_workers = max_workers or config.prefetch_threads
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.disk_budget = disk_budget if disk_budget is not None else config.prefetch_disk_budget
+        if ready_ttl is None:
+            lookaheads = [policy.lookahead for policy in self.policies if hasattr(policy, "lookahead")]
+            ready_ttl = 2 * max(lookaheads, default=config.prefetch_lookahead)
+        self.ready_ttl = ready_ttl
+        self._init_state()
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[Hashable, Future] = {}
+        # Prefetched items that weren't accessed yet, with their sizes and the access count when they were ready.
+        # The items are in the order they got ready, so the oldest ones are first
+        self._ready: Dict[Hashable, Tuple[int, int]] = {}
+        self._pending_bytes = 0
+        self._accesses = 0
+        self._stats = PrefetchStats()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ("_lock", "_executor", "_in_flight", "_ready", "_pending_bytes", "_accesses", "_stats"):
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    @property
+    def stats(self) -> PrefetchStats:
+        """
+        Snapshot of the engine's counters
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def on_access(self, key: Hashable):
+        """
+        Reports an access of the item. Waits for the item's prefetch if it's running, and schedules the next prefetches.
+        """
+        with self._lock:
+            self._accesses += 1
+            future = self._in_flight.pop(key, None)
+            hit = future is not None or key in self._ready
+            if hit:
+                self._stats.hits += 1
+                if future is not None:
+                    self._stats.late_hits += 1
+                size, _ = self._ready.pop(key, (0, 0))
+                self._pending_bytes -= size
+            self._expire_ready()
+        if future is not None:
+            # Errors were already logged by the prefetch, the caller downloads the item itself then
+            wait([future])
+        elif not hit and (self.is_present is None or not self.is_present(key)):
+            with self._lock:
+                self._stats.misses += 1
+
+        next_keys = []
+        for policy in self.policies:
+            try:
+                next_keys.extend(policy.next_keys(key))
+            except Exception as e:
+                logger.debug(f"Prefetch policy {policy} failed for {key}: {e}")
+        self.hint(*next_keys)
+
+    def _expire_ready(self):
+        """
+        Stops counting the prefetched items that weren't accessed in time. Needs to be called with the lock held
+        """
+        while self._ready:
+            key, (size, ready_at) = next(iter(self._ready.items()))
+            if self._accesses - ready_at <= self.ready_ttl:
+                return
+            del self._ready[key]
+            self._pending_bytes -= size
+            self._stats.expired += 1
+
+    def hint(self, *keys: Hashable):
+        """
+        Prefetches the items, in the order they're given, as long as there's room in the budget
+        """
+        for key in keys:
+            with self._lock:
+                if key in self._in_flight or key in self._ready:
+                    continue
+                if len(self._in_flight) >= self.max_in_flight:
+                    return
+                if self._pending_bytes >= self.disk_budget:
+                    self._stats.skipped += 1
+                    return
+            if self.is_present is not None and self.is_present(key):
+                continue
+            with self._lock:
+                if key in self._in_flight or key in self._ready:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="dagshub-prefetch"
+                    )
+                self._in_flight[key] = self._executor.submit(self._prefetch, key)
+
+    def _prefetch(self, key: Hashable):
+        try:
+            size = self.fetch(key) or 0
+        except Exception as e:
+            logger.debug(f"Prefetch of {key} failed: {e}")
+            with self._lock:
+                self._stats.failed += 1
+                self._in_flight.pop(key, None)
+            raise
+        with self._lock:
+            self._stats.prefetched += 1
+            # If the item was accessed while it was being prefetched, it's not in flight anymore
+            if self._in_flight.pop(key, None) is not None:
+                self._ready[key] = (size, self._accesses)
+                self._pending_bytes += size
+
+    def wait(self):
+        """
+        Waits for all queued and running prefetches to finish
+        """
+        with self._lock:
+            futures = list(self._in_flight.values())
+        wait(futures)
+
+    def close(self):
+        """
+        Cancels the queued prefetches and waits for the running ones to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            # Only the cancelled prefetches are left
+            self._in_flight.clear()
@@ -0,0 +1,218 @@
+import builtins
+import logging
+import os
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from dagshub.common import config
+from dagshub.common.helpers import log_message
+from dagshub.common.object_store import ObjectStore, get_file_store
+from dagshub.streaming.filesystem import DagsHubFilesystem, _abspath
+
+logger = logging.getLogger(__name__)
+
+
+class _TrieNode:
+    __slots__ = ("children", "fs")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.fs: Optional[DagsHubFilesystem] = None
+
+
+class FilesystemRouter:
+    """
+    Hooks several repositories, or several revisions of the same repository, into one process.
+
+    Every filesystem of the router is mounted at its own directory.
+    Once the hooks are installed, each patched call (``open()``, ``os.stat()``, ``os.listdir()`` etc.)
+    is dispatched to the filesystem whose directory the path is in,
+    found by a lookup of the path's components in a trie of the mounted directories.
+    Paths outside of all of the directories go straight to the builtin functions.
+
+    All filesystems share the pooled HTTP connections to DagsHub.
+    With ``deduplicate``, they also share an object store that deduplicates the downloaded files by their content:
+    a file that is the same in multiple revisions gets downloaded once, and hardlinked into the other directories.
+    The hardlinked files are read-only, opening one of them for writing through the filesystem
+    replaces it with a private copy first.
+
+    Example::
+
+        router = FilesystemRouter(deduplicate=True)
+        for rev in ["v1", "v2", "v3"]:
+            router.mount(f"data-{rev}", repo_url="https://dagshub.com/user/repo", branch=rev)
+        router.install_hooks()
+
+        for rev in ["v1", "v2", "v3"]:
+            evaluate(model, f"data-{rev}/test")
+
+    Args:
+        deduplicate: Deduplicate the files downloaded by the filesystems by their content.
+            Default is to deduplicate if ``object_store`` is given, or the store is enabled in the config
+            (``DAGSHUB_ENABLE_FILE_STORE``)
+        object_store: Store of the deduplicated files.
+            Default is the store at the config value of file_store_location, same as in the standalone filesystems
+    """
+
+    def __init__(self, deduplicate: Optional[bool] = None, object_store: Optional[ObjectStore] = None):
+        if deduplicate is None:
+            deduplicate = object_store is not None or config.enable_file_store
+        if deduplicate and object_store is None:
+            object_store = get_file_store(force=True)
+        self.object_store = object_store if deduplicate else None
+        self._root = _TrieNode()
+        self._filesystems: Dict[Path, DagsHubFilesystem] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def filesystems(self) -> List[DagsHubFilesystem]:
+        return list(self._filesystems.values())
+
+    def mount(
+        self, project_root: Union[str, PathLike], repo_url: Optional[str] = None, branch: Optional[str] = None, **kwargs
+    ) -> DagsHubFilesystem:
+        """
+        Creates a filesystem of the repository at ``project_root`` and adds it to the router.
+        Keyword arguments are passed to :class:`.DagsHubFilesystem`.
+
+        Returns:
+            The created filesystem
+        """
+        os.makedirs(project_root, exist_ok=True)
+        fs = DagsHubFilesystem(project_root=project_root, repo_url=repo_url, branch=branch, **kwargs)
+        self.add(fs)
+        return fs
+
+    def add(self, fs: DagsHubFilesystem):
+        """
+        Adds an existing filesystem to the router. The filesystem starts using the router's object store
+        """
+        root = Path(os.path.abspath(fs.project_root))
+        with self._lock:
+            node = self._root
+            for part in self._split(str(root)):
+                node = node.children.setdefault(part, _TrieNode())
+            node.fs = fs
+            self._filesystems[root] = fs
+        fs.object_store = self.object_store
+
+    def remove(self, fs: DagsHubFilesystem):
+        """
+        Removes the filesystem from the router. Paths in its directory become regular paths
+        """
+        root = Path(os.path.abspath(fs.project_root))
+        with self._lock:
+            if self._filesystems.get(root) is not fs:
+                return
+            del self._filesystems[root]
+            node = self._root
+            for part in self._split(str(root)):
+                node = node.children[part]
+            node.fs = None
+
+    def resolve(self, path: Union[str, bytes, PathLike, int]) -> Optional[DagsHubFilesystem]:
+        """
+        Returns the filesystem that the path belongs to, or None if it's outside of all the filesystems
+        """
+        if isinstance(path, int):
+            return None
+        str_path = os.fspath(path)
+        if isinstance(str_path, bytes):
+            str_path = os.fsdecode(str_path)
+        if str_path == "":
+            return None
+        node = self._root
+        found = None
+        # Nested filesystems aren't allowed, but the deepest one wins regardless
+        for part in self._split(_abspath(str_path)):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.fs is not None:
+                found = node.fs
+        return found
+
+    @staticmethod
+    def _split(abspath: str) -> List[str]:
+        return abspath.split(os.sep)
+
+    def install_hooks(self):
+        """
+        Patches the builtin file I/O functions with the functions of the router,
+        same as :func:`DagsHubFilesystem.install_hooks() <dagshub.streaming.DagsHubFilesystem.install_hooks>`.
+
+        Call :func:`uninstall_hooks` to undo the monkey patching.
+        """
+        DagsHubFilesystem._patch_builtins(self)
+        mounts = "\n".join(f'  "{fs._api.full_name}" at "{fs.project_root}"' for fs in self.filesystems)
+        log_message(f"Repositories are now hooked:\n{mounts}", logger)
+
+    def uninstall_hooks(self):
+        """
+        Brings back the builtin file I/O functions and cleans up all filesystems of the router
+        """
+        DagsHubFilesystem.uninstall_hooks()
+
+    def cleanup(self):
+        for fs in self.filesystems:
+            fs.cleanup()
+
+    def open(self, file, mode="r", buffering=-1, encoding=None, errors=None, newline=None, closefd=True, opener=None):
+        """
+        :meta private:
+        """
+        fs = self.resolve(file)
+        if fs is None:
+            return _unpatched("open", builtins.open)(file, mode, buffering, encoding, errors, newline, closefd, opener)
+        return fs.open(file, mode, buffering, encoding, errors, newline, closefd, opener)
+
+    def os_open(self, path, flags, mode=0o777, *, dir_fd=None):
+        """
+        :meta private:
+        """
+        fs = self.resolve(path) if dir_fd is None else None
+        if fs is None:
+            return os.open(path, flags, mode, dir_fd=dir_fd)
+        return fs.os_open(path, flags, mode)
+
+    def stat(self, path, *args, dir_fd=None, follow_symlinks=True):
+        """
+        :meta private:
+        """
+        fs = self.resolve(path)
+        if fs is None:
+            return _unpatched("stat", os.stat)(path, *args, dir_fd=dir_fd, follow_symlinks=follow_symlinks)
+        return fs.stat(path, *args, dir_fd=dir_fd, follow_symlinks=follow_symlinks)
+
+    def listdir(self, path="."):
+        """
+        :meta private:
+        """
+        fs = self.resolve(path)
+        if fs is None:
+            return _unpatched("listdir", os.listdir)(path)
+        return fs.listdir(path)
+
+    def scandir(self, path="."):
+        """
+        :meta private:
+        """
+        fs = self.resolve(path)
+        if fs is None:
+            return _unpatched("scandir", os.scandir)(path)
+        return fs.scandir(path)
+
+    def chdir(self, path):
+        """
+        :meta private:
+        """
+        fs = self.resolve(path)
+        if fs is None:
+            return _unpatched("chdir", os.chdir)(path)
+        return fs.chdir(path)
+
+
+def _unpatched(name, alt):
+    return DagsHubFilesystem._DagsHubFilesystem__get_unpatched(name, alt)
@@ -0,0 +1,268 @@
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import Executor
+from pathlib import PurePosixPath
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from dagshub.common import config
+
+logger = logging.getLogger(__name__)
+
+FetchRangeFn = Callable[[int, int], bytes]
+"""
+Function that returns the bytes of the remote file from start to end (both inclusive)
+"""
+
+
+class BlockBitmap:
+    """
+    Bitmap of the blocks of a file that are present locally
+    """
+
+    def __init__(self, num_blocks: int, data: Optional[bytes] = None):
+        self.num_blocks = num_blocks
+        self.data = bytearray(data) if data is not None else bytearray(math.ceil(num_blocks / 8))
+        self.num_present = sum(self.has(i) for i in range(num_blocks)) if data is not None else 0
+
+    def has(self, block: int) -> bool:
+        return bool(self.data[block >> 3] & (1 << (block & 7)))
+
+    def set(self, block: int):
+        if not self.has(block):
+            self.data[block >> 3] |= 1 << (block & 7)
+            self.num_present += 1
+
+    @property
+    def is_complete(self) -> bool:
+        return self.num_present == self.num_blocks
+
+
+def _runs(blocks: List[int]) -> Iterator[Tuple[int, int]]:
+    """
+    Groups sorted block numbers into runs of consecutive blocks (first, last)
+    """
+    start = prev = None
+    for block in blocks:
+        if start is None:
+            start = prev = block
+        elif block == prev + 1:
+            prev = block
+        else:
+            yield start, prev
+            start = prev = block
+    if start is not None:
+        yield start, prev
+
+
+def _makedirs_at(path: PurePosixPath, dir_fd: Optional[int]):
+    current = PurePosixPath()
+    for part in path.parts:
+        current = current / part
+        try:
+            os.mkdir(current, dir_fd=dir_fd)
+        except FileExistsError:
+            pass
+
+
+class SparseFile:
+    """
+    Local copy of a remote file that gets downloaded block by block, only when the blocks are read.
+
+    The blocks are written into a sparse file next to the file's location, and a bitmap of the blocks
+    that are already there is kept beside it, so reopening the file later doesn't fetch those blocks again.
+    The bitmap records the size and the version of the remote file it was made for.
+    If either of them changed since (e.g. a new commit on a branch), the blocks that are there get discarded.
+    Once all blocks are present, the file is moved to its location and becomes a regular local file.
+
+    Missing blocks of a read are fetched with one range request per run of consecutive missing blocks.
+    Concurrent reads of the same blocks wait for one fetch instead of fetching the blocks again.
+    When the reads are sequential, blocks ahead of the reader get prefetched in the background,
+    with the readahead window doubling on every sequential read, up to ``readahead_max``.
+
+    Args:
+        fetch_range: Function that fetches a byte range of the remote file
+        size: Size of the remote file
+        path: Location of the file, relative to ``dir_fd``
+        dir_fd: Descriptor of the directory that ``path`` is relative to. If None, relative to the current directory
+        block_size: Size of a block. Default is the config value of fuse_block_size (1 MiB)
+        readahead_max: Maximum size of the readahead window. Default is the config value of fuse_readahead_max (16 MiB)
+        readahead_executor: Executor to run the readahead on. If None, no readahead is done
+        version: Identifies the content of the remote file, e.g. the revision and the hash of the file
+    """
+
+    def __init__(
+        self,
+        fetch_range: FetchRangeFn,
+        size: int,
+        path: PurePosixPath,
+        dir_fd: Optional[int] = None,
+        block_size: Optional[int] = None,
+        readahead_max: Optional[int] = None,
+        readahead_executor: Optional[Executor] = None,
+        version: Optional[str] = None,
+    ):
+        self.fetch_range = fetch_range
+        self.size = size
+        self.path = PurePosixPath(path)
+        self.dir_fd = dir_fd
+        self.block_size = block_size or config.fuse_block_size
+        self.readahead_max = readahead_max if readahead_max is not None else config.fuse_readahead_max
+        self.readahead_executor = readahead_executor
+        self.version = version
+
+        self.num_blocks = math.ceil(size / self.block_size)
+        self.partial_path = self.path.with_name(f".{self.path.name}.dagshub-sparse")
+        self.bitmap_path = self.path.with_name(f".{self.path.name}.dagshub-blocks")
+
+        _makedirs_at(self.path.parent, dir_fd)
+        self.fd = os.open(self.partial_path, os.O_RDWR | os.O_CREAT, 0o644, dir_fd=dir_fd)
+        bitmap = self._load_bitmap()
+        if bitmap is None:
+            # Blocks of a different version of the file, or no bitmap at all - start over
+            bitmap = BlockBitmap(self.num_blocks)
+            os.ftruncate(self.fd, 0)
+            try:
+                os.remove(self.bitmap_path, dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+        self.bitmap = bitmap
+        if os.fstat(self.fd).st_size != size:
+            os.ftruncate(self.fd, size)
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[int, threading.Event] = {}
+        self._next_sequential_offset: Optional[int] = None
+        self._readahead = 0
+        self._readahead_running = False
+        self.is_complete = False
+        if self.bitmap.is_complete:
+            self._finalize()
+
+    def _bitmap_header(self) -> bytes:
+        header = {"size": self.size, "block_size": self.block_size, "version": self.version}
+        return json.dumps(header).encode() + b"\n"
+
+    def _load_bitmap(self) -> Optional[BlockBitmap]:
+        """
+        Returns the bitmap of the blocks that are present,
+        or None if there's no bitmap for the current size and version of the file
+        """
+        try:
+            fd = os.open(self.bitmap_path, os.O_RDONLY, dir_fd=self.dir_fd)
+        except FileNotFoundError:
+            return None
+        try:
+            data = os.read(fd, len(self._bitmap_header()) + math.ceil(self.num_blocks / 8))
+        finally:
+            os.close(fd)
+        header, _, data = data.partition(b"\n")
+        if header + b"\n" != self._bitmap_header() or len(data) != math.ceil(self.num_blocks / 8):
+            return None
+        return BlockBitmap(self.num_blocks, data)
+
+    def _save_bitmap(self):
+        fd = os.open(self.bitmap_path, os.O_WRONLY | os.O_CREAT, 0o644, dir_fd=self.dir_fd)
+        try:
+            os.pwrite(fd, self._bitmap_header() + bytes(self.bitmap.data), 0)
+        finally:
+            os.close(fd)
+
+    def read(self, size: int, offset: int) -> bytes:
+        """
+        Reads ``size`` bytes at ``offset``, fetching the blocks that aren't present yet
+        """
+        if offset >= self.size or size <= 0:
+            return b""
+        size = min(size, self.size - offset)
+        self.ensure_range(offset, offset + size - 1)
+        self._readahead_after(offset, size)
+        return os.pread(self.fd, size, offset)
+
+    def ensure_range(self, start: int, end: int):
+        """
+        Makes sure that all blocks in the byte range (both inclusive) are present
+        """
+        first, last = start // self.block_size, min(end // self.block_size, self.num_blocks - 1)
+        while True:
+            to_fetch = []
+            to_wait = []
+            with self._lock:
+                for block in range(first, last + 1):
+                    if self.bitmap.has(block):
+                        continue
+                    event = self._in_flight.get(block)
+                    if event is not None:
+                        to_wait.append(event)
+                    else:
+                        self._in_flight[block] = threading.Event()
+                        to_fetch.append(block)
+            if not to_fetch and not to_wait:
+                return
+            try:
+                for run_first, run_last in _runs(to_fetch):
+                    self._fetch_blocks(run_first, run_last)
+            finally:
+                with self._lock:
+                    for block in to_fetch:
+                        self._in_flight.pop(block).set()
+            # If a fetch we were waiting for failed, the next iteration fetches the blocks itself
+            for event in to_wait:
+                event.wait()
+
+    def _fetch_blocks(self, first: int, last: int):
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size) - 1
+        data = self.fetch_range(start, end)
+        if len(data) != end - start + 1:
+            raise IOError(f"Expected {end - start + 1} bytes of {self.path} at offset {start}, got {len(data)}")
+        os.pwrite(self.fd, data, start)
+        with self._lock:
+            for block in range(first, last + 1):
+                self.bitmap.set(block)
+            self._save_bitmap()
+            if self.bitmap.is_complete:
+                self._finalize()
+
+    def _finalize(self):
+        """
+        Moves the fully downloaded file to its location
+        """
+        os.replace(self.partial_path, self.path, src_dir_fd=self.dir_fd, dst_dir_fd=self.dir_fd)
+        try:
+            os.remove(self.bitmap_path, dir_fd=self.dir_fd)
+        except FileNotFoundError:
+            pass
+        self.is_complete = True
+
+    def _readahead_after(self, offset: int, size: int):
+        if self.readahead_executor is None or self.readahead_max <= 0:
+            return
+        with self._lock:
+            if self._next_sequential_offset == offset:
+                self._readahead = min(max(self._readahead * 2, self.block_size), self.readahead_max)
+            else:
+                self._readahead = 0
+            self._next_sequential_offset = offset + size
+            if self._readahead == 0 or self._readahead_running or self.is_complete:
+                return
+            start = offset + size
+            end = min(start + self._readahead, self.size) - 1
+            if start > end:
+                return
+            self._readahead_running = True
+        self.readahead_executor.submit(self._run_readahead, start, end)
+
+    def _run_readahead(self, start: int, end: int):
+        try:
+            self.ensure_range(start, end)
+        except Exception as e:
+            logger.debug(f"Readahead of {self.path} at {start}-{end} failed: {e}")
+        finally:
+            with self._lock:
+                self._readahead_running = False
+
+    def close(self):
+        os.close(self.fd)
@@ -48,6 +48,8 @@ extras_require = {
     "jupyter": ["rich[jupyter]>=13.1.0"],
     "fuse": ["fusepy>=3"],
     "autolabeling": ["ngrok>=1.3.0", "cloudpickle>=3.0.0"],
+    "fsspec": ["fsspec>=2023.1.0"],
+    "arrow": ["pyarrow>=12.0.0"],
 }
 
 packages = setuptools.find_packages(exclude=["tests", "tests.*"])
@@ -71,5 +73,8 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.9",
-    entry_points={"console_scripts": ["dagshub = dagshub.common.cli:cli"]},
+    entry_points={
+        "console_scripts": ["dagshub = dagshub.common.cli:cli"],
+        "fsspec.specs": ["dagshub = dagshub.streaming.fsspec_filesystem:DagsHubFsspecFileSystem"],
+    },
 )
@@ -0,0 +1,288 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from dagshub.common import config
+from dagshub.common.download import atomic_write, download_files, download_files_async, read_response_range
+from tests.util import valid_token_side_effect
+
+
+@pytest.fixture
+def mock_downloads():
+    with respx.mock(using="httpx", assert_all_called=False) as mock:
+        mock.get("https://dagshub.com/api/v1/user").mock(side_effect=valid_token_side_effect)
+        yield mock
+
+
+def test_download_file_streams_content(mock_downloads, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "download_chunk_size", 4)
+    content = b"some content that is longer than one chunk"
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/a.txt"
+    mock_downloads.get(url).mock(httpx.Response(200, content=content))
+
+    location = tmp_path / "nested" / "a.txt"
+    download_files([(url, location)])
+
+    assert location.read_bytes() == content
+    assert [p.name for p in location.parent.iterdir()] == ["a.txt"]
+
+
+def test_failed_download_leaves_no_file(mock_downloads, tmp_path):
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/missing.txt"
+    mock_downloads.get(url).mock(httpx.Response(404))
+
+    location = tmp_path / "missing.txt"
+    download_files([(url, location)])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_multiple_files(mock_downloads, tmp_path):
+    files = []
+    for i in range(5):
+        url = f"https://dagshub.com/api/v1/repos/user/repo/raw/main/{i}.txt"
+        mock_downloads.get(url).mock(httpx.Response(200, content=str(i).encode()))
+        files.append((url, tmp_path / f"{i}.txt"))
+
+    download_files(files)
+
+    for i in range(5):
+        assert (tmp_path / f"{i}.txt").read_text() == str(i)
+
+
+def test_atomic_write_cleans_up_on_error(tmp_path):
+    location = tmp_path / "file.txt"
+    location.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(location) as f:
+            f.write(b"new, but partial")
+            raise RuntimeError("download interrupted")
+
+    assert location.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.txt"]
+
+
+class RangedFileServer:
+    """
+    Serves a file, supporting range requests. Can be told to fail ranges starting at specific offsets,
+    or to ignore the ranges altogether
+    """
+
+    def __init__(self, content: bytes, supports_ranges: bool = True):
+        self.content = content
+        self.supports_ranges = supports_ranges
+        self.requests = 0
+        self.requested_ranges = []
+        self.fail_offsets = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        range_header = request.headers.get("range")
+        headers = {"accept-ranges": "bytes", "etag": '"v1"'}
+        if range_header is None or not self.supports_ranges:
+            return httpx.Response(200, content=self.content, headers=headers)
+        start, end = (int(v) for v in range_header[len("bytes=") :].split("-"))
+        if start >= len(self.content):
+            return httpx.Response(416, headers={"content-range": f"bytes */{len(self.content)}"})
+        end = min(end, len(self.content) - 1)
+        self.requested_ranges.append((start, end))
+        if start in self.fail_offsets:
+            return httpx.Response(404)
+        headers["content-range"] = f"bytes {start}-{end}/{len(self.content)}"
+        return httpx.Response(206, content=self.content[start : end + 1], headers=headers)
+
+
+@pytest.fixture
+def ranged_config(monkeypatch):
+    monkeypatch.setattr(config, "download_range_threshold", 16)
+    monkeypatch.setattr(config, "download_part_size", 10)
+    monkeypatch.setattr(config, "download_part_threads", 3)
+
+
+def test_big_file_downloaded_in_ranges(mock_downloads, tmp_path, ranged_config):
+    content = bytes(range(95))
+    server = RangedFileServer(content)
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/big.bin"
+    mock_downloads.get(url).mock(side_effect=server)
+
+    location = tmp_path / "big.bin"
+    download_files([(url, location)])
+
+    assert location.read_bytes() == content
+    # The first request gets the threshold rounded up to whole parts, the rest of the parts are requested separately
+    assert sorted(server.requested_ranges) == [(0, 19)] + [(i, min(i + 9, 94)) for i in range(20, 95, 10)]
+    assert [p.name for p in tmp_path.iterdir()] == ["big.bin"]
+
+
+def test_small_file_not_downloaded_in_ranges(mock_downloads, tmp_path, ranged_config):
+    content = b"small"
+    server = RangedFileServer(content)
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/small.bin"
+    mock_downloads.get(url).mock(side_effect=server)
+
+    location = tmp_path / "small.bin"
+    download_files([(url, location)])
+
+    assert location.read_bytes() == content
+    assert server.requests == 1
+
+
+@pytest.mark.parametrize("content", [bytes(range(95)), b""], ids=["ranges_ignored", "empty_file"])
+def test_download_without_ranges(mock_downloads, tmp_path, ranged_config, content):
+    # Servers that ignore the range return the whole file to the first request. Empty files can't have a range.
+    server = RangedFileServer(content, supports_ranges=len(content) == 0)
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/file.bin"
+    mock_downloads.get(url).mock(side_effect=server)
+
+    location = tmp_path / "file.bin"
+    download_files([(url, location)])
+
+    assert location.read_bytes() == content
+    assert server.requests == (1 if content else 2)
+    assert [p.name for p in tmp_path.iterdir()] == ["file.bin"]
+
+
+def test_interrupted_ranged_download_resumes(mock_downloads, tmp_path, ranged_config):
+    content = bytes(range(50))
+    server = RangedFileServer(content)
+    server.fail_offsets = {30}
+    url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/big.bin"
+    mock_downloads.get(url).mock(side_effect=server)
+
+    location = tmp_path / "big.bin"
+    download_files([(url, location)])
+    assert not location.exists()
+
+    server.fail_offsets = set()
+    server.requested_ranges = []
+    download_files([(url, location)])
+
+    assert location.read_bytes() == content
+    # Parts that were completed before the failure shouldn't be downloaded again
+    assert (30, 39) in server.requested_ranges
+    assert set(server.requested_ranges) <= {(30, 39), (40, 49)}
+    assert [p.name for p in tmp_path.iterdir()] == ["big.bin"]
+
+
+def test_asyncio_engine_downloads_files(mock_downloads, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "download_chunk_size", 2)
+    files = []
+    for i in range(20):
+        url = f"https://dagshub.com/api/v1/repos/user/repo/raw/main/{i}.txt"
+        mock_downloads.get(url).mock(httpx.Response(200, content=f"content {i}".encode()))
+        files.append((url, tmp_path / "dir" / f"{i}.txt"))
+
+    download_files(files, engine="asyncio")
+
+    for i in range(20):
+        assert (tmp_path / "dir" / f"{i}.txt").read_text() == f"content {i}"
+
+
+def test_asyncio_engine_is_used(mock_downloads, tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_download_files_async(files, concurrency=None, skip_if_exists=True):
+        calls.append(files)
+
+    def fail_threaded(*args, **kwargs):
+        raise AssertionError("The threaded pipeline shouldn't be used with the asyncio engine")
+
+    monkeypatch.setattr("dagshub.common.download.download_files_async", fake_download_files_async)
+    monkeypatch.setattr("dagshub.common.download.download_files_pipelined", fail_threaded)
+    files = [(f"https://dagshub.com/api/v1/repos/user/repo/raw/main/{i}.txt", tmp_path / f"{i}.txt") for i in range(3)]
+
+    download_files(files, engine="asyncio")
+
+    assert calls == [files]
+
+
+def test_asyncio_engine_from_config(mock_downloads, tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_download_files_async(files, concurrency=None, skip_if_exists=True):
+        calls.append(files)
+
+    monkeypatch.setattr(config, "download_engine", "asyncio")
+    monkeypatch.setattr("dagshub.common.download.download_files_async", fake_download_files_async)
+    files = [(f"https://dagshub.com/api/v1/repos/user/repo/raw/main/{i}.txt", tmp_path / f"{i}.txt") for i in range(3)]
+
+    download_files(files)
+
+    assert calls == [files]
+
+
+def test_asyncio_engine_with_custom_download_fn_uses_threads(tmp_path, monkeypatch):
+    async def fail_async(*args, **kwargs):
+        raise AssertionError("A custom download_fn should run on threads")
+
+    monkeypatch.setattr("dagshub.common.download.download_files_async", fail_async)
+    downloaded = []
+    files = [(f"url/{i}", tmp_path / f"{i}.txt") for i in range(3)]
+
+    download_files(files, download_fn=lambda url, location: downloaded.append(url), engine="asyncio")
+
+    assert sorted(downloaded) == ["url/0", "url/1", "url/2"]
+
+
+def test_asyncio_engine_works_inside_running_loop(mock_downloads, tmp_path):
+    files = []
+    for i in range(3):
+        url = f"https://dagshub.com/api/v1/repos/user/repo/raw/main/{i}.txt"
+        mock_downloads.get(url).mock(httpx.Response(200, content=str(i).encode()))
+        files.append((url, tmp_path / f"{i}.txt"))
+
+    async def notebook_cell():
+        download_files(files, engine="asyncio")
+
+    asyncio.run(notebook_cell())
+
+    for i in range(3):
+        assert (tmp_path / f"{i}.txt").read_text() == str(i)
+
+
+def test_download_files_async_with_big_file(mock_downloads, tmp_path, ranged_config):
+    big_content = bytes(range(95))
+    server = RangedFileServer(big_content)
+    big_url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/big.bin"
+    mock_downloads.get(big_url).mock(side_effect=server)
+    small_url = "https://dagshub.com/api/v1/repos/user/repo/raw/main/small.bin"
+    mock_downloads.get(small_url).mock(httpx.Response(200, content=b"small"))
+
+    asyncio.run(download_files_async([(big_url, tmp_path / "big.bin"), (small_url, tmp_path / "small.bin")]))
+
+    assert (tmp_path / "big.bin").read_bytes() == big_content
+    assert sorted(server.requested_ranges) == [(0, 19)] + [(i, min(i + 9, 94)) for i in range(20, 95, 10)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["big.bin", "small.bin"]
+    assert (tmp_path / "small.bin").read_bytes() == b"small"
+
+
+def test_unknown_download_engine(tmp_path):
+    with pytest.raises(ValueError):
+        download_files([("https://dagshub.com/a.txt", tmp_path / "a.txt")], engine="processes")
+
+
+class CountingStream(httpx.SyncByteStream):
+    def __init__(self, content: bytes, chunk_size: int):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.read_bytes = 0
+
+    def __iter__(self):
+        for i in range(0, len(self.content), self.chunk_size):
+            chunk = self.content[i : i + self.chunk_size]
+            self.read_bytes += len(chunk)
+            yield chunk
+
+
+@pytest.mark.parametrize("start, end", [(0, 9), (15, 34), (37, 37), (90, None), (0, None), (30, 200)])
+def test_read_response_range(start, end):
+    content = bytes(range(100))
+    stream = CountingStream(content, 10)
+    resp = httpx.Response(200, stream=stream)
+
+    assert read_response_range(resp, start, end, chunk_size=10) == content[start : None if end is None else end + 1]
+    if end is not None and end < 90:
+        # Stopped reading after the end of the range
+        assert stream.read_bytes <= end + 10
@@ -0,0 +1,125 @@
+import subprocess
+import sys
+
+import pytest
+
+from dagshub.common import config
+from dagshub.common.file_cache import ManagedFileCache, get_dataset_file_cache
+
+
+@pytest.fixture
+def files_dir(tmp_path):
+    d = tmp_path / "files"
+    d.mkdir()
+    return d
+
+
+def make_cache(tmp_path, policy="lru") -> ManagedFileCache:
+    return ManagedFileCache(tmp_path / "index.sqlite", max_size=100, policy=policy)
+
+
+def make_file(files_dir, name, size=40):
+    path = files_dir / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_least_recently_used_file_evicted(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+    a, b = make_file(files_dir, "a"), make_file(files_dir, "b")
+    cache.record(a)
+    cache.record(b)
+    cache.record(a)
+
+    c = make_file(files_dir, "c")
+    cache.record(c)
+
+    assert a.exists() and c.exists()
+    assert not b.exists()
+    assert cache.total_size() == 80
+
+
+def test_least_frequently_used_file_evicted(tmp_path, files_dir):
+    cache = make_cache(tmp_path, policy="lfu")
+    a, b = make_file(files_dir, "a"), make_file(files_dir, "b")
+    cache.record(a)
+    cache.record(a)
+    cache.record(b)
+
+    cache.record(make_file(files_dir, "c"))
+
+    assert a.exists()
+    assert not b.exists()
+
+
+def test_pinned_file_not_evicted(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+    a, b = make_file(files_dir, "a"), make_file(files_dir, "b")
+    cache.record(a, b)
+
+    with cache.pinned(a):
+        cache.record(make_file(files_dir, "c"))
+        assert a.exists()
+        assert not b.exists()
+
+
+def test_pins_of_exited_processes_ignored(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+    a = make_file(files_dir, "a")
+    cache.record(a)
+    proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead_pid = int(proc.stdout)
+    cache.db.execute("INSERT INTO pins (path, pid, count) VALUES (?, ?, 1)", (str(a), dead_pid))
+
+    cache.record(make_file(files_dir, "b"), make_file(files_dir, "c"))
+
+    assert not a.exists()
+
+
+def test_recorded_files_not_evicted_by_their_own_record(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+    files = [make_file(files_dir, str(i)) for i in range(4)]
+    cache.record(*files)
+    assert all(f.exists() for f in files)
+
+
+def test_total_size_follows_records_and_evictions(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+
+    def summed_size():
+        return cache.db.execute("SELECT COALESCE(SUM(size), 0) FROM files")[0][0]
+
+    for i in range(10):
+        cache.record(make_file(files_dir, str(i), size=15))
+        assert cache.total_size() == summed_size() <= 100
+    assert cache.total_size() == 90
+
+    # A file that changed is counted with its new size
+    cache.record(make_file(files_dir, "9", size=35))
+    assert cache.total_size() == summed_size() == 95
+
+
+def test_eviction_goes_past_pinned_files(tmp_path, files_dir):
+    cache = make_cache(tmp_path)
+    cache._eviction_batch = 2
+    pinned = [make_file(files_dir, f"pinned{i}", size=10) for i in range(5)]
+    cache.record(*pinned)
+    unpinned = make_file(files_dir, "unpinned", size=40)
+    cache.record(unpinned)
+
+    with cache.pinned(*pinned):
+        cache.record(make_file(files_dir, "new", size=40))
+
+    assert all(f.exists() for f in pinned)
+    assert not unpinned.exists()
+    assert cache.total_size() == 90
+
+
+def test_no_cache_without_budget(monkeypatch):
+    monkeypatch.setattr(config, "dataset_cache_max_size", 0)
+    assert get_dataset_file_cache() is None
+
+
+def test_invalid_policy(tmp_path):
+    with pytest.raises(ValueError):
+        make_cache(tmp_path, policy="fifo")
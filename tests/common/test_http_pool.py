@@ -0,0 +1,80 @@
+import threading
+
+import httpx
+import pytest
+import respx
+
+from dagshub.common.helpers import http_request
+from dagshub.common.http_pool import HTTPClientPool, get_http_pool
+
+
+@pytest.fixture
+def pool() -> HTTPClientPool:
+    pool = HTTPClientPool()
+    yield pool
+    pool.close()
+
+
+def test_reuses_client_for_same_host(pool):
+    a = pool.get_client("https://dagshub.com/api/v1/repos/user/repo")
+    b = pool.get_client("https://dagshub.com/api/v1/user")
+    assert a is b
+
+
+def test_separate_clients_per_host(pool):
+    a = pool.get_client("https://dagshub.com/api/v1/user")
+    b = pool.get_client("https://example.com/api/v1/user")
+    c = pool.get_client("https://dagshub.com:8443/api/v1/user")
+    assert a is not b
+    assert a is not c
+
+
+def test_concurrent_get_client_creates_one_client(pool):
+    clients = []
+
+    def get():
+        clients.append(pool.get_client("https://dagshub.com/"))
+
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in clients}) == 1
+
+
+def test_recreates_clients_after_fork(pool, monkeypatch):
+    client = pool.get_client("https://dagshub.com/")
+    monkeypatch.setattr("os.getpid", lambda: -1)
+    assert pool.get_client("https://dagshub.com/") is not client
+
+
+def test_stats_are_recorded(pool):
+    with respx.mock(using="httpx") as mock:
+        mock.get("https://dagshub.com/api/v1/user").mock(httpx.Response(200))
+        pool.request("GET", "https://dagshub.com/api/v1/user")
+        pool.request("GET", "https://dagshub.com/api/v1/user")
+
+    stats = pool.stats()["https://dagshub.com:443"]
+    assert stats.requests == 2
+    assert stats.hits + stats.misses == 2
+
+
+def test_cookies_are_not_persisted(pool):
+    with respx.mock(using="httpx") as mock:
+        mock.get("https://dagshub.com/login").mock(httpx.Response(200, headers={"set-cookie": "session=abc; Path=/"}))
+        route = mock.get("https://dagshub.com/api").mock(httpx.Response(200))
+        pool.request("GET", "https://dagshub.com/login")
+        pool.request("GET", "https://dagshub.com/api")
+    assert "cookie" not in route.calls.last.request.headers
+
+
+def test_http_request_goes_through_pool():
+    with respx.mock(using="httpx") as mock:
+        route = mock.get("https://dagshub.com/api/v1/test-pool").mock(httpx.Response(200, text="ok"))
+        before = get_http_pool().stats().get("https://dagshub.com:443")
+        before_requests = before.requests if before is not None else 0
+        resp = http_request("GET", "https://dagshub.com/api/v1/test-pool")
+    assert resp.text == "ok"
+    assert route.called
+    assert get_http_pool().stats()["https://dagshub.com:443"].requests == before_requests + 1
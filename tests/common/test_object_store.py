@@ -0,0 +1,184 @@
+import os
+import stat
+
+import pytest
+
+from dagshub.common.api.responses import ContentAPIEntry
+from dagshub.common.object_store import ObjectStore, content_key
+
+
+@pytest.fixture
+def store(tmp_path) -> ObjectStore:
+    return ObjectStore(tmp_path / "store", max_size=100)
+
+
+def test_put_and_get(store):
+    store.put("abc", b"content")
+    assert store.get("abc") == b"content"
+    assert store.get_path("abc").read_bytes() == b"content"
+    assert store.get("missing") is None
+    assert store.get_path("missing") is None
+
+
+def test_link_shares_content(store, tmp_path):
+    store.put("abc", b"content")
+    first = store.link("abc", tmp_path / "ds1" / "abc")
+    second = store.link("abc", tmp_path / "ds2" / "abc")
+
+    assert first.read_bytes() == second.read_bytes() == b"content"
+    assert os.path.samefile(first, store.object_path("abc"))
+    # The links share the stored file, so they can't be writable
+    assert not os.stat(first).st_mode & stat.S_IWUSR
+    assert store.link("missing", tmp_path / "ds1" / "missing") is None
+
+
+def test_link_copies_without_hardlinks(store, tmp_path, monkeypatch):
+    store.put("abc", b"content")
+
+    def no_link(src, dst):
+        raise OSError("Cross-device link")
+
+    monkeypatch.setattr(os, "link", no_link)
+    target = store.link("abc", tmp_path / "ds" / "abc")
+
+    assert not target.is_symlink()
+    assert not os.path.samefile(target, store.object_path("abc"))
+    assert target.read_bytes() == b"content"
+    # Eviction of the object doesn't affect the copy
+    store.evict(0)
+    assert target.read_bytes() == b"content"
+
+
+def test_detach(store, tmp_path):
+    store.put("abc", b"content")
+    target = store.link("abc", tmp_path / "ds" / "abc")
+
+    assert store.detach(target)
+    target.write_bytes(b"changed")
+
+    assert store.get("abc") == b"content"
+    assert not store.detach(target)
+
+
+def test_corrupted_object_is_discarded(store):
+    path = store.put("abc", b"content")
+    path.chmod(0o644)
+    path.write_bytes(b"corrupt")
+
+    assert store.get("abc") is None
+    assert not path.exists()
+    assert store.total_size() == 0
+
+
+def test_modified_object_is_not_linked(store, tmp_path):
+    path = store.put("abc", b"content")
+    st = os.stat(path)
+    path.chmod(0o644)
+    path.write_bytes(b"CONTENT")
+    # Same size, only the modification time shows the write
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+    assert store.link("abc", tmp_path / "ds" / "abc") is None
+    assert not path.exists()
+
+
+def test_least_recently_used_objects_evicted(store):
+    store.put("a", b"a" * 40)
+    store.put("b", b"b" * 40)
+    # Reading "a" makes "b" the least recently used object
+    assert store.get("a") is not None
+
+    store.put("c", b"c" * 40)
+
+    assert store.get("b") is None
+    assert store.get("a") == b"a" * 40
+    assert store.get("c") == b"c" * 40
+    assert store.total_size() == 80
+
+
+def test_total_size_follows_inserts_and_evictions(store):
+    def summed_size():
+        return store.db.execute("SELECT COALESCE(SUM(size), 0) FROM objects")[0][0]
+
+    for i in range(10):
+        store.put(f"obj{i}", b"x" * 15)
+        assert store.total_size() == summed_size() <= 100
+    assert store.total_size() == 90
+
+    # Replacing an object counts only its new size
+    store.put("obj9", b"x" * 5)
+    assert store.total_size() == summed_size() == 80
+
+    store.evict(30)
+    assert store.total_size() == summed_size() == 20
+    assert store.get("obj9") == b"x" * 5
+
+    store.get_path("obj8").chmod(0o644)
+    store.get_path("obj8").write_bytes(b"corrupt")
+    assert store.get("obj8") is None
+    assert store.total_size() == summed_size() == 5
+
+
+def test_total_size_of_existing_index(store):
+    store.put("a", b"a" * 40)
+    store.put("b", b"b" * 30)
+    # An index from before the total was kept
+    store.db.execute("DROP TABLE total")
+    store.db.close()
+
+    reopened = ObjectStore(store.root, max_size=100)
+    assert reopened.total_size() == 70
+
+
+def test_invalid_key(store):
+    with pytest.raises(ValueError):
+        store.put("../escape", b"content")
+
+
+def test_add_file_leaves_source_in_place(store, tmp_path):
+    source = tmp_path / "a.txt"
+    source.write_bytes(b"content")
+    store.add_file("abc", source)
+
+    assert source.read_bytes() == b"content"
+    assert store.get("abc") == b"content"
+    assert list((store.root / "tmp").iterdir()) == []
+
+
+def test_add_file_without_hardlinks_skips_store(store, tmp_path, monkeypatch):
+    source = tmp_path / "a.txt"
+    source.write_bytes(b"content")
+
+    def no_link(src, dst):
+        raise OSError("Cross-device link")
+
+    monkeypatch.setattr(os, "link", no_link)
+
+    assert store.add_file("abc", source) is None
+    assert store.get("abc") is None
+    assert store.total_size() == 0
+    assert list((store.root / "tmp").iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "versioning, file_type, file_hash, expected",
+    [
+        ("git", "file", "5d41402abc4b2a76b9719d911017c592", "git-5d41402abc4b2a76b9719d911017c592"),
+        ("dvc", "file", "5d41402abc4b2a76b9719d911017c592", "dvc-5d41402abc4b2a76b9719d911017c592"),
+        ("bucket", "file", "5d41402abc4b2a76b9719d911017c592", None),
+        ("dvc", "dir", "5d41402abc4b2a76b9719d911017c592", None),
+        ("dvc", "file", "8586da76f372efa83d832a9d0e664817.dir", None),
+        ("git", "file", "", None),
+    ],
+)
+def test_content_key(versioning, file_type, file_hash, expected):
+    entry = ContentAPIEntry(
+        path="a.txt",
+        type=file_type,
+        size=0,
+        hash=file_hash,
+        versioning=versioning,
+        download_url="url",
+        content_url="url",
+    )
+    assert content_key(entry) == expected
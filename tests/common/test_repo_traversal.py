@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+import rich.progress
+
+import dagshub.common.download
+from dagshub.common import config
+from dagshub.common.download import download_files_pipelined
+from tests.mocks.repo_api import MockRepoAPI
+
+
+class SlowListingRepoAPI(MockRepoAPI):
+    """
+    Lists directories slowly and keeps track of how many listings were running at the same time
+    """
+
+    def __init__(self, repo: str):
+        super().__init__(repo)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def list_path(self, *args, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            return super().list_path(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def repo_api() -> SlowListingRepoAPI:
+    api = SlowListingRepoAPI("user/repo")
+    dirs = [f"data/{i}" for i in range(8)]
+    api.add_repo_contents("data", dirs=dirs)
+    for d in dirs:
+        api.add_repo_contents(d, dirs=[f"{d}/nested"])
+        api.add_repo_file(f"{d}/a.txt", b"a")
+        api.add_repo_file(f"{d}/nested/b.txt", b"b")
+    return api
+
+
+def test_recursive_traversal_finds_all_files(repo_api):
+    files = repo_api._get_files_in_path("data", recursive=True)
+    expected = {f"data/{i}/a.txt" for i in range(8)} | {f"data/{i}/nested/b.txt" for i in range(8)}
+    assert sorted(f.path for f in files) == sorted(expected)
+
+
+def test_non_recursive_traversal_skips_dirs(repo_api):
+    repo_api.add_repo_file("data/top.txt", b"top")
+    files = repo_api._get_files_in_path("data", recursive=False)
+    assert [f.path for f in files] == ["data/top.txt"]
+
+
+def test_traversal_bounds_concurrent_listings(repo_api):
+    files = list(repo_api._iter_files_in_path("data", recursive=True, max_workers=3))
+    assert len(files) == 16
+    assert 1 < repo_api.max_in_flight <= 3
+
+
+def test_traversal_stopped_early_skips_remaining_dirs(repo_api):
+    calls = []
+    original_list_path = repo_api.list_path
+
+    def list_path(path, *args, **kwargs):
+        calls.append(path)
+        return original_list_path(path, *args, **kwargs)
+
+    repo_api.list_path = list_path
+    it = repo_api._iter_files_in_path("data", recursive=True, max_workers=2)
+    next(it)
+    it.close()
+    assert len(calls) < 17
+
+
+@pytest.fixture
+def downloaded(monkeypatch) -> List[Path]:
+    """
+    Replaces the default downloader, recording the locations of the downloaded files
+    """
+    res = []
+
+    def downloader(url, location):
+        res.append(location)
+
+    monkeypatch.setattr(dagshub.common.download, "_default_downloader", downloader)
+    return res
+
+
+def test_download_directory(repo_api, downloaded, tmp_path):
+    repo_api.download("data", tmp_path, redownload=True)
+    assert len(downloaded) == 16
+    assert set(downloaded) == {tmp_path / f"{i}" / "a.txt" for i in range(8)} | {
+        tmp_path / f"{i}" / "nested" / "b.txt" for i in range(8)
+    }
+
+
+def test_download_single_file(repo_api, downloaded, tmp_path):
+    repo_api.add_repo_contents("data/0/a.txt", entries=[repo_api.generate_content_api_entry("data/0/a.txt")])
+    repo_api.download("data/0/a.txt", tmp_path, redownload=True)
+    assert downloaded == [tmp_path / "a.txt"]
+
+
+def test_pipelined_download_applies_backpressure(downloaded):
+    produced = 0
+    max_produced_ahead = 0
+    downloads = []
+    lock = threading.Lock()
+
+    def files():
+        nonlocal produced, max_produced_ahead
+        for i in range(50):
+            produced += 1
+            with lock:
+                max_produced_ahead = max(max_produced_ahead, produced - len(downloads))
+            yield f"https://dagshub.com/{i}", Path(f"{i}.txt")
+
+    def download_fn(url, location):
+        time.sleep(0.005)
+        with lock:
+            downloads.append(url)
+
+    num_files = download_files_pipelined(files(), download_fn, threads=2, queue_size=3)
+
+    assert num_files == 50
+    assert len(downloads) == 50
+    # At most: the queue, the files being downloaded and the one waiting to be put in the queue
+    assert max_produced_ahead <= 3 + 2 + 1
+
+
+@pytest.mark.parametrize("num_files", [0, 3, 40])
+def test_pipelined_download_starts_workers_for_files(downloaded, num_files):
+    threads = set()
+
+    def download_fn(url, location):
+        threads.add(threading.get_ident())
+
+    started = threading.active_count()
+    peak = started
+
+    def files():
+        nonlocal peak
+        for i in range(num_files):
+            peak = max(peak, threading.active_count())
+            yield f"https://dagshub.com/{i}", Path(f"{i}.txt")
+
+    # A progress that isn't started doesn't run a refresh thread of its own
+    progress = rich.progress.Progress()
+    assert download_files_pipelined(files(), download_fn, threads=8, progress=progress) == num_files
+    assert peak - started <= min(num_files, 8)
+    assert len(threads) <= min(num_files, 8)
+    # The workers are shut down when the files run out
+    assert threading.active_count() == started
+
+
+def test_download_links_already_downloaded_content(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "enable_file_store", True)
+    api = MockRepoAPI("user/repo")
+    for revision, content in [("v1", b"same"), ("v2", b"same")]:
+        entry = MockRepoAPI.generate_content_api_entry("data/a.txt", versioning="git")
+        entry.hash = "5d41402abc4b2a76b9719d911017c592"
+        entry.download_url = f"https://dagshub.com/user/repo/raw/{revision}/data/a.txt"
+        api.add_repo_contents("data", revision=revision, entries=[entry])
+
+    downloaded = []
+
+    def downloader(url, location):
+        downloaded.append(url)
+        location.parent.mkdir(parents=True, exist_ok=True)
+        location.write_bytes(b"same")
+
+    monkeypatch.setattr(dagshub.common.download, "_default_downloader", downloader)
+
+    api.download("data", tmp_path / "v1", revision="v1")
+    api.download("data", tmp_path / "v2", revision="v2")
+
+    assert downloaded == ["https://dagshub.com/user/repo/raw/v1/data/a.txt"]
+    assert (tmp_path / "v2" / "a.txt").read_bytes() == b"same"
+    assert os.path.samefile(tmp_path / "v1" / "a.txt", tmp_path / "v2" / "a.txt")
@@ -0,0 +1,75 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dagshub.common.singleflight import SingleFlight, process_lock
+
+
+def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    def call():
+        barrier.wait()
+        return flight.do("key", work)
+
+    with ThreadPoolExecutor(max_workers=8) as tp:
+        results = list(tp.map(lambda _: call(), range(8)))
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    # The call isn't remembered once it's done
+    assert flight.do("key", work) == "result"
+    assert len(calls) == 2
+
+
+def test_exception_is_shared():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.2)
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(max_workers=2) as tp:
+        leader = tp.submit(flight.do, "key", fail)
+        started.wait()
+        follower = tp.submit(flight.do, "key", lambda: "not called")
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No process locks on Windows")
+def test_process_lock_is_exclusive():
+    events = []
+    locked = threading.Event()
+
+    def hold():
+        with process_lock("key"):
+            locked.set()
+            time.sleep(0.2)
+            events.append("first released")
+
+    def wait():
+        locked.wait()
+        with process_lock("key"):
+            events.append("second acquired")
+
+    threads = [threading.Thread(target=hold), threading.Thread(target=wait)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert events == ["first released", "second acquired"]
@@ -0,0 +1,18 @@
+import pytest
+
+from dagshub.common import config
+
+
+@pytest.fixture(autouse=True)
+def file_store_location(tmp_path, monkeypatch) -> str:
+    # Keep the global store of downloaded files isolated between tests
+    location = str(tmp_path / "file_store")
+    monkeypatch.setattr(config, "file_store_location", location)
+    return location
+
+
+@pytest.fixture(autouse=True)
+def download_locks_location(tmp_path, monkeypatch) -> str:
+    location = str(tmp_path / "locks")
+    monkeypatch.setattr(config, "download_locks_location", location)
+    return location
@@ -4,6 +4,7 @@ from unittest.mock import PropertyMock
 
 import pytest
 
+from dagshub.common import config
 from dagshub.common.api import UserAPI
 from dagshub.common.api.responses import UserAPIResponse
 from dagshub.data_engine import datasources
@@ -16,6 +17,14 @@ from tests.data_engine.util import add_string_fields
 from tests.mocks.repo_api import MockRepoAPI
 
 
+@pytest.fixture(autouse=True)
+def blob_store_location(tmp_path, monkeypatch) -> str:
+    # Keep the global blob store isolated between tests
+    location = str(tmp_path / "blob_store")
+    monkeypatch.setattr(config, "blob_store_location", location)
+    return location
+
+
 @pytest.fixture
 def ds(mocker, mock_dagshub_auth) -> Datasource:
     return _create_mock_datasource(mocker, 1, "test-dataset")
@@ -0,0 +1,151 @@
+import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from dagshub.data_engine.model.datapoint import BlobHashMetadata
+from dagshub.data_engine.model.query_result import QueryResult
+from tests.data_engine.util import (
+    add_blob_fields,
+    add_datetime_fields,
+    add_float_fields,
+    add_int_fields,
+    add_string_fields,
+)
+
+pa = pytest.importorskip("pyarrow")
+
+
+def query_response(start: int, count: int, extra_metadata: List[Dict[str, Any]] = ()) -> Dict[str, Any]:
+    edges = []
+    for i in range(start, start + count):
+        metadata = [
+            {"key": "int_col", "value": i},
+            {"key": "float_col", "value": i / 2},
+            {"key": "str_col", "value": f"value_{i}"},
+            {"key": "date_col", "value": 1700000000000 + i * 1000, "timeZone": "+02:00"},
+            *extra_metadata,
+        ]
+        if i % 2 == 0:
+            # Only some of the datapoints have a blob
+            metadata.append({"key": "blob_col", "value": f"hash{i}"})
+        edges.append({"node": {"id": i, "path": f"dp_{i}", "metadata": metadata}})
+    return {"edges": edges, "queryDataTime": 1700000000}
+
+
+@pytest.fixture
+def typed_ds(ds):
+    add_int_fields(ds, "int_col")
+    add_float_fields(ds, "float_col")
+    add_string_fields(ds, "str_col")
+    add_datetime_fields(ds, "date_col")
+    add_blob_fields(ds, "blob_col")
+    return ds
+
+
+def test_metadata_same_as_regular_result(typed_ds):
+    resp = query_response(0, 4)
+    columnar = QueryResult.from_gql_query(resp, typed_ds, columnar=True)
+    regular = QueryResult.from_gql_query(resp, typed_ds, columnar=False)
+    assert columnar.is_columnar
+    assert not regular.is_columnar
+    assert len(columnar) == 4
+    for col_dp, reg_dp in zip(columnar, regular):
+        assert col_dp.datapoint_id == reg_dp.datapoint_id
+        assert col_dp.path == reg_dp.path
+        assert dict(col_dp.metadata) == reg_dp.metadata
+    assert columnar["dp_2"]["blob_col"] == BlobHashMetadata("hash2")
+    assert "blob_col" not in columnar["dp_1"].metadata
+    date = columnar[0]["date_col"]
+    assert date.utcoffset() == datetime.timedelta(hours=2)
+    assert date.timestamp() == 1700000000
+
+
+def test_extend_pages(typed_ds):
+    res = QueryResult([], typed_ds, [])
+    res._extend(QueryResult.from_gql_query(query_response(0, 3), typed_ds, columnar=True))
+    page = QueryResult.from_gql_query(
+        query_response(3, 3, extra_metadata=[{"key": "new_col", "value": "new"}]), typed_ds, columnar=True
+    )
+    res._extend(page)
+    assert res.is_columnar
+    assert [dp.path for dp in res] == [f"dp_{i}" for i in range(6)]
+    assert res["dp_4"]["new_col"] == "new"
+    assert "new_col" not in res["dp_1"].metadata
+    assert res[-1].datapoint_id == 5
+
+
+def test_row_values_of_many_pages(typed_ds):
+    res = QueryResult([], typed_ds, [])
+    for start in range(0, 50, 5):
+        res._extend(QueryResult.from_gql_query(query_response(start, 5), typed_ds, columnar=True))
+    columns = res._entries.columns
+    assert columns.ids.num_chunks == 10
+
+    for i in range(50):
+        dp = res[i]
+        assert (dp.datapoint_id, dp.path) == (i, f"dp_{i}")
+        assert dp["int_col"] == i
+        assert dp["float_col"] == i / 2
+        assert dp["str_col"] == f"value_{i}"
+        assert dp["date_col"].timestamp() == 1700000000 + i
+        assert dp["date_col"].utcoffset() == datetime.timedelta(hours=2)
+        assert ("blob_col" in dp.metadata) == (i % 2 == 0)
+    # The lookups combined the chunks of the pages
+    assert columns.ids.num_chunks == 1
+    assert all(column.num_chunks == 1 for column in columns.columns.values())
+
+    # Pages appended after the lookups get combined on the next lookup
+    res._extend(QueryResult.from_gql_query(query_response(50, 5), typed_ds, columnar=True))
+    assert res[52]["int_col"] == 52
+    assert columns.ids.num_chunks == 1
+
+
+def test_metadata_changes_are_shared_between_views(typed_ds):
+    res = QueryResult.from_gql_query(query_response(0, 4), typed_ds, columnar=True)
+    res[1].metadata["blob_col"] = b"downloaded"
+    res["dp_2"].metadata["blob_col"] = "/path/to/blob"
+    del res[3].metadata["str_col"]
+    assert res[1]["blob_col"] == b"downloaded"
+    assert res[2]["blob_col"] == "/path/to/blob"
+    assert "str_col" not in res[3].metadata
+
+    sliced = res[1:3]
+    assert [dp.path for dp in sliced] == ["dp_1", "dp_2"]
+    assert sliced[0]["blob_col"] == b"downloaded"
+
+
+def test_dataframe(typed_ds):
+    resp = query_response(0, 4)
+    columnar = QueryResult.from_gql_query(resp, typed_ds, columnar=True)
+    regular = QueryResult.from_gql_query(resp, typed_ds, columnar=False)
+    columnar[0].metadata["str_col"] = "changed"
+    regular[0].metadata["str_col"] = "changed"
+
+    df = columnar.dataframe
+    expected = regular.dataframe
+    assert list(df.columns) == list(expected.columns)
+    for column in ["path", "datapoint_id", "dagshub_download_url", "int_col", "float_col", "str_col"]:
+        assert df[column].tolist() == expected[column].tolist()
+    assert df["blob_col"][0] == "hash0"
+    assert df["blob_col"].isna()[1]
+    assert [d.timestamp() for d in df["date_col"]] == [d.timestamp() for d in expected["date_col"]]
+
+
+def test_to_arrow(typed_ds):
+    res = QueryResult.from_gql_query(query_response(0, 4), typed_ds, columnar=True)
+    table = res.to_arrow()
+    assert table.column_names == ["datapoint_id", "path", "blob_col", "date_col", "float_col", "int_col", "str_col"]
+    assert table.schema.field("int_col").type == pa.int64()
+    assert table.schema.field("date_col").type == pa.timestamp("ms", tz="UTC")
+    assert table.column("str_col").to_pylist() == [f"value_{i}" for i in range(4)]
+
+
+def test_as_hf_dataset(typed_ds):
+    pytest.importorskip("datasets")
+    res = QueryResult.from_gql_query(query_response(0, 4), typed_ds, columnar=True)
+    hf_dataset = res.as_hf_dataset(download_datapoints=False, download_blobs=False)
+    assert len(hf_dataset) == 4
+    assert "datapoint_id" not in hf_dataset.column_names
+    assert hf_dataset[1]["int_col"] == 1
+    assert hf_dataset[3]["path"] == "dp_3"
@@ -0,0 +1,197 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import pytest
+
+from dagshub.data_engine.client.data_client import DataClient
+from dagshub.data_engine.client.gql_mutations import GqlMutations
+from dagshub.data_engine.model.query_result import QueryResult
+from tests.data_engine.util import add_int_fields
+
+
+def query_page(start: int, count: int, total: int) -> Dict[str, Any]:
+    end = min(start + count, total)
+    return {
+        "edges": [
+            {"node": {"id": i, "path": f"dp_{i}", "metadata": [{"key": "col", "value": i}]}} for i in range(start, end)
+        ],
+        "pageInfo": {"hasNextPage": end < total, "endCursor": str(end)},
+        "queryDataTime": 1700000000 + start,
+    }
+
+
+@pytest.fixture
+def client(mocker):
+    client = DataClient.__new__(DataClient)
+    total = 25
+
+    def datasource_query(datasource, include_metadata, limit=None, after: Optional[str] = None):
+        return query_page(int(after or 0), limit, total)
+
+    mocker.patch.object(client, "_datasource_query", side_effect=datasource_query)
+    mocker.patch.object(client, "FULL_LIST_PAGE_SIZE", 10)
+    return client
+
+
+def test_get_all_accumulates_pages(client, ds):
+    add_int_fields(ds, "col")
+    res = client._get_all(ds, True)
+    assert client._datasource_query.call_count == 3
+    assert [dp.path for dp in res] == [f"dp_{i}" for i in range(25)]
+    # The path lookup covers the datapoints of all pages
+    assert res["dp_24"]["col"] == 24
+    assert res["dp_3"].datapoint_id == 3
+    assert [f.name for f in res.fields] == ["col"]
+    assert res.query_data_time.timestamp() == 1700000020
+
+
+def test_sample_stops_at_n(client, ds):
+    add_int_fields(ds, "col")
+    res = client.sample(ds, 15, True)
+    assert len(res) == 15
+    assert res["dp_14"].datapoint_id == 14
+    with pytest.raises(KeyError):
+        _ = res["dp_15"]
+
+
+def test_iter_all_yields_pages(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    pages = ds.iter_all(page_size=10)
+    # Nothing is requested until the iteration starts
+    assert client._datasource_query.call_count == 0
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert pages.cursor == "25"
+
+
+def test_iter_all_datapoints(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    assert [dp["col"] for dp in ds.iter_all(page_size=10).datapoints()] == list(range(25))
+
+
+def test_iter_all_resumes_from_cursor(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    pages = ds.iter_all(page_size=10)
+    first = next(pages)
+    assert first[0].path == "dp_0"
+    cursor = pages.cursor
+    del pages
+
+    resumed = ds.iter_all(page_size=10, after=cursor)
+    assert [dp.path for dp in resumed.datapoints()] == [f"dp_{i}" for i in range(10, 25)]
+    # Resuming after the end doesn't return anything
+    assert list(ds.iter_all(page_size=10, after=resumed.cursor)) == []
+
+
+def test_iter_all_resumes_after_failed_autoload(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    autoload = mocker.patch.object(
+        QueryResult, "_load_autoload_fields", side_effect=[None, RuntimeError("blob download failed")]
+    )
+    pages = ds.iter_all(page_size=10)
+    assert next(pages)[0].path == "dp_0"
+    with pytest.raises(RuntimeError, match="blob download failed"):
+        next(pages)
+    # The cursor stays at the end of the last returned page
+    assert pages.cursor == "10"
+
+    autoload.side_effect = None
+    resumed = ds.iter_all(page_size=10, after=pages.cursor)
+    assert [dp.path for dp in resumed.datapoints()] == [f"dp_{i}" for i in range(10, 25)]
+
+
+def wait_for_requests(client, count: int):
+    deadline = time.monotonic() + 5
+    while client._datasource_query.call_count < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+
+
+def test_iter_all_close_stops_requests(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    client._datasource_query.side_effect = lambda datasource, include_metadata, limit, after: query_page(
+        int(after or 0), limit, 1000
+    )
+    with ds.iter_all(page_size=5) as pages:
+        next(pages)
+        wait_for_requests(client, 4)
+    calls = client._datasource_query.call_count
+    time.sleep(0.3)
+
+    assert client._datasource_query.call_count == calls
+    assert list(pages) == []
+
+
+def test_iter_all_datapoints_close_stops_requests(client, ds, mocker):
+    add_int_fields(ds, "col")
+    mocker.patch.object(ds.source, "client", client)
+    pages = ds.iter_all(page_size=5)
+    datapoints = pages.datapoints()
+    next(datapoints)
+    datapoints.close()
+
+    assert list(pages) == []
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_pager_follows_cursor(client, ds, prefetch):
+    add_int_fields(ds, "col")
+    pager = client.get_pages(ds, True, page_size=10, prefetch=prefetch)
+    assert [[dp.path for dp in page] for page in pager] == [
+        [f"dp_{i}" for i in range(start, min(start + 10, 25))] for start in (0, 10, 20)
+    ]
+    assert [call.args[3] for call in client._datasource_query.call_args_list] == [None, "10", "20"]
+    assert [t.rows for t in pager.timings] == [10, 10, 5]
+    assert pager.cursor == "25"
+    assert not pager.has_next_page
+
+
+def test_pager_requests_next_pages_ahead(client, ds):
+    add_int_fields(ds, "col")
+    pages = iter(client.get_pages(ds, True, page_size=5, prefetch=2))
+    next(pages)
+    # The first page was yielded, the pager keeps requesting while it's being processed
+    wait_for_requests(client, 4)
+    # One page is yielded, two are waiting in the queue, and one more was requested
+    assert client._datasource_query.call_count == 4
+    pages.close()
+
+
+def test_pager_raises_fetch_errors(client, ds):
+    add_int_fields(ds, "col")
+    client._datasource_query.side_effect = [query_page(0, 10, 25), RuntimeError("server error")]
+    pages = iter(client.get_pages(ds, True, page_size=10, prefetch=2))
+    assert len(next(pages)) == 10
+    with pytest.raises(RuntimeError, match="server error"):
+        next(pages)
+
+
+def test_exec_runs_one_request_at_a_time(mocker):
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def execute(*args, **kwargs):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return {}
+
+    mocker.patch.object(DataClient, "_init_client", return_value=mocker.MagicMock(execute=execute))
+    client = DataClient("user/repo")
+    query = GqlMutations.create_datasource()
+
+    # The pager's fetcher thread and the caller's thread can run queries at the same time
+    with ThreadPoolExecutor(max_workers=4) as tp:
+        list(tp.map(lambda _: client._exec(query, validate=False), range(8)))
+    assert max_running == 1
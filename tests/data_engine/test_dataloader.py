@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from dagshub.data_engine.client.loaders.base import DagsHubDataset
+
+
+@pytest.fixture
+def dataset(query_result, tmp_path) -> DagsHubDataset:
+    return DagsHubDataset(query_result, tensorizers=[lambda x: x], savedir=str(tmp_path / "dataset"))
+
+
+def test_concurrent_downloads_of_datapoint(dataset, tmp_path, monkeypatch):
+    calls = []
+    seen = []
+
+    def get_file(path):
+        calls.append(path)
+        time.sleep(0.1)
+        return b"content"
+
+    monkeypatch.setattr(dataset.repo, "get_file", get_file)
+    datapoint = dataset.entries[0]
+    location = tmp_path / "dataset" / datapoint.path
+
+    def read():
+        dataset._download(datapoint)
+        seen.append(location.read_bytes())
+
+    threads = [threading.Thread(target=read) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert seen == [b"content"] * 5
+    assert [p.name for p in location.parent.iterdir()] == [location.name]
+
+
+class IndexDataset:
+    strategy = "lazy"
+    order = None
+
+    def __len__(self):
+        return 10
+
+    def __getitem__(self, idx):
+        return idx
+
+
+@pytest.mark.parametrize("batch_size", [None, 3])
+def test_dataloader_order_of_every_epoch(batch_size):
+    torch = pytest.importorskip("torch")
+    from dagshub.data_engine.client.loaders.torch import PyTorchDataLoader
+
+    dataset = IndexDataset()
+    loader = PyTorchDataLoader(dataset, batch_size=batch_size, shuffle=True)
+    orders = []
+    for _ in range(3):
+        indices = []
+        for batch in loader:
+            indices += batch.tolist() if isinstance(batch, torch.Tensor) else [batch]
+        # The order that the prefetching follows is the one of the epoch
+        assert indices == dataset.order
+        orders.append(indices)
+    assert len({tuple(order) for order in orders}) > 1
@@ -1,4 +1,14 @@
-from dagshub.data_engine.client.models import DatasourceType
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import respx
+
+from dagshub.data_engine.client.models import DatasourceType, MetadataSelectFieldSchema
+from dagshub.data_engine.model.datapoint import BlobHashMetadata, Datapoint, _get_blob
+from tests.data_engine.util import add_blob_fields, add_datetime_fields, add_float_fields, add_int_fields
 
 
 def test_getitem_metadata(some_datapoint):
@@ -12,3 +22,78 @@ def test_download_url_encoding(some_datapoint):
     download_url = some_datapoint.download_url
     assert "#" not in download_url
     assert download_url.endswith("aaa%20%23%20bbb/file.txt")
+
+
+def test_blobs_shared_between_datasources(tmp_path):
+    url = "https://dagshub.com/api/v1/repos/user/repo/data-engine/raw/deadbeef"
+    with respx.mock(using="httpx") as mock:
+        route = mock.get(url).mock(httpx.Response(200, content=b"blob content"))
+        first = _get_blob(url, tmp_path / "ds1" / "deadbeef", None, True, False)
+        second = _get_blob(url, tmp_path / "ds2" / "deadbeef", None, True, True)
+
+    assert route.call_count == 1
+    assert first.read_bytes() == b"blob content"
+    assert second == b"blob content"
+    assert (tmp_path / "ds2" / "deadbeef").read_bytes() == b"blob content"
+
+
+def test_concurrent_loads_of_blob_download_it_once(tmp_path):
+    url = "https://dagshub.com/api/v1/repos/user/repo/data-engine/raw/deadbeef"
+    barrier = threading.Barrier(8)
+
+    def slow_response(request):
+        time.sleep(0.2)
+        return httpx.Response(200, content=b"blob content")
+
+    def load(_):
+        barrier.wait()
+        return _get_blob(url, tmp_path / "ds" / "deadbeef", None, True, True)
+
+    with respx.mock(using="httpx") as mock:
+        route = mock.get(url).mock(side_effect=slow_response)
+        with ThreadPoolExecutor(max_workers=8) as tp:
+            results = list(tp.map(load, range(8)))
+
+    assert route.call_count == 1
+    assert results == [b"blob content"] * 8
+
+
+def test_from_gql_edges_decodes_page(ds):
+    add_float_fields(ds, "float_col")
+    add_datetime_fields(ds, "date_col")
+    add_blob_fields(ds, "blob_col")
+    add_int_fields(ds, "int_col")
+    fields = [MetadataSelectFieldSchema.from_metadata_field_schema(f) for f in ds.fields]
+    edges = [
+        {
+            "node": {
+                "id": "1",
+                "path": "a.jpg",
+                "metadata": [
+                    {"key": "float_col", "value": "0.5"},
+                    {"key": "date_col", "value": 1700000000000, "timeZone": "+02:00"},
+                    {"key": "blob_col", "value": "deadbeef"},
+                    {"key": "int_col", "value": 3},
+                ],
+            }
+        },
+        {
+            "node": {
+                "id": "2",
+                "path": "b.jpg",
+                "metadata": [{"key": "date_col", "value": 1700000000000, "timeZone": "-03:30"}],
+            }
+        },
+    ]
+    first, second = Datapoint.from_gql_edges(edges, ds, fields)
+    assert first.datapoint_id == 1
+    assert first.metadata == {
+        "float_col": 0.5,
+        "date_col": datetime.datetime(2023, 11, 15, 0, 13, 20, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        "blob_col": BlobHashMetadata("deadbeef"),
+        "int_col": 3,
+    }
+    assert second.path == "b.jpg"
+    assert second["date_col"].utcoffset() == -datetime.timedelta(hours=3, minutes=30)
+    assert second["date_col"].timestamp() == 1700000000
+    assert Datapoint.from_gql_edge(edges[0], ds, fields).metadata == first.metadata
@@ -1,5 +1,9 @@
 import math
 
+import dagshub.common.download
+
+from dagshub.common import config
+from dagshub.common.file_cache import get_dataset_file_cache
 from dagshub.data_engine.model.query_result import QueryResult
 
 
@@ -21,3 +25,53 @@ def test_getitem_slice_returns_query_result(query_result):
     assert len(qr) == math.ceil(len(query_result) / 2)
     for i in range(len(qr)):
         assert qr[i].datapoint_id is query_result[i * 2].datapoint_id
+
+
+def test_download_files_evicts_over_budget(query_result, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "dataset_cache_max_size", 10)
+    monkeypatch.setattr(config, "dataset_cache_index_location", str(tmp_path / "index.sqlite"))
+
+    def downloader(url, location):
+        location.parent.mkdir(parents=True, exist_ok=True)
+        location.write_bytes(b"12345")
+
+    monkeypatch.setattr(dagshub.common.download, "_default_downloader", downloader)
+
+    old_file = tmp_path / "old_file"
+    old_file.write_bytes(b"12345")
+    get_dataset_file_cache().record(old_file)
+
+    query_result.download_files(tmp_path / "dataset", keep_source_prefix=False)
+
+    assert not old_file.exists()
+    # Files of the download itself get evicted too, instead of the cache going over its max size
+    assert len(query_result) > 2
+    assert len([p for p in (tmp_path / "dataset").rglob("*") if p.is_file()]) <= 2
+    assert get_dataset_file_cache().total_size() <= 10
+
+
+def test_download_files_links_already_downloaded_content(query_result, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "enable_file_store", True)
+    repo_api = query_result.datasource.source.repoApi
+    entries = []
+    for dp in query_result:
+        entry = repo_api.generate_content_api_entry(dp.path, versioning="dvc")
+        entry.hash = f"hash{dp.path}"
+        entries.append(entry)
+    repo_api.add_repo_contents("", entries=entries)
+
+    downloaded = []
+
+    def downloader(url, location):
+        downloaded.append(url)
+        location.parent.mkdir(parents=True, exist_ok=True)
+        location.write_bytes(url.encode())
+
+    monkeypatch.setattr(dagshub.common.download, "_default_downloader", downloader)
+
+    query_result.download_files(tmp_path / "first", keep_source_prefix=False)
+    query_result.download_files(tmp_path / "second", keep_source_prefix=False)
+
+    assert len(downloaded) == len(query_result)
+    for dp in query_result:
+        assert (tmp_path / "second" / dp.path).read_bytes() == dp.download_url.encode()
@@ -2,9 +2,28 @@ import os
 import pytest
 import pytest_git
 
+import dagshub.streaming.negative_cache
+from dagshub.common import config
+from dagshub.streaming.negative_cache import NegativeLookupCache
 from tests.dda.mock_api import MockApi
 
 
+@pytest.fixture(autouse=True)
+def listing_cache_location(tmp_path, monkeypatch) -> str:
+    # Keep the persistent listing cache isolated between tests
+    location = str(tmp_path / "listing_cache" / "listings.sqlite")
+    monkeypatch.setattr(config, "streaming_listing_cache_location", location)
+    return location
+
+
+@pytest.fixture(autouse=True)
+def negative_lookup_cache(monkeypatch) -> NegativeLookupCache:
+    # Paths missing in one test can exist in another one
+    cache = NegativeLookupCache(config.negative_lookup_cache_ttl, config.negative_lookup_cache_max_entries)
+    monkeypatch.setattr(dagshub.streaming.negative_cache, "_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def repouser() -> str:
     return "user"
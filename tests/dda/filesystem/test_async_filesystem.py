@@ -0,0 +1,90 @@
+import asyncio
+import os
+
+import pytest
+
+from dagshub.streaming import AsyncDagsHubFilesystem, DagsHubFilesystem
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def async_fs(mock_api) -> AsyncDagsHubFilesystem:
+    return AsyncDagsHubFilesystem(DagsHubFilesystem())
+
+
+def test_create(mock_api):
+    async def create():
+        async with await AsyncDagsHubFilesystem.create() as fs:
+            return fs
+
+    fs = run(create())
+    assert fs.fs._current_revision == mock_api.current_revision
+
+
+def test_open(mock_api, async_fs):
+    route = mock_api.add_file("data/a.txt", b"Hello, async streaming world!")
+
+    async def read():
+        with await async_fs.open("data/a.txt", "rb") as f:
+            return f.read()
+
+    assert run(read()) == b"Hello, async streaming world!"
+    assert route.call_count == 1
+    # The sync filesystem finds the file on the disk
+    with async_fs.fs.open("data/a.txt", "rb") as f:
+        assert f.read() == b"Hello, async streaming world!"
+    assert route.call_count == 1
+
+
+def test_concurrent_opens_download_once(mock_api, async_fs):
+    route = mock_api.add_file("a.txt", b"content")
+
+    async def read():
+        with await async_fs.open("a.txt") as f:
+            return f.read()
+
+    async def read_many():
+        return await asyncio.gather(*(read() for _ in range(10)))
+
+    assert run(read_many()) == ["content"] * 10
+    assert route.call_count == 1
+
+
+def test_fetch_many_files(mock_api, async_fs):
+    routes = [mock_api.add_file(f"data/{i}.txt", f"{i}") for i in range(20)]
+    run(async_fs.fetch(*(f"data/{i}.txt" for i in range(20))))
+    for i, route in enumerate(routes):
+        assert route.call_count == 1
+        assert open(f"data/{i}.txt").read() == f"{i}"
+
+
+def test_open_missing_file(mock_api, async_fs, negative_lookup_cache):
+    route = mock_api.add_file("missing.txt", status=404)
+
+    async def open_twice():
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                await async_fs.open("missing.txt")
+
+    run(open_twice())
+    assert route.call_count == 1
+    assert negative_lookup_cache.stats.hits == 1
+
+
+def test_listdir_shares_cache_with_sync_fs(mock_api, async_fs):
+    route = mock_api.add_dir("data", contents=[("a.txt", "file"), ("nested", "dir")])
+    assert sorted(run(async_fs.listdir("data"))) == ["a.txt", "nested"]
+    assert sorted(async_fs.fs.listdir("data")) == ["a.txt", "nested"]
+    assert route.call_count == 1
+
+
+def test_stat(mock_api, async_fs):
+    mock_api.add_dir("data", contents=[("a.txt", "file"), ("nested", "dir")])
+    assert run(async_fs.stat("data/nested")).st_mode & 0o040000
+    assert not run(async_fs.stat("data/a.txt")).st_mode & 0o040000
+    assert not os.path.exists("data/a.txt")
+    with pytest.raises(FileNotFoundError):
+        run(async_fs.stat("data/b.txt"))
@@ -0,0 +1,45 @@
+from dagshub.common import config
+from dagshub.common.api.responses import ContentAPIEntry
+from dagshub.streaming import DagsHubFilesystem
+from dagshub.streaming.listing_cache import PersistentListingCache
+
+
+def test_listing_is_reused_between_filesystems(mock_api):
+    fs = DagsHubFilesystem()
+    assert mock_api["list_root"].call_count == 1
+    fs.cleanup()
+
+    mock_api["list_root"].reset()
+    new_fs = DagsHubFilesystem()
+    assert sorted(new_fs.listdir(".")) == sorted(fs.listdir("."))
+    assert not mock_api["list_root"].called
+
+
+def test_listing_with_sizes_not_served_from_sizeless_cache(mock_api):
+    fs = DagsHubFilesystem()
+    assert fs._check_persistent_listdir_cache(".", include_size=False) is not None
+    assert fs._check_persistent_listdir_cache(".", include_size=True) is None
+
+
+def test_sized_listing_serves_sizeless_request():
+    cache = PersistentListingCache(config.streaming_listing_cache_location)
+    revision = "a" * 40
+    entry = ContentAPIEntry("a.txt", "file", 10, "hash", "git", "url", None)
+    cache.put("repo", revision, ".", True, [entry])
+    assert cache.get("repo", revision, ".", False) == [entry]
+
+
+def test_branch_revision_is_not_cached():
+    cache = PersistentListingCache(config.streaming_listing_cache_location)
+    cache.put("repo", "main", ".", False, [])
+    assert cache.get("repo", "main", ".", False) is None
+
+
+def test_disabled_cache(mock_api, monkeypatch):
+    monkeypatch.setattr(config, "disable_streaming_listing_cache", True)
+    fs = DagsHubFilesystem()
+    fs.cleanup()
+
+    mock_api["list_root"].reset()
+    DagsHubFilesystem()
+    assert mock_api["list_root"].called
@@ -77,3 +77,34 @@ def test_path_isdir(mock_api, repo_with_hooks):
     nonexistent_dir = "subdir2"
     assert not os.path.isdir(nonexistent_dir)
     assert not os.path.isfile(nonexistent_dir)
+
+
+@pytest.mark.parametrize(
+    "path, expected_relative",
+    [
+        ("a.txt", "a.txt"),
+        (".", "."),
+        ("subdir/../b.txt", "b.txt"),
+        (b"subdir/c.txt", "subdir/c.txt"),
+        (Path("subdir"), "subdir"),
+        ("s3:/bucket/d.txt", ".dagshub/storage/s3/bucket/d.txt"),
+        ("..", None),
+        ("/", None),
+        ("", None),
+    ],
+)
+def test_parse_path(mock_api, path, expected_relative):
+    fs = DagsHubFilesystem()
+    parsed = fs._parse_path(path)
+    if expected_relative is None:
+        assert not parsed.is_in_repo
+    else:
+        assert parsed.is_in_repo
+        assert parsed.relative_path.as_posix() == expected_relative
+        assert parsed.absolute_path == fs.project_root / expected_relative
+
+
+def test_parse_path_of_sibling_dir_with_same_prefix(mock_api):
+    fs = DagsHubFilesystem()
+    assert not fs._parse_path(f"{fs.project_root}-other/a.txt").is_in_repo
+    assert fs._parse_path(f"{fs.project_root}/a.txt").is_in_repo
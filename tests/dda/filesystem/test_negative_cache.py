@@ -0,0 +1,79 @@
+import os
+import time
+
+import pytest
+
+from dagshub.streaming import DagsHubFilesystem
+from dagshub.streaming.negative_cache import NegativeLookupCache
+
+REPO = "https://dagshub.com/user/repo"
+SHA = "a" * 40
+
+
+def test_missing_path_is_remembered():
+    cache = NegativeLookupCache(ttl=60, max_entries=100)
+    assert not cache.is_missing(REPO, SHA, "data/a.txt")
+    cache.add(REPO, SHA, "data/a.txt")
+    assert cache.is_missing(REPO, SHA, "data/a.txt")
+    assert not cache.is_missing(REPO, "b" * 40, "data/a.txt")
+    assert not cache.is_missing(REPO, SHA, "data/b.txt")
+
+    stats = cache.stats
+    assert stats.hits == 1
+    assert stats.misses == 3
+    assert stats.added == 1
+
+
+def test_missing_dir_answers_paths_under_it():
+    cache = NegativeLookupCache(ttl=60, max_entries=100)
+    cache.add(REPO, SHA, "cache")
+    assert cache.is_missing(REPO, SHA, "cache/nested/file.npy")
+    assert not cache.is_missing(REPO, SHA, "cached.npy")
+
+
+def test_entries_of_changing_revisions_expire():
+    cache = NegativeLookupCache(ttl=0.01, max_entries=100)
+    cache.add(REPO, "main", "a.txt")
+    cache.add(REPO, SHA, "a.txt")
+    time.sleep(0.02)
+    assert not cache.is_missing(REPO, "main", "a.txt")
+    assert cache.is_missing(REPO, SHA, "a.txt")
+    assert cache.stats.expired == 1
+
+
+def test_zero_ttl_only_caches_full_shas():
+    cache = NegativeLookupCache(ttl=0, max_entries=100)
+    cache.add(REPO, "main", "a.txt")
+    cache.add(REPO, SHA, "a.txt")
+    assert not cache.is_missing(REPO, "main", "a.txt")
+    assert cache.is_missing(REPO, SHA, "a.txt")
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = NegativeLookupCache(ttl=60, max_entries=2)
+    cache.add(REPO, SHA, "a")
+    cache.add(REPO, SHA, "b")
+    assert cache.is_missing(REPO, SHA, "a")
+    cache.add(REPO, SHA, "c")
+    assert len(cache) == 2
+    assert cache.is_missing(REPO, SHA, "a")
+    assert not cache.is_missing(REPO, SHA, "b")
+
+
+def test_open_of_missing_file_goes_to_server_once(mock_api, negative_lookup_cache):
+    route = mock_api.add_file("yolo_cache.npy", status=404)
+    fs = DagsHubFilesystem()
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            fs.open("yolo_cache.npy")
+    assert route.call_count == 1
+    assert negative_lookup_cache.stats.hits == 2
+
+
+def test_missing_dir_is_listed_once(mock_api, repo_with_hooks):
+    route = mock_api.add_dir("cache", status=404)
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            os.listdir("cache")
+    assert not os.path.exists("cache/nested/file.npy")
+    assert route.call_count == 1
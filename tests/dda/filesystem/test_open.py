@@ -1,5 +1,11 @@
 import os.path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from httpx import Response
+from dagshub.common import config
 from dagshub.streaming import DagsHubFilesystem, uninstall_hooks, install_hooks
 
 
@@ -77,3 +83,53 @@ def test_dont_open_glob_exclude(mock_api, dagshub_repo):
                 print(f.read())
     finally:
         uninstall_hooks()
+
+
+def test_open_links_file_with_already_downloaded_content(mock_api, monkeypatch):
+    monkeypatch.setattr(config, "enable_file_store", True)
+    entries = [mock_api.generate_list_entry(f"data/{name}") for name in ("a.txt", "b.txt")]
+    for entry in entries:
+        # Both files have the same content
+        entry.update({"hash": "5d41402abc4b2a76b9719d911017c592", "versioning": "git"})
+    mock_api.get(url=f"{mock_api.api_list_path()}/data").mock(Response(200, json=entries))
+    route_a = mock_api.add_file("data/a.txt", b"same content")
+    route_b = mock_api.add_file("data/b.txt", b"same content")
+    fs = DagsHubFilesystem()
+    assert sorted(fs.listdir("data")) == ["a.txt", "b.txt"]
+
+    with fs.open("data/a.txt", "rb") as f:
+        assert f.read() == b"same content"
+    with fs.open("data/b.txt", "rb") as f:
+        assert f.read() == b"same content"
+    assert route_a.call_count == 1
+    assert route_b.call_count == 0
+    assert os.path.samefile("data/a.txt", "data/b.txt")
+
+    # Writing to one of the files doesn't change the other one
+    with fs.open("data/b.txt", "wb") as f:
+        f.write(b"changed")
+    with fs.open("data/a.txt", "rb") as f:
+        assert f.read() == b"same content"
+
+
+def test_concurrent_opens_download_file_once(mock_api):
+    route = mock_api.add_file("a.txt", b"content")
+
+    def slow_response(request):
+        time.sleep(0.2)
+        return Response(200, content=b"content")
+
+    route.mock(side_effect=slow_response)
+    fs = DagsHubFilesystem()
+    barrier = threading.Barrier(8)
+
+    def read(_):
+        barrier.wait()
+        with fs.open("a.txt", "rb") as f:
+            return f.read()
+
+    with ThreadPoolExecutor(max_workers=8) as tp:
+        results = list(tp.map(read, range(8)))
+
+    assert results == [b"content"] * 8
+    assert route.call_count == 1
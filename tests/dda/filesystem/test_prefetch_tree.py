@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from dagshub.streaming import DagsHubFilesystem
+
+
+@pytest.fixture
+def tree(mock_api):
+    routes = {
+        "subdir": mock_api.add_dir("subdir", contents=[("nested", "dir"), ("f.txt", "file")]),
+        "subdir/nested": mock_api.add_dir("subdir/nested", contents=[("deeper", "dir"), ("g.txt", "file")]),
+        "subdir/nested/deeper": mock_api.add_dir("subdir/nested/deeper", contents=[("h.txt", "file")]),
+    }
+    return routes
+
+
+def test_prefetch_whole_tree(mock_api, tree):
+    fs = DagsHubFilesystem()
+    listed = fs.prefetch_tree(".")
+
+    assert listed == 4
+    assert fs.remote_tree["subdir/nested"] == {"deeper": "dir", "g.txt": "file"}
+    assert fs.remote_tree["subdir/nested/deeper"] == {"h.txt": "file"}
+    for route in tree.values():
+        assert route.call_count == 1
+
+
+def test_prefetch_depth(mock_api, tree):
+    fs = DagsHubFilesystem()
+    listed = fs.prefetch_tree(".", depth=1)
+
+    assert listed == 2
+    assert "subdir" in fs.remote_tree
+    assert "subdir/nested" not in fs.remote_tree
+    assert not tree["subdir/nested"].called
+
+
+def test_walk_after_prefetch_doesnt_list(mock_api, tree, repo_with_hooks):
+    DagsHubFilesystem.hooked_instance.prefetch_tree("subdir")
+    for route in tree.values():
+        route.reset()
+
+    walked = {root: sorted(files) for root, _, files in os.walk("subdir")}
+    assert walked["subdir/nested/deeper"] == ["h.txt"]
+    assert os.path.isfile("subdir/nested/g.txt")
+    for route in tree.values():
+        assert not route.called
+
+
+def test_prefetch_outside_of_repo_raises(mock_api):
+    fs = DagsHubFilesystem()
+    with pytest.raises(ValueError):
+        fs.prefetch_tree("/")
@@ -0,0 +1,102 @@
+import os
+import secrets
+
+import pytest
+from httpx import Response
+
+from dagshub.common.object_store import ObjectStore
+from dagshub.streaming import DagsHubFilesystem, FilesystemRouter
+
+
+@pytest.fixture
+def other_revision(mock_api) -> str:
+    sha = secrets.token_hex(nbytes=20)
+    mock_api.add_branch("other", sha)
+    resp = mock_api._default_endpoints_and_responses()[1]["list_root"]
+    mock_api.get(url=f"{mock_api.api_list_path(sha)}/").mock(resp)
+    return sha
+
+
+@pytest.fixture
+def router(tmp_path) -> FilesystemRouter:
+    router = FilesystemRouter(object_store=ObjectStore(tmp_path / "object_store", 1024 * 1024))
+    yield router
+    router.cleanup()
+
+
+def add_data_dir(mock_api, revision, file_hash):
+    entry = mock_api.generate_list_entry("data/a.txt")
+    entry.update({"hash": file_hash, "versioning": "git", "size": 7})
+    mock_api.get(url=f"{mock_api.api_list_path(revision)}/data").mock(Response(200, json=[entry]))
+
+
+def test_resolve(mock_api, other_revision, router):
+    fs_a = router.mount("data-v1", repo_url="https://dagshub.com/user/repo")
+    fs_b = router.mount("data-v10", repo_url="https://dagshub.com/user/repo", branch="other")
+    assert router.resolve("data-v1/a.txt") is fs_a
+    assert router.resolve(os.path.abspath("data-v10/nested/a.txt")) is fs_b
+    assert router.resolve(b"data-v10") is fs_b
+    assert router.resolve("data-v1/../data-v10/a.txt") is fs_b
+    assert router.resolve("data-v2/a.txt") is None
+    assert router.resolve("a.txt") is None
+    assert router.resolve(3) is None
+
+    router.remove(fs_a)
+    assert router.resolve("data-v1/a.txt") is None
+
+
+def test_hooks_dispatch_to_filesystems(mock_api, other_revision):
+    # All files of the mocked root listing have the same hash, don't deduplicate them
+    router = FilesystemRouter(deduplicate=False)
+    router.mount("data-v1", repo_url="https://dagshub.com/user/repo")
+    router.mount("data-v2", repo_url="https://dagshub.com/user/repo", branch="other")
+    mock_api.add_file("a.txt", b"first")
+    mock_api.add_file("a.txt", b"second", revision=other_revision)
+    router.install_hooks()
+    try:
+        assert DagsHubFilesystem.hooked_instance is router
+        with open("data-v1/a.txt", "rb") as f:
+            assert f.read() == b"first"
+        with open("data-v2/a.txt", "rb") as f:
+            assert f.read() == b"second"
+        assert ".dagshub-streaming" in os.listdir("data-v2")
+        assert ".dagshub-streaming" not in os.listdir(".")
+    finally:
+        router.uninstall_hooks()
+    assert DagsHubFilesystem.hooked_instance is None
+    assert not os.path.exists("data-v1/.dagshub-streaming")
+
+
+def test_identical_files_are_downloaded_once(mock_api, other_revision, router):
+    fs_a = router.mount("data-v1", repo_url="https://dagshub.com/user/repo")
+    fs_b = router.mount("data-v2", repo_url="https://dagshub.com/user/repo", branch="other")
+    add_data_dir(mock_api, mock_api.current_revision, "abcdef")
+    add_data_dir(mock_api, other_revision, "abcdef")
+    route_a = mock_api.add_file("data/a.txt", b"content")
+    route_b = mock_api.add_file("data/a.txt", b"content", revision=other_revision)
+    # Hashes of the files come from the listings of their directories
+    assert fs_a.listdir("data-v1/data") == fs_b.listdir("data-v2/data") == ["a.txt"]
+
+    with fs_a.open("data-v1/data/a.txt", "rb") as f:
+        assert f.read() == b"content"
+    with fs_b.open("data-v2/data/a.txt", "rb") as f:
+        assert f.read() == b"content"
+    assert route_a.call_count == 1
+    assert route_b.call_count == 0
+
+
+def test_changed_files_are_downloaded(mock_api, other_revision, router):
+    fs_a = router.mount("data-v1", repo_url="https://dagshub.com/user/repo")
+    fs_b = router.mount("data-v2", repo_url="https://dagshub.com/user/repo", branch="other")
+    add_data_dir(mock_api, mock_api.current_revision, "abcdef")
+    add_data_dir(mock_api, other_revision, "123456")
+    mock_api.add_file("data/a.txt", b"content")
+    route_b = mock_api.add_file("data/a.txt", b"changed", revision=other_revision)
+    fs_a.listdir("data-v1/data")
+    fs_b.listdir("data-v2/data")
+
+    with fs_a.open("data-v1/data/a.txt", "rb") as f:
+        assert f.read() == b"content"
+    with fs_b.open("data-v2/data/a.txt", "rb") as f:
+        assert f.read() == b"changed"
+    assert route_b.call_count == 1
@@ -0,0 +1,144 @@
+import contextlib
+import dataclasses
+import threading
+
+import fsspec
+import httpx
+import pytest
+
+from dagshub.common import config
+from dagshub.common.util import multi_urljoin
+from dagshub.streaming.fsspec_filesystem import DagsHubFsspecFileSystem
+from tests.mocks.repo_api import MockRepoAPI
+
+
+class RangeRepoAPI(MockRepoAPI):
+    """
+    Serves the raw files of the repo, with support for range requests
+    """
+
+    def __init__(self, repo: str):
+        super().__init__(repo)
+        self.requests = []
+        self.ignore_ranges = False
+        self.streamed_bytes = 0
+        self._lock = threading.Lock()
+
+    def list_path(self, path, revision=None, include_size=False):
+        files = self.repo_files.get(revision or self.default_branch, {})
+        entries = super().list_path(path, revision, include_size)
+        return [dataclasses.replace(e, size=len(files.get(e.path, b""))) for e in entries]
+
+    @contextlib.contextmanager
+    def _http_stream(self, method, url, **kwargs):
+        revision, _, path = url[len(multi_urljoin(self.repo_api_url, "raw")) + 1 :].partition("/")
+        content = self.repo_files.get(revision, {}).get(path)
+        range_header = kwargs.get("headers", {}).get("Range")
+        with self._lock:
+            self.requests.append((path, range_header))
+        if content is None:
+            yield httpx.Response(404)
+            return
+        if range_header is None or self.ignore_ranges:
+            yield self._stream(content)
+            return
+        start, _, end = range_header[len("bytes=") :].partition("-")
+        end = int(end) + 1 if end else len(content)
+        yield httpx.Response(206, content=content[int(start) : end])
+
+    def _stream(self, content: bytes) -> httpx.Response:
+        api = self
+
+        class CountingStream(httpx.SyncByteStream):
+            def __iter__(self):
+                for i in range(0, len(content), 1024):
+                    with api._lock:
+                        api.streamed_bytes += len(content[i : i + 1024])
+                    yield content[i : i + 1024]
+
+        return httpx.Response(200, stream=CountingStream())
+
+
+@pytest.fixture
+def repo_api() -> RangeRepoAPI:
+    api = RangeRepoAPI("user/repo")
+    api.add_repo_file("data/a.bin", bytes(range(256)) * 64)
+    api.add_repo_file("data/b.txt", b"hello")
+    api.add_repo_contents("", dirs=["data"])
+    api.add_repo_file("a.txt", b"other revision", revision="v1")
+    return api
+
+
+@pytest.fixture
+def fs(repo_api) -> DagsHubFsspecFileSystem:
+    fs = DagsHubFsspecFileSystem(skip_instance_cache=True, max_workers=4)
+    fs._repo_apis["user/repo"] = repo_api
+    return fs
+
+
+def test_ls(fs):
+    assert sorted(fs.ls("dagshub://user/repo/data", detail=False)) == ["user/repo/data/a.bin", "user/repo/data/b.txt"]
+    assert fs.ls("user/repo", detail=False) == ["user/repo/data"]
+    assert fs.info("dagshub://user/repo/data/b.txt")["size"] == 5
+    assert fs.isdir("user/repo/data")
+    with pytest.raises(FileNotFoundError):
+        fs.ls("user/repo/missing")
+
+
+def test_revision(fs):
+    assert fs.ls("dagshub://user/repo@v1", detail=False) == ["user/repo@v1/a.txt"]
+    assert fs.cat("dagshub://user/repo@v1/a.txt") == b"other revision"
+
+
+def test_cat_file_range(fs, repo_api):
+    content = repo_api.repo_files["main"]["data/a.bin"]
+    assert fs.cat_file("dagshub://user/repo/data/a.bin", 100, 200) == content[100:200]
+    assert fs.cat_file("dagshub://user/repo/data/a.bin", -10) == content[-10:]
+    assert repo_api.requests[0] == ("data/a.bin", "bytes=100-199")
+
+
+def test_cat_missing_file(fs):
+    with pytest.raises(FileNotFoundError):
+        fs.cat_file("user/repo/data/missing.txt")
+
+
+def test_cat_many_files(fs):
+    res = fs.cat(["user/repo/data/a.bin", "user/repo/data/b.txt"])
+    assert res["user/repo/data/b.txt"] == b"hello"
+    assert len(res["user/repo/data/a.bin"]) == 256 * 64
+
+
+def test_cat_file_range_ignored_by_server(fs, repo_api, monkeypatch):
+    monkeypatch.setattr(config, "download_chunk_size", 1024)
+    content = repo_api.repo_files["main"]["data/a.bin"]
+    repo_api.ignore_ranges = True
+    assert fs.cat_file("user/repo/data/a.bin", 100, 200) == content[100:200]
+    # The response isn't read further than the range
+    assert repo_api.streamed_bytes <= 200 + 1024
+    assert fs.cat_file("user/repo/data/a.bin", 16000) == content[16000:]
+
+
+def test_cat_ranges(fs, repo_api):
+    content = repo_api.repo_files["main"]["data/a.bin"]
+    res = fs.cat_ranges(["user/repo/data/a.bin", "user/repo/data/b.txt"], [10, 1], [20, 3])
+    assert res == [content[10:20], b"el"]
+
+
+def test_open_reads_only_needed_blocks(fs, repo_api):
+    content = repo_api.repo_files["main"]["data/a.bin"]
+    with fs.open("dagshub://user/repo/data/a.bin", block_size=1024, cache_type="blockcache") as f:
+        f.seek(5000)
+        assert f.read(100) == content[5000:5100]
+        f.seek(5050)
+        assert f.read(10) == content[5050:5060]
+    assert repo_api.requests == [("data/a.bin", "bytes=4096-5119")]
+
+
+def test_fsspec_url(repo_api):
+    fsspec.register_implementation("dagshub", DagsHubFsspecFileSystem, clobber=True)
+    fs, path = fsspec.core.url_to_fs("dagshub://user/repo/data/b.txt", skip_instance_cache=True)
+    assert isinstance(fs, DagsHubFsspecFileSystem)
+    assert path == "user/repo/data/b.txt"
+    fs._repo_apis["user/repo"] = repo_api
+    with fs.open(path) as f:
+        assert f.read() == b"hello"
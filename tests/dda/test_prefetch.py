@@ -0,0 +1,220 @@
+import pickle
+import threading
+import time
+
+import pytest
+
+from dagshub.streaming import DagsHubFilesystem
+from dagshub.streaming.prefetch import PrefetchEngine, SequencePrefetchPolicy
+
+
+class RecordingFetch:
+    """
+    Fetch function that records the fetched keys, and can hold the fetches until released
+    """
+
+    def __init__(self, size: int = 10, blocked: bool = False):
+        self.size = size
+        self.fetched = []
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def __call__(self, key):
+        self.release.wait()
+        self.fetched.append(key)
+        return self.size
+
+
+def test_sequence_policy_follows_order():
+    policy = SequencePrefetchPolicy([3, 1, 4, 0, 2], lookahead=2)
+    assert policy.next_keys(3) == [1, 4]
+    assert policy.next_keys(0) == [2]
+    assert policy.next_keys(7) == []
+
+
+def test_sequence_policy_picks_up_new_order():
+    order = [0, 1, 2]
+    policy = SequencePrefetchPolicy(lambda: order, lookahead=1)
+    assert policy.next_keys(0) == [1]
+    order = [2, 0, 1]
+    assert policy.next_keys(0) == [1]
+    assert policy.next_keys(2) == [0]
+
+
+def test_engine_prefetches_and_counts_hits():
+    fetch = RecordingFetch()
+    engine = PrefetchEngine(fetch, [SequencePrefetchPolicy(range(10), lookahead=2)], max_workers=2)
+    engine.on_access(0)
+    engine.wait()
+    assert sorted(fetch.fetched) == [1, 2]
+
+    engine.on_access(1)
+    engine.on_access(5)
+    engine.wait()
+    stats = engine.stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.prefetched == 5
+    assert sorted(fetch.fetched) == [1, 2, 3, 6, 7]
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_access_waits_for_running_prefetch():
+    fetch = RecordingFetch(blocked=True)
+    engine = PrefetchEngine(fetch, max_workers=1)
+    engine.hint("a")
+
+    accessed = threading.Thread(target=engine.on_access, args=("a",))
+    accessed.start()
+    accessed.join(0.1)
+    assert accessed.is_alive()
+    fetch.release.set()
+    accessed.join()
+
+    assert fetch.fetched == ["a"]
+    assert engine.stats.late_hits == 1
+    engine.wait()
+
+
+def test_present_items_arent_prefetched():
+    fetch = RecordingFetch()
+    engine = PrefetchEngine(fetch, is_present=lambda key: key % 2 == 0)
+    engine.hint(*range(6))
+    engine.on_access(4)
+    engine.wait()
+    assert sorted(fetch.fetched) == [1, 3, 5]
+    assert engine.stats.misses == 0
+
+
+def test_disk_budget_limits_unaccessed_prefetches():
+    fetch = RecordingFetch(size=10)
+    engine = PrefetchEngine(fetch, max_workers=1, disk_budget=25)
+    for key in range(5):
+        engine.hint(key)
+        engine.wait()
+    assert fetch.fetched == [0, 1, 2]
+    assert engine.stats.skipped == 2
+
+    # Accessing the prefetched items frees up the budget
+    engine.on_access(0)
+    engine.hint(3)
+    engine.wait()
+    assert fetch.fetched == [0, 1, 2, 3]
+
+
+def test_unaccessed_prefetches_expire():
+    fetch = RecordingFetch(size=10)
+    engine = PrefetchEngine(fetch, max_workers=1, disk_budget=25, ready_ttl=2)
+    for key in range(4):
+        engine.hint(key)
+        engine.wait()
+    assert engine.stats.skipped == 1
+
+    # The prefetched items get accessed somewhere else (e.g. by another dataloader worker)
+    for key in range(100, 103):
+        engine.on_access(key)
+    assert engine.stats.expired == 3
+
+    engine.hint(3)
+    engine.wait()
+    assert fetch.fetched == [0, 1, 2, 3]
+
+
+def test_pickled_engine_starts_empty():
+    engine = PrefetchEngine(_fetch_nothing, [SequencePrefetchPolicy([0, 1, 2])])
+    engine.on_access(0)
+    engine.wait()
+
+    copy = pickle.loads(pickle.dumps(engine))
+    assert copy.stats.misses == 0
+    copy.on_access(1)
+    copy.wait()
+    assert copy.stats.prefetched == 1
+
+
+def _fetch_nothing(key):
+    return 0
+
+
+@pytest.fixture
+def prefetch_dir_listing(mock_api):
+    return mock_api.add_dir(
+        "data", contents=[("a.txt", "file"), ("b.txt", "file"), ("c.txt", "file"), ("d.txt", "file")]
+    )
+
+
+@pytest.fixture
+def prefetch_dir(mock_api, prefetch_dir_listing):
+    return {name: mock_api.add_file(f"data/{name}", content=name) for name in ["a.txt", "b.txt", "c.txt", "d.txt"]}
+
+
+def test_filesystem_prefetches_siblings(prefetch_dir):
+    fs = DagsHubFilesystem()
+    engine = fs.enable_prefetch()
+    engine.policies[0].lookahead = 2
+    fs.listdir("data")
+
+    with fs.open("data/a.txt") as f:
+        assert f.read() == "a.txt"
+    engine.wait()
+    assert prefetch_dir["b.txt"].call_count == 1
+    assert prefetch_dir["c.txt"].call_count == 1
+    assert not prefetch_dir["d.txt"].called
+
+    with fs.open("data/b.txt") as f:
+        assert f.read() == "b.txt"
+    engine.wait()
+    assert prefetch_dir["b.txt"].call_count == 1
+    assert engine.stats.hits == 1
+    assert engine.stats.misses == 1
+    fs.disable_prefetch()
+
+
+def wait_for_calls(route, count: int):
+    deadline = time.monotonic() + 5
+    while route.call_count < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_filesystem_open_doesnt_wait_for_sibling_listing(prefetch_dir, prefetch_dir_listing):
+    listed = threading.Event()
+    response = prefetch_dir_listing.return_value
+
+    def slow_listing(request):
+        listed.wait(5)
+        return response
+
+    prefetch_dir_listing.mock(side_effect=slow_listing)
+    fs = DagsHubFilesystem()
+    engine = fs.enable_prefetch()
+    engine.policies[0].lookahead = 2
+
+    with fs.open("data/a.txt") as f:
+        assert f.read() == "a.txt"
+    # The open returned while the listing is still running, the siblings get prefetched once it's done
+    assert not prefetch_dir["b.txt"].called
+    listed.set()
+    wait_for_calls(prefetch_dir["c.txt"], 1)
+    engine.wait()
+    assert prefetch_dir["b.txt"].call_count == 1
+    assert prefetch_dir["c.txt"].call_count == 1
+    assert not prefetch_dir["d.txt"].called
+    fs.disable_prefetch()
+
+
+def test_filesystem_prefetch_hints(prefetch_dir):
+    fs = DagsHubFilesystem()
+    with pytest.raises(RuntimeError):
+        fs.prefetch_files("data/d.txt")
+
+    engine = fs.enable_prefetch(policies=[])
+    fs.prefetch_files("data/d.txt")
+    engine.wait()
+    assert prefetch_dir["d.txt"].call_count == 1
+
+    with fs.open("data/d.txt") as f:
+        assert f.read() == "d.txt"
+    assert prefetch_dir["d.txt"].call_count == 1
+    assert engine.stats.hits == 1
+    fs.disable_prefetch()
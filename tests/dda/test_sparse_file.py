@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+import pytest
+
+from dagshub.streaming.sparse_file import SparseFile
+
+BLOCK_SIZE = 10
+
+
+class RemoteFile:
+    def __init__(self, content: bytes, delay: float = 0.0):
+        self.content = content
+        self.delay = delay
+        self.fetched_ranges = []
+        self._lock = threading.Lock()
+
+    def fetch(self, start: int, end: int) -> bytes:
+        time.sleep(self.delay)
+        with self._lock:
+            self.fetched_ranges.append((start, end))
+        return self.content[start : end + 1]
+
+
+@pytest.fixture
+def remote() -> RemoteFile:
+    return RemoteFile(bytes(range(95)))
+
+
+def open_sparse(remote, tmp_path, **kwargs) -> SparseFile:
+    return SparseFile(
+        remote.fetch,
+        len(remote.content),
+        PurePosixPath(tmp_path.as_posix()) / "data" / "file.bin",
+        block_size=BLOCK_SIZE,
+        **kwargs,
+    )
+
+
+def test_read_fetches_only_needed_blocks(remote, tmp_path):
+    f = open_sparse(remote, tmp_path)
+    assert f.read(5, 42) == remote.content[42:47]
+    assert remote.fetched_ranges == [(40, 49)]
+
+    assert f.read(20, 38) == remote.content[38:58]
+    # Block 40-49 is already there
+    assert remote.fetched_ranges == [(40, 49), (30, 39), (50, 59)]
+    assert not (tmp_path / "data" / "file.bin").exists()
+
+
+def test_missing_blocks_fetched_in_runs(remote, tmp_path):
+    f = open_sparse(remote, tmp_path)
+    f.read(1, 25)
+    assert f.read(50, 0) == remote.content[:50]
+    assert remote.fetched_ranges == [(20, 29), (0, 19), (30, 49)]
+
+
+def test_blocks_persist_between_opens(remote, tmp_path):
+    f = open_sparse(remote, tmp_path)
+    f.read(10, 0)
+    f.close()
+
+    remote.fetched_ranges = []
+    f = open_sparse(remote, tmp_path)
+    assert f.read(20, 0) == remote.content[:20]
+    assert remote.fetched_ranges == [(10, 19)]
+
+
+def test_blocks_of_other_version_discarded(remote, tmp_path):
+    f = open_sparse(remote, tmp_path, version="v1")
+    f.read(10, 0)
+    f.close()
+
+    remote.content = bytes(reversed(remote.content))
+    remote.fetched_ranges = []
+    f = open_sparse(remote, tmp_path, version="v2")
+    assert f.read(20, 0) == remote.content[:20]
+    assert remote.fetched_ranges == [(0, 19)]
+
+
+def test_blocks_of_other_size_discarded(remote, tmp_path):
+    f = open_sparse(remote, tmp_path)
+    f.read(10, 0)
+    f.close()
+
+    remote.content = bytes(range(100, 190))
+    remote.fetched_ranges = []
+    f = open_sparse(remote, tmp_path)
+    assert f.read(20, 0) == remote.content[:20]
+    assert remote.fetched_ranges == [(0, 19)]
+
+
+def test_complete_file_moved_to_location(remote, tmp_path):
+    f = open_sparse(remote, tmp_path)
+    assert f.read(1000, 0) == remote.content
+    assert f.is_complete
+    assert (tmp_path / "data" / "file.bin").read_bytes() == remote.content
+    assert [p.name for p in (tmp_path / "data").iterdir()] == ["file.bin"]
+    # Reading after the move still works
+    assert f.read(5, 90) == remote.content[90:95]
+    assert f.read(5, 95) == b""
+
+
+def test_concurrent_reads_fetch_once(tmp_path):
+    remote = RemoteFile(bytes(range(95)), delay=0.05)
+    f = open_sparse(remote, tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as tp:
+        results = list(tp.map(lambda _: f.read(10, 20), range(8)))
+    assert results == [remote.content[20:30]] * 8
+    assert remote.fetched_ranges == [(20, 29)]
+
+
+def test_sequential_reads_prefetch_ahead(remote, tmp_path):
+    with ThreadPoolExecutor(max_workers=1) as readahead:
+        f = open_sparse(remote, tmp_path, readahead_max=20, readahead_executor=readahead)
+        f.read(10, 0)
+        f.read(10, 10)
+    # The second read is sequential - the next block gets fetched before it's read
+    assert (20, 29) in remote.fetched_ranges
+
+
+def test_random_reads_dont_prefetch(remote, tmp_path):
+    with ThreadPoolExecutor(max_workers=1) as readahead:
+        f = open_sparse(remote, tmp_path, readahead_max=20, readahead_executor=readahead)
+        f.read(10, 50)
+        f.read(10, 0)
+    assert sorted(remote.fetched_ranges) == [(0, 9), (50, 59)]
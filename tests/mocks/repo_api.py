@@ -28,6 +28,9 @@ class MockRepoAPI(RepoAPI):
     def _http_request(self, method, url, **kwargs):
         raise MockError(f"_http_request {method} called at url {url}. See the stack trace to find unmocked function")
 
+    def _http_stream(self, method, url, **kwargs):
+        raise MockError(f"_http_stream {method} called at url {url}. See the stack trace to find unmocked function")
+
     def add_storage(self, protocol: str, name: str):
         self.storages.append(StorageAPIEntry(name, protocol, "random-url"))
         contentEntry = ContentAPIEntry(